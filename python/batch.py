@@ -0,0 +1,224 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+import prop
+
+# Združljivost za Python 2 in Python 3
+try:
+    long
+except NameError:
+    long = int
+
+# Knjižnica NumPy ni obvezna
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+def instructions(f):
+    """Prevede logični izraz v seznam ukazov.
+    
+    Ukaz na mestu i izračuna vrednost registra i in je eden od parov
+    ("var", ime), ("not", register), ("and", registri) ali ("or",
+    registri). Izraz se pregleduje z eksplicitnim skladom, strukturno enaki
+    podizrazi pa dobijo isti register. Konjunkcije in disjunkcije z enim
+    členom ter dvojne negacije ne dobijo svojega ukaza.
+    
+    Vrne par (ukazi, register z vrednostjo izraza).
+    
+    Argument:
+    f -- logični izraz
+    """
+    code = []
+    regs = {}
+    keys = {}
+    stack = [(f, False)]
+    while len(stack) > 0:
+        h, done = stack.pop()
+        if id(h) in regs:
+            continue
+        if isinstance(h, prop.Literal):
+            k = ("var", h.p)
+        else:
+            l = [h.t] if isinstance(h, prop.Not) else h.l
+            if not done:
+                todo = [x for x in l if id(x) not in regs]
+                if len(todo) > 0:
+                    stack.append((h, True))
+                    stack.extend([(x, False) for x in todo])
+                    continue
+            if isinstance(h, prop.Not):
+                r = regs[id(h.t)]
+                if code[r][0] == "not":
+                    regs[id(h)] = code[r][1]
+                    continue
+                k = ("not", r)
+            else:
+                r = tuple(sorted(set([regs[id(x)] for x in l])))
+                if len(r) == 1:
+                    regs[id(h)] = r[0]
+                    continue
+                k = ("and" if isinstance(h, prop.And) else "or", r)
+        if k not in keys:
+            keys[k] = len(code)
+            code.append(k)
+        regs[id(h)] = keys[k]
+    return (code, regs[id(f)])
+
+def source(code, out):
+    """Vrne izvorno kodo funkcije run(v, m), ki izvede ukaze.
+    
+    Slovar v imenom spremenljivk priredi vrednosti, m pa je vrednost, ki
+    ustreza resnici v vseh prireditvah; vrednosti spremenljivk se z njo
+    omejijo na veljavne prireditve. Negacija se izvede kot izključna
+    disjunkcija z m, konjunkcija in disjunkcija pa z operatorjema & in |,
+    zato funkcija deluje tako s celimi števili kot s tabelami NumPy.
+    
+    Argumenta:
+    code -- seznam ukazov
+    out  -- register z vrednostjo izraza
+    """
+    lines = ["def run(v, m):"]
+    for i, (op, a) in enumerate(code):
+        if op == "var":
+            e = "v[%s] & m" % repr(a)
+        elif op == "not":
+            e = "m ^ r%d" % a
+        elif len(a) == 0:
+            e = "m" if op == "and" else "m ^ m"
+        else:
+            e = (" & " if op == "and" else " | ").join(["r%d" % x for x in a])
+        lines.append("    r%d = %s" % (i, e))
+    lines.append("    return r%d" % out)
+    return "\n".join(lines) + "\n"
+
+class Program:
+
+    """Logični izraz, preveden za hkratno vrednotenje mnogih prireditev.
+    
+    Prireditve so podane po spremenljivkah: vsaki spremenljivki pripada
+    celo število, katerega i-ti bit je njena vrednost v i-ti prireditvi,
+    ali tabela logičnih vrednosti NumPy z vrednostjo v i-ti prireditvi na
+    i-tem mestu. Rezultat je v enaki obliki.
+    
+    Metode:
+    __init__ -- konstruktor
+    __call__ -- ovrednoti izraz na paketu prireditev
+    evaluate -- ovrednoti izraz na seznamu prireditev
+    
+    Spremenljivke:
+    names  -- urejen seznam imen spremenljivk
+    code   -- seznam ukazov
+    out    -- register z vrednostjo izraza
+    source -- izvorna koda prevedene funkcije
+    run    -- prevedena funkcija
+    """
+    
+    def __init__(self, f):
+        """Konstruktor. Prevede izraz v ukaze in ukaze v funkcijo.
+        
+        Argument:
+        f -- logični izraz
+        """
+        self.code, self.out = instructions(f)
+        self.names = sorted([a for (op, a) in self.code if op == "var"])
+        self.source = source(self.code, self.out)
+        env = {}
+        exec(compile(self.source, "<formula>", "exec"), env)
+        self.run = env["run"]
+        
+    def __call__(self, values, n=None):
+        """Ovrednoti izraz na paketu n prireditev.
+        
+        Vrne celo število, katerega i-ti bit pove, ali je izraz resničen v
+        i-ti prireditvi, oziroma tabelo NumPy, če so vrednosti podane kot
+        tabele NumPy.
+        
+        Argumenta:
+        values -- slovar, ki imenom spremenljivk priredi cela števila ali
+                  tabele NumPy, ali dvodimenzionalna tabela NumPy z eno
+                  vrstico za vsako spremenljivko iz seznama names
+        n      -- število prireditev, pri tabelah NumPy privzeto njihova
+                  dolžina
+        """
+        if numpy != None and isinstance(values, numpy.ndarray):
+            values = dict(zip(self.names, values))
+        if any([p not in values for p in self.names]):
+            raise Exception('Missing variable value!')
+        arrays = [x for x in values.values() if numpy != None and isinstance(x, numpy.ndarray)]
+        if len(arrays) > 0:
+            return self.run(values, numpy.ones(len(arrays[0]) if n == None else n, dtype=bool))
+        elif n == None:
+            raise Exception('Number of assignments not given!')
+        return self.run(values, (1 << n) - 1)
+        
+    def evaluate(self, assignments):
+        """Ovrednoti izraz na seznamu prireditev.
+        
+        Vrne seznam logičnih vrednosti izraza.
+        
+        Argument:
+        assignments -- seznam slovarjev vrednosti spremenljivk
+        """
+        return unpack(self(pack(assignments, self.names), len(assignments)), len(assignments))
+
+def compileFormula(f):
+    """Vrne logični izraz f, preveden za hkratno vrednotenje mnogih
+    prireditev (glej razred Program).
+    
+    Argument:
+    f -- logični izraz
+    """
+    return Program(f)
+
+def pack(assignments, names):
+    """Zapiše seznam prireditev po spremenljivkah.
+    
+    Vrne slovar, ki imenu spremenljivke priredi celo število, katerega i-ti
+    bit je vrednost spremenljivke v i-ti prireditvi.
+    
+    Argumenta:
+    assignments -- seznam slovarjev vrednosti spremenljivk
+    names       -- seznam imen spremenljivk
+    """
+    out = {}
+    for p in names:
+        s = ''.join(['1' if d[p] else '0' for d in reversed(assignments)])
+        out[p] = int(s, 2) if len(s) > 0 else 0
+    return out
+
+def unpack(mask, n):
+    """Vrne seznam n logičnih vrednosti iz bitov celega števila mask ali
+    tabele NumPy.
+    
+    Argumenta:
+    mask -- celo število ali tabela NumPy
+    n    -- število vrednosti
+    """
+    if not isinstance(mask, (int, long)):
+        return [bool(x) for x in mask]
+    s = bin(mask)[2:].zfill(n)
+    return [c == '1' for c in reversed(s[-n:])] if n > 0 else []
+
+def exhaustive(names):
+    """Vrne vse prireditve vrednosti spremenljivkam, zapisane po
+    spremenljivkah.
+    
+    Vrne par (vrednosti, n), kjer je n = 2^k število prireditev za k
+    spremenljivk, vrednosti pa slovar, ki j-ti spremenljivki priredi celo
+    število, katerega i-ti bit je j-ti bit števila i.
+    
+    Argument:
+    names -- seznam imen spremenljivk
+    """
+    n = 1 << len(names)
+    out = {}
+    for j, p in enumerate(names):
+        b = 1 << j
+        x = ((1 << b) - 1) << b
+        k = 2 * b
+        while k < n:
+            x |= x << k
+            k *= 2
+        out[p] = x
+    return (out, n)
@@ -0,0 +1,427 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+import argparse
+import csv
+import json
+import math
+import multiprocessing
+import os
+import random
+import sys
+import time
+import cardinality
+import dimacs
+import dpll
+import portfolio
+import problemi
+import prop
+
+# Združljivost za Python 2 in Python 3
+try:
+    from queue import Empty
+except ImportError:
+    from Queue import Empty
+try:
+    import tracemalloc
+except ImportError:
+    tracemalloc = None
+try:
+    import resource
+except ImportError:
+    resource = None
+
+# Konfiguracije iz slovarja portfolio.engines, ki jim podamo zbirko stavkov
+# namesto logičnega izraza
+clauseEngines = set(["dpll", "dpll-vsids", "cdcl", "cdcl-moms"])
+
+# Privzeti nabor konfiguracij
+default = ["dpll", "cdcl", "sat", "sat3"]
+
+# Privzete velikosti primerov po družinah
+sizes = {
+    "sudoku": [4, 9, 16, 25],
+    "hadamard": [2, 4, 8],
+    "random": [20, 50, 100],
+    "pigeonhole": [4, 5, 6]
+}
+
+# Simboli za sudoku velikosti do 25
+symbols = "123456789abcdefghijklmnop"
+
+# Polja v datoteki z rezultati
+fields = ["instance", "family", "engine", "status", "valid", "time", "peak",
+          "rss", "decisions", "propagations", "conflicts", "probes",
+          "valuations"]
+
+# Polja s števci iz statistike reševalnikov
+statistics = ["decisions", "propagations", "conflicts", "probes", "valuations"]
+
+class Instance:
+
+    """Primer za merjenje.
+    
+    Primer je podan z logičnim izrazom ali z zbirko stavkov; manjkajoča
+    predstavitev se izračuna ob prvi uporabi.
+    
+    Metode:
+    __init__ -- konstruktor
+    formula  -- vrne logični izraz
+    clauses  -- vrne zbirko stavkov
+    
+    Spremenljivke:
+    name     -- ime primera
+    family   -- ime družine primerov
+    expected -- pričakovana izpolnljivost (None, če ni znana)
+    f        -- logični izraz ali None
+    db       -- zbirka stavkov ali None
+    """
+    
+    def __init__(self, name, family, f=None, db=None, expected=None):
+        """Konstruktor.
+        
+        Argumenti:
+        name     -- ime primera
+        family   -- ime družine primerov
+        f        -- logični izraz, privzeto None
+        db       -- zbirka stavkov, privzeto None
+        expected -- pričakovana izpolnljivost, privzeto None
+        """
+        self.name = name
+        self.family = family
+        self.f = f
+        self.db = db
+        self.expected = expected
+        
+    def formula(self):
+        """Vrne logični izraz primera."""
+        if self.f == None:
+            self.f = prop.And([prop.Or([prop.Literal(self.db.names[x]) if x > 0 else prop.Not(self.db.names[-x]) for x in self.db.clause(i)]) for i in range(len(self.db))])
+        return self.f
+        
+    def clauses(self):
+        """Vrne zbirko stavkov primera."""
+        if self.db == None:
+            self.db = dpll.ClauseDB(prop.cnf(self.f))
+        return self.db
+
+def sudoku(n, rng, holes=0.5):
+    """Vrne primer z naključnim sudokujem velikosti n.
+    
+    Rešitev se dobi iz pravilnega vzorca s premešanimi simboli, vrsticami
+    znotraj pasov in stolpci znotraj skladov, nato pa se izbriše delež
+    holes polj.
+    
+    Argumenti:
+    n     -- velikost sudokuja (popoln kvadrat do 25)
+    rng   -- generator naključnih števil
+    holes -- delež praznih polj, privzeto 0.5
+    """
+    r = int(math.sqrt(n))
+    abc = symbols[:n]
+    perm = list(abc)
+    rng.shuffle(perm)
+    rows = sum([[b*r + x for x in rng.sample(range(r), r)] for b in range(r)], [])
+    cols = sum([[b*r + x for x in rng.sample(range(r), r)] for b in range(r)], [])
+    s = [[perm[(r*(i % r) + i//r + j) % n] for j in cols] for i in rows]
+    for i, j in rng.sample([(i, j) for i in range(n) for j in range(n)], int(holes * n * n)):
+        s[i][j] = None
+    return Instance("sudoku-%d" % n, "sudoku", problemi.sudoku(s, abc), expected=True)
+
+def hadamard(n, rng=None):
+    """Vrne primer za obstoj Hadamardove matrike reda n.
+    
+    Argumenta:
+    n   -- red matrike
+    rng -- generator naključnih števil (ni uporabljen), privzeto None
+    """
+    return Instance("hadamard-%d" % n, "hadamard", problemi.hadamard(n), expected=(n <= 2 or n % 4 == 0))
+
+def random3sat(n, rng, ratio=4.26):
+    """Vrne primer z naključnimi stavki s tremi različnimi spremenljivkami
+    pri razmerju ratio med številom stavkov in spremenljivk (fazni prehod).
+    
+    Argumenti:
+    n     -- število spremenljivk
+    rng   -- generator naključnih števil
+    ratio -- razmerje med številom stavkov in spremenljivk, privzeto 4.26
+    """
+    l = []
+    for i in range(int(round(ratio * n))):
+        l.append(prop.Or([prop.Literal("x%d" % k) if rng.random() < 0.5 else prop.Not("x%d" % k) for k in rng.sample(range(1, n + 1), 3)]))
+    return Instance("random-%d" % n, "random", prop.And(l))
+
+def pigeonhole(n, rng=None):
+    """Vrne primer z n+1 golobi v n luknjah, ki ni izpolnljiv.
+    
+    Argumenta:
+    n   -- število lukenj
+    rng -- generator naključnih števil (ni uporabljen), privzeto None
+    """
+    l = [prop.Or(["p%dh%d" % (i, h) for h in range(n)]) for i in range(n + 1)]
+    for h in range(n):
+        l += cardinality.atMostOne(["p%dh%d" % (i, h) for i in range(n + 1)])
+    return Instance("pigeonhole-%d" % n, "pigeonhole", prop.And(l), expected=False)
+
+# Generatorji primerov po družinah
+generators = {
+    "sudoku": sudoku,
+    "hadamard": hadamard,
+    "random": random3sat,
+    "pigeonhole": pigeonhole
+}
+
+def corpus(families, seed=0, count=1, files=[]):
+    """Vrne seznam primerov za merjenje.
+    
+    Argumenti:
+    families -- slovar, ki imenu družine priredi seznam velikosti
+    seed     -- seme generatorja naključnih števil, privzeto 0
+    count    -- število primerov vsake velikosti, privzeto 1
+    files    -- seznam poti do datotek v formatu DIMACS CNF, privzeto []
+    """
+    rng = random.Random(seed)
+    out = []
+    for family in sorted(families):
+        if family not in generators:
+            raise Exception('Unknown benchmark family!')
+        for n in families[family]:
+            for i in range(count):
+                inst = generators[family](n, rng)
+                if count > 1:
+                    inst.name += "-%d" % i
+                out.append(inst)
+    for path in files:
+        out.append(Instance(os.path.basename(path), "dimacs", db=dimacs.read(path)))
+    return out
+
+def check(db, model):
+    """Pove, ali prireditev model zadošča vsem stavkom zbirke db.
+    
+    Spremenljivke brez vrednosti veljajo za neresnične.
+    
+    Argumenta:
+    db    -- zbirka stavkov
+    model -- prireditev vrednosti v obliki slovarja
+    """
+    return all([any([model.get(db.names[abs(x)], False) == (x > 0) for x in db.clause(i)]) for i in range(len(db))])
+
+def measure(name, inst, queue, memory=False):
+    """Izmeri reševalnik name na primeru inst in rezultat pošlje v vrsto.
+    
+    Argumenti:
+    name   -- ime konfiguracije reševalnika iz slovarja portfolio.engines
+    inst   -- primer za merjenje
+    queue  -- vrsta za rezultate
+    memory -- ali naj se meri največja poraba pomnilnika z modulom
+              tracemalloc, privzeto False
+    """
+    fun, args = portfolio.engines[name]
+    f = inst.clauses() if name in clauseEngines else inst.formula()
+    out = dict([(x, None) for x in fields])
+    if memory and tracemalloc != None:
+        tracemalloc.start()
+    t = time.time()
+    try:
+        r, st = fun(f, stats=True, **args)
+        for x in statistics:
+            if x in st.counters:
+                out[x] = st[x]
+    except Exception:
+        r = None
+        out["status"] = "error"
+    out["time"] = time.time() - t
+    if memory and tracemalloc != None:
+        out["peak"] = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    if resource != None:
+        out["rss"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if type(r) == dict:
+        out["status"] = "sat"
+        out["valid"] = check(inst.clauses(), r) and inst.expected != False
+    elif r == False:
+        out["status"] = "unsat"
+        out["valid"] = inst.expected != True
+    elif out["status"] == None:
+        out["status"] = "unknown"
+    queue.put(out)
+
+def run(instances, names=None, timeout=None, memory=False, trace=False):
+    """Izmeri reševalnike na primerih. Vsako merjenje teče v ločenem
+    procesu, ki se po preteku časa prekine.
+    
+    Vrne seznam slovarjev s polji iz seznama fields.
+    
+    Argumenti:
+    instances -- seznam primerov
+    names     -- seznam imen konfiguracij iz slovarja portfolio.engines,
+                 privzeto None (nabor default)
+    timeout   -- največji čas posameznega merjenja v sekundah, privzeto
+                 None (brez omejitve)
+    memory    -- ali naj se meri poraba pomnilnika, privzeto False
+    trace     -- ali naj se izpisujejo rezultati, privzeto False
+    """
+    if names == None:
+        names = default
+    if any([x not in portfolio.engines for x in names]):
+        raise Exception('Unknown engine!')
+    results = []
+    for inst in instances:
+        inst.formula()
+        inst.clauses()
+        for name in names:
+            queue = multiprocessing.Queue()
+            p = multiprocessing.Process(target=measure, args=(name, inst, queue, memory))
+            p.daemon = True
+            t = time.time()
+            p.start()
+            try:
+                out = queue.get(True, timeout)
+            except Empty:
+                out = dict([(x, None) for x in fields])
+                out["status"] = "timeout"
+                out["time"] = time.time() - t
+            finally:
+                if p.is_alive():
+                    p.terminate()
+                p.join()
+            out["instance"] = inst.name
+            out["family"] = inst.family
+            out["engine"] = name
+            if trace:
+                print("%-20s %-12s %-8s %10.3f s" % (inst.name, name, out["status"], out["time"]))
+                if out["valid"] == False:
+                    print("Invalid answer from %s on %s" % (name, inst.name))
+            results.append(out)
+    return results
+
+def write(results, path):
+    """Zapiše rezultate v datoteko v formatu CSV (končnica .csv) ali JSON.
+    
+    Argumenta:
+    results -- seznam slovarjev s polji iz seznama fields
+    path    -- pot do datoteke
+    """
+    with open(path, 'w') as out:
+        if path.endswith(".csv"):
+            w = csv.DictWriter(out, fields)
+            w.writeheader()
+            for r in results:
+                w.writerow(r)
+        else:
+            json.dump(results, out, indent=1, sort_keys=True)
+
+def read(path):
+    """Prebere rezultate iz datoteke v formatu CSV (končnica .csv) ali
+    JSON.
+    
+    Argument:
+    path -- pot do datoteke
+    """
+    with open(path) as f:
+        if not path.endswith(".csv"):
+            return json.load(f)
+        results = []
+        for r in csv.DictReader(f):
+            for x in fields:
+                v = r.get(x)
+                if v in [None, ""]:
+                    r[x] = None
+                elif x == "valid":
+                    r[x] = v == "True"
+                elif x in ["time"]:
+                    r[x] = float(v)
+                elif x in ["peak", "rss"] + statistics:
+                    r[x] = int(v)
+            results.append(r)
+        return results
+
+def compare(old, new, threshold=0.1, minimum=0.01, out=sys.stdout):
+    """Primerja dva nabora rezultatov in izpiše razlike v času.
+    
+    Merjenje je slabše, če se mu je čas povečal za več kot delež threshold
+    in za več kot minimum sekund ali če se je spremenil njegov status (npr.
+    iz "sat" v "timeout"). Na koncu se izpiše geometrijska sredina
+    razmerij časov.
+    
+    Vrne število poslabšanj.
+    
+    Argumenti:
+    old       -- seznam starih rezultatov
+    new       -- seznam novih rezultatov
+    threshold -- dovoljeno relativno povečanje časa, privzeto 0.1
+    minimum   -- najmanjše upoštevano povečanje časa v sekundah, privzeto
+                 0.01
+    out       -- izhod za izpis, privzeto sys.stdout
+    """
+    before = dict([((r["instance"], r["engine"]), r) for r in old])
+    regressions = 0
+    logs = []
+    for r in new:
+        key = (r["instance"], r["engine"])
+        if key not in before:
+            continue
+        o = before[key]
+        mark = ""
+        if o["status"] != r["status"]:
+            if r["status"] not in ["sat", "unsat"]:
+                mark = "REGRESSION"
+                regressions += 1
+            else:
+                mark = "improved"
+        elif r["status"] in ["sat", "unsat"]:
+            if r["time"] > o["time"] * (1 + threshold) and r["time"] - o["time"] > minimum:
+                mark = "REGRESSION"
+                regressions += 1
+            elif o["time"] > r["time"] * (1 + threshold) and o["time"] - r["time"] > minimum:
+                mark = "improved"
+            if o["time"] > 0 and r["time"] > 0:
+                logs.append(math.log(r["time"] / o["time"]))
+        out.write("%-20s %-12s %-8s %10.3f -> %-8s %10.3f  %s\n" % (key[0], key[1], o["status"], o["time"], r["status"], r["time"], mark))
+    if len(logs) > 0:
+        out.write("Geometric mean time ratio: %.3f\n" % math.exp(sum(logs) / len(logs)))
+    out.write("%d regressions\n" % regressions)
+    return regressions
+
+def main(argv=None):
+    """Glavni program ukazne vrstice.
+    
+    Ukaz "run" izmeri reševalnike na korpusu primerov in rezultate zapiše
+    v datoteko, ukaz "compare" pa primerja dve datoteki z rezultati in
+    vrne 1, če so kakšna poslabšanja.
+    
+    Argument:
+    argv -- seznam argumentov, privzeto None (sys.argv)
+    """
+    parser = argparse.ArgumentParser(description="Benchmark SAT solvers and encodings.")
+    sub = parser.add_subparsers(dest="command")
+    p = sub.add_parser("run", help="run solvers on a corpus")
+    p.add_argument("-o", "--output", default="results.json", help="results file (.json or .csv)")
+    p.add_argument("-e", "--engines", nargs="+", default=default, choices=sorted(portfolio.engines), help="engine configurations")
+    p.add_argument("-f", "--families", nargs="*", default=sorted(sizes), choices=sorted(sizes), help="generated families")
+    for family in sorted(sizes):
+        p.add_argument("--%s" % family, nargs="+", type=int, default=sizes[family], metavar="N", help="sizes for family %s" % family)
+    p.add_argument("-d", "--dimacs", nargs="+", default=[], metavar="FILE", help="DIMACS CNF files")
+    p.add_argument("-n", "--count", type=int, default=1, help="instances per size")
+    p.add_argument("-s", "--seed", type=int, default=0, help="random seed")
+    p.add_argument("-t", "--timeout", type=float, default=60, help="timeout per run in seconds")
+    p.add_argument("-m", "--memory", action="store_true", help="measure peak memory with tracemalloc")
+    p = sub.add_parser("compare", help="compare two results files")
+    p.add_argument("old", help="baseline results file")
+    p.add_argument("new", help="new results file")
+    p.add_argument("--threshold", type=float, default=0.1, help="allowed relative slowdown")
+    p.add_argument("--minimum", type=float, default=0.01, help="ignored slowdown in seconds")
+    args = parser.parse_args(argv)
+    if args.command == "run":
+        families = dict([(x, getattr(args, x)) for x in args.families])
+        instances = corpus(families, args.seed, args.count, args.dimacs)
+        results = run(instances, args.engines, args.timeout, args.memory, True)
+        write(results, args.output)
+        return 0
+    elif args.command == "compare":
+        return 1 if compare(read(args.old), read(args.new), args.threshold, args.minimum) > 0 else 0
+    parser.print_help()
+    return 2
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,333 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+import prop
+
+def literal(x):
+    """Vrne logični izraz za literal x.
+    
+    Argument:
+    x -- ime spremenljivke ali logični izraz
+    """
+    return prop.Literal(x) if prop.isLiteral(x) else x
+
+def neg(x):
+    """Vrne negacijo literala x. Dvojna negacija se odstrani.
+    
+    Argument:
+    x -- logični izraz
+    """
+    return x.t if isinstance(x, prop.Not) else prop.Not(x)
+
+def clause(*l):
+    """Vrne disjunkcijo podanih literalov oziroma literal sam, če je en.
+    
+    Argumenti:
+    *l -- literali
+    """
+    return l[0] if len(l) == 1 else prop.Or(list(l))
+
+def variables(prefix):
+    """Vrne funkcijo, ki ob vsakem klicu vrne novo pomožno spremenljivko z
+    imenom iz predpone prefix in zaporedne številke.
+    
+    Argument:
+    prefix -- predpona imen pomožnih spremenljivk
+    """
+    count = [0]
+    def fresh():
+        count[0] += 1
+        return prop.Literal("%s%d" % (prefix, count[0]))
+    return fresh
+
+def pairwise(l, fresh):
+    """Kodiranje "največ eden" s paroma izključujočimi stavki.
+    
+    Brez pomožnih spremenljivk, a s kvadratnim številom stavkov.
+    
+    Argumenta:
+    l     -- seznam literalov
+    fresh -- funkcija za nove pomožne spremenljivke
+    """
+    return [clause(neg(l[i]), neg(l[j])) for i in range(len(l)) for j in range(i+1, len(l))]
+
+def ladder(l, fresh):
+    """Zaporedno kodiranje (lestev) "največ eden".
+    
+    Pomožna spremenljivka s_i pove, da je resničen kak literal do vključno
+    i-tega. Uporabi n-1 pomožnih spremenljivk in 3n-4 stavkov.
+    
+    Argumenta:
+    l     -- seznam literalov
+    fresh -- funkcija za nove pomožne spremenljivke
+    """
+    if len(l) <= 1:
+        return []
+    s = [fresh() for i in range(len(l) - 1)]
+    out = [clause(neg(l[0]), s[0])]
+    for i in range(1, len(l) - 1):
+        out.append(clause(neg(l[i]), s[i]))
+        out.append(clause(neg(s[i-1]), s[i]))
+        out.append(clause(neg(s[i-1]), neg(l[i])))
+    out.append(clause(neg(s[-1]), neg(l[-1])))
+    return out
+
+def commander(l, fresh, group=3):
+    """Kodiranje "največ eden" s poveljniki (Klieber in Kwon).
+    
+    Literali se razdelijo v skupine velikosti group, znotraj katerih se
+    uporabi kodiranje pairwise. Vsak literal skupine implicira njenega
+    poveljnika, na poveljnikih pa se kodiranje ponovi rekurzivno.
+    
+    Argumenti:
+    l     -- seznam literalov
+    fresh -- funkcija za nove pomožne spremenljivke
+    group -- velikost skupine, privzeto 3
+    """
+    if len(l) <= group + 1:
+        return pairwise(l, fresh)
+    out = []
+    cs = []
+    for i in range(0, len(l), group):
+        g = l[i:i+group]
+        c = fresh()
+        cs.append(c)
+        out += pairwise(g, fresh)
+        out += [clause(neg(x), c) for x in g]
+    return out + commander(cs, fresh, group)
+
+def product(l, fresh):
+    """Produktno kodiranje "največ eden" (Chen).
+    
+    Literali se razporedijo v mrežo s p vrsticami in q stolpci. Vsak
+    literal implicira spremenljivko svoje vrstice in svojega stolpca, na
+    katerih se kodiranje ponovi rekurzivno. Uporabi približno 2n + o(n)
+    stavkov.
+    
+    Argumenta:
+    l     -- seznam literalov
+    fresh -- funkcija za nove pomožne spremenljivke
+    """
+    if len(l) <= 4:
+        return pairwise(l, fresh)
+    p = 1
+    while p*p < len(l):
+        p += 1
+    q = (len(l) + p - 1) // p
+    u = [fresh() for i in range(p)]
+    v = [fresh() for j in range(q)]
+    out = []
+    for t, x in enumerate(l):
+        out.append(clause(neg(x), u[t // q]))
+        out.append(clause(neg(x), v[t % q]))
+    return out + product(u, fresh) + product(v, fresh)
+
+def sequential(l, k, fresh):
+    """Kodiranje "največ k" s sekvenčnim števcem (Sinz).
+    
+    Pomožna spremenljivka s_ij pove, da je med prvimi i+1 literali
+    resničnih vsaj j+1. Uporabi O(nk) spremenljivk in stavkov.
+    
+    Argumenti:
+    l     -- seznam literalov
+    k     -- največje število resničnih literalov
+    fresh -- funkcija za nove pomožne spremenljivke
+    """
+    n = len(l)
+    if k >= n:
+        return []
+    if k == 0:
+        return [neg(x) for x in l]
+    s = [[fresh() for j in range(k)] for i in range(n - 1)]
+    out = [clause(neg(l[0]), s[0][0])]
+    out += [neg(s[0][j]) for j in range(1, k)]
+    for i in range(1, n - 1):
+        out.append(clause(neg(l[i]), s[i][0]))
+        out.append(clause(neg(s[i-1][0]), s[i][0]))
+        for j in range(1, k):
+            out.append(clause(neg(l[i]), neg(s[i-1][j-1]), s[i][j]))
+            out.append(clause(neg(s[i-1][j]), s[i][j]))
+        out.append(clause(neg(l[i]), neg(s[i-1][k-1])))
+    out.append(clause(neg(l[-1]), neg(s[-1][k-1])))
+    return out
+
+def totalizer(l, k, fresh):
+    """Kodiranje "največ k" s totalizatorjem (Bailleux in Boufkhad).
+    
+    Literali se seštevajo v dvojiškem drevesu; vsako vozlišče ima
+    unarno predstavljeno vsoto svojih listov, omejeno na k+1. Uporabi
+    O(n log n) spremenljivk in O(nk) stavkov.
+    
+    Argumenti:
+    l     -- seznam literalov
+    k     -- največje število resničnih literalov
+    fresh -- funkcija za nove pomožne spremenljivke
+    """
+    if k >= len(l):
+        return []
+    out = []
+    def count(l):
+        if len(l) == 1:
+            return l
+        h = len(l) // 2
+        a = count(l[:h])
+        b = count(l[h:])
+        o = [fresh() for i in range(min(len(l), k + 1))]
+        for i in range(len(a) + 1):
+            for j in range(len(b) + 1):
+                if 0 < i + j <= len(o):
+                    c = [neg(a[i-1])] if i > 0 else []
+                    if j > 0:
+                        c.append(neg(b[j-1]))
+                    out.append(clause(*(c + [o[i+j-1]])))
+        return o
+    o = count(l)
+    return out + [neg(o[k])]
+
+def sorter(l, k, fresh):
+    """Kodiranje "največ k" z Batcherjevim sortirnim omrežjem (sodo-lihi
+    zlivanje).
+    
+    Seznam se dopolni do potence števila 2 z neresničnimi vrednostmi (None)
+    in uredi padajoče; komparator (a, b) da izhoda a \\/ b in a /\\ b, ki ju
+    implicirata vhoda. Izhod na mestu k mora biti neresničen. Uporabi
+    O(n log^2 n) spremenljivk in stavkov.
+    
+    Argumenti:
+    l     -- seznam literalov
+    k     -- največje število resničnih literalov
+    fresh -- funkcija za nove pomožne spremenljivke
+    """
+    if k >= len(l):
+        return []
+    out = []
+    def compare(a, b):
+        if a == None:
+            return (b, None)
+        if b == None:
+            return (a, None)
+        hi = fresh()
+        lo = fresh()
+        out.append(clause(neg(a), hi))
+        out.append(clause(neg(b), hi))
+        out.append(clause(neg(a), neg(b), lo))
+        return (hi, lo)
+    def merge(a, b):
+        if len(a) == 1:
+            return list(compare(a[0], b[0]))
+        v = merge(a[::2], b[::2])
+        w = merge(a[1::2], b[1::2])
+        m = [v[0]]
+        for i in range(len(v) - 1):
+            m += compare(w[i], v[i+1])
+        return m + [w[-1]]
+    def sort(l):
+        if len(l) == 1:
+            return l
+        h = len(l) // 2
+        return merge(sort(l[:h]), sort(l[h:]))
+    n = 1
+    while n < len(l):
+        n *= 2
+    o = sort(l + [None] * (n - len(l)))
+    return out + [neg(o[k])]
+
+# Kodiranja "največ eden": ime -> funkcija
+amo = {
+    "pairwise": pairwise,
+    "ladder": ladder,
+    "commander": commander,
+    "product": product
+}
+
+# Kodiranja "največ k": ime -> funkcija
+amk = {
+    "sequential": sequential,
+    "totalizer": totalizer,
+    "sorter": sorter
+}
+
+def atMostOne(l, encoding="pairwise", prefix="amo"):
+    """Vrne seznam stavkov, ki zagotavljajo, da je resničen največ eden od
+    literalov.
+    
+    Argumenti:
+    l        -- seznam literalov (imen spremenljivk ali logičnih izrazov)
+    encoding -- ime kodiranja iz slovarja amo ali amk, privzeto "pairwise"
+    prefix   -- predpona imen pomožnih spremenljivk, privzeto "amo"
+    """
+    return atMostK(l, 1, encoding, prefix)
+
+def atMostK(l, k, encoding="sequential", prefix="amk"):
+    """Vrne seznam stavkov, ki zagotavljajo, da je resničnih največ k
+    literalov.
+    
+    Kodiranja iz slovarja amo so dovoljena le za k <= 1.
+    
+    Argumenti:
+    l        -- seznam literalov (imen spremenljivk ali logičnih izrazov)
+    k        -- največje število resničnih literalov
+    encoding -- ime kodiranja iz slovarja amk ali amo, privzeto
+                "sequential"
+    prefix   -- predpona imen pomožnih spremenljivk, privzeto "amk"
+    """
+    l = [literal(x) for x in l]
+    fresh = variables(prefix)
+    if k < 0:
+        return [prop.Fls()]
+    if encoding in amk:
+        return amk[encoding](l, k, fresh)
+    elif encoding in amo:
+        if k > 1:
+            raise Exception('At-most-one encoding used with k > 1!')
+        return [neg(x) for x in l] if k == 0 else amo[encoding](l, fresh)
+    else:
+        raise Exception('Unknown cardinality encoding!')
+
+def atLeastK(l, k, encoding="sequential", prefix="alk"):
+    """Vrne seznam stavkov, ki zagotavljajo, da je resničnih vsaj k
+    literalov.
+    
+    Za k = 1 vrne en sam stavek, sicer pa omeji število neresničnih
+    literalov na največ n-k.
+    
+    Argumenti:
+    l        -- seznam literalov (imen spremenljivk ali logičnih izrazov)
+    k        -- najmanjše število resničnih literalov
+    encoding -- ime kodiranja iz slovarja amk ali amo, privzeto
+                "sequential"
+    prefix   -- predpona imen pomožnih spremenljivk, privzeto "alk"
+    """
+    l = [literal(x) for x in l]
+    if k <= 0:
+        return []
+    elif k == 1:
+        return [prop.Or(l)]
+    return atMostK([neg(x) for x in l], len(l) - k, encoding, prefix)
+
+def exactlyK(l, k, encoding="sequential", prefix="exk"):
+    """Vrne seznam stavkov, ki zagotavljajo, da je resničnih natanko k
+    literalov.
+    
+    Pomožne spremenljivke omejitev "največ k" in "vsaj k" imajo predponi
+    prefix + "u" in prefix + "l".
+    
+    Argumenti:
+    l        -- seznam literalov (imen spremenljivk ali logičnih izrazov)
+    k        -- število resničnih literalov
+    encoding -- ime kodiranja iz slovarja amk ali amo, privzeto
+                "sequential"
+    prefix   -- predpona imen pomožnih spremenljivk, privzeto "exk"
+    """
+    return atMostK(l, k, encoding, prefix + "u") + atLeastK(l, k, encoding, prefix + "l")
+
+def exactlyOne(l, encoding="pairwise", prefix="exo"):
+    """Vrne seznam stavkov, ki zagotavljajo, da je resničen natanko eden od
+    literalov.
+    
+    Argumenti:
+    l        -- seznam literalov (imen spremenljivk ali logičnih izrazov)
+    encoding -- ime kodiranja iz slovarja amo ali amk, privzeto "pairwise"
+    prefix   -- predpona imen pomožnih spremenljivk, privzeto "exo"
+    """
+    return exactlyK(l, 1, encoding, prefix)
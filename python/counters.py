@@ -0,0 +1,184 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+import time
+
+class Stats:
+
+    """Statistika reševanja: števci, časi posameznih faz in kljuke za
+    dogodke.
+    
+    Reševalniki števce sproti povečujejo v svojih celoštevilskih
+    spremenljivkah in jih v statistiko prenesejo šele na koncu, zato
+    štetje v vročih zankah ne stane več kot eno seštevanje. Dogodki (npr.
+    odločitve in protislovja) se sprožijo le, če je statistika podana;
+    brez kljuk metoda emit ne naredi ničesar.
+    
+    Metode:
+    __init__    -- konstruktor
+    __getitem__ -- vrne vrednost števca
+    __repr__    -- znakovna predstavitev
+    add         -- poveča števec
+    collect     -- prišteje števce iz spremenljivk objekta
+    phase       -- vrne objekt za merjenje časa faze
+    on          -- doda kljuko za dogodek
+    emit        -- sproži dogodek
+    asDict      -- vrne števce in čase kot slovar
+    
+    Spremenljivke:
+    counters -- slovar števcev
+    timers   -- slovar časov faz v sekundah
+    hooks    -- slovar, ki imenu dogodka priredi seznam kljuk
+    """
+    
+    def __init__(self):
+        """Konstruktor. Nastavi prazne števce, čase in kljuke."""
+        self.counters = {}
+        self.timers = {}
+        self.hooks = {}
+        
+    def __getitem__(self, name):
+        """Vrne vrednost števca name (0, če ga ni).
+        
+        Argument:
+        name -- ime števca
+        """
+        return self.counters.get(name, 0)
+        
+    def __repr__(self):
+        """Znakovna predstavitev. Vsebuje števce in čase faz."""
+        return "Stats(%s)" % ', '.join(["%s=%d" % x for x in sorted(self.counters.items())] + ["%s=%.3fs" % x for x in sorted(self.timers.items())])
+        
+    def add(self, name, k=1):
+        """Poveča števec name za k.
+        
+        Argumenta:
+        name -- ime števca
+        k    -- povečanje, privzeto 1
+        """
+        self.counters[name] = self.counters.get(name, 0) + k
+        
+    def collect(self, obj, names):
+        """Števcem prišteje vrednosti istoimenskih spremenljivk objekta.
+        
+        Argumenta:
+        obj   -- objekt s celoštevilskimi spremenljivkami
+        names -- seznam imen spremenljivk
+        """
+        for x in names:
+            self.add(x, getattr(obj, x))
+            
+    def phase(self, name):
+        """Vrne objekt, ki v stavku with izmeri čas faze name in ga prišteje
+        v slovar timers.
+        
+        Argument:
+        name -- ime faze
+        """
+        return Phase(self, name)
+        
+    def on(self, event, f):
+        """Doda kljuko f za dogodek event. Kljuka se kliče z argumenti
+        dogodka.
+        
+        Argumenta:
+        event -- ime dogodka
+        f     -- funkcija
+        """
+        self.hooks.setdefault(event, []).append(f)
+        
+    def emit(self, event, *args):
+        """Sproži dogodek event, torej pokliče vse njegove kljuke.
+        
+        Argumenta:
+        event -- ime dogodka
+        args  -- argumenti dogodka
+        """
+        for f in self.hooks.get(event, []):
+            f(*args)
+            
+    def asDict(self):
+        """Vrne slovar s števci in časi faz; imena časov imajo pripono
+        "Time"."""
+        out = dict(self.counters)
+        for x, t in self.timers.items():
+            out[x + "Time"] = t
+        return out
+
+class Phase:
+
+    """Merjenje časa faze v stavku with.
+    
+    Metode:
+    __init__  -- konstruktor
+    __enter__ -- začne merjenje
+    __exit__  -- konča merjenje in prišteje čas
+    
+    Spremenljivke:
+    stats -- statistika
+    name  -- ime faze
+    start -- čas začetka
+    """
+    
+    def __init__(self, stats, name):
+        """Konstruktor.
+        
+        Argumenta:
+        stats -- statistika
+        name  -- ime faze
+        """
+        self.stats = stats
+        self.name = name
+        self.start = None
+        
+    def __enter__(self):
+        """Začne merjenje."""
+        self.start = time.time()
+        return self
+        
+    def __exit__(self, *exc):
+        """Konča merjenje in čas prišteje v statistiko."""
+        t = self.stats.timers
+        t[self.name] = t.get(self.name, 0.0) + time.time() - self.start
+        return False
+
+class NoPhase:
+
+    """Prazno merjenje časa, ki se uporabi, ko statistika ni podana.
+    
+    Metode:
+    __enter__ -- ne naredi ničesar
+    __exit__  -- ne naredi ničesar
+    """
+    
+    def __enter__(self):
+        """Ne naredi ničesar."""
+        return self
+        
+    def __exit__(self, *exc):
+        """Ne naredi ničesar."""
+        return False
+
+# Skupni objekt za prazno merjenje časa
+nophase = NoPhase()
+
+def phase(stats, name):
+    """Vrne objekt za merjenje časa faze name v statistiki stats ali prazno
+    merjenje, če je stats None.
+    
+    Argumenta:
+    stats -- statistika ali None
+    name  -- ime faze
+    """
+    return nophase if stats == None else stats.phase(name)
+
+def create(stats):
+    """Vrne statistiko za argument stats funkcij reševalnikov: nov objekt,
+    če je stats True, stats sam, če je objekt razreda Stats, in None sicer.
+    
+    Argument:
+    stats -- True, objekt razreda Stats ali None
+    """
+    if stats == True:
+        return Stats()
+    return stats if stats else None
@@ -0,0 +1,103 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+import re
+import dpll
+
+# Združljivost za Python 2 in Python 3
+try:
+    basestring
+except NameError:
+    basestring = str
+
+# Predpona imen spremenljivk, ki nimajo imena v komentarjih
+prefix = "x"
+
+def read(source, db=None):
+    """Prebere stavke v formatu DIMACS CNF in jih doda v zbirko stavkov.
+    
+    Vir se bere po vrsticah, stavki pa se sproti dodajajo v zbirko, ne da bi
+    se gradili logični izrazi. Stavek se lahko razteza čez več vrstic in se
+    konča s številom 0. Komentarji oblike "c <številka> <ime>", ki se
+    pojavijo pred prvo uporabo spremenljivke, ji dodelijo ime; ostale
+    spremenljivke dobijo ime iz predpone prefix in svoje številke. Vse
+    spremenljivke, ki jih napove glava, se dodajo v zbirko, tudi če se ne
+    pojavijo v nobenem stavku. Če je zbirka nova in spremenljivke nimajo
+    imen, se njihove številke ujemajo s številkami v viru.
+    
+    Vrne zbirko stavkov.
+    
+    Argumenta:
+    source -- pot do datoteke ali objekt z metodo readline (datoteka,
+              mmap ipd.)
+    db     -- zbirka stavkov, privzeto None (naredi novo zbirko)
+    """
+    if db == None:
+        db = dpll.ClauseDB()
+    if isinstance(source, basestring):
+        with open(source, 'rb') as f:
+            return read(f, db)
+    names = {}
+    tr = [0]
+    clause = []
+    line = source.readline()
+    while line:
+        if not isinstance(line, str):
+            line = line.decode('ascii')
+        line = line.strip()
+        if line.startswith('c'):
+            m = re.match(r'^c\s+([0-9]+)\s+([a-z][a-z0-9]*)$', line)
+            if m:
+                names[int(m.group(1))] = m.group(2)
+        elif line.startswith('p'):
+            h = line.split()
+            if len(h) != 4 or h[1] != 'cnf':
+                raise Exception('Invalid DIMACS header!')
+            for k in range(len(tr), int(h[2]) + 1):
+                tr.append(db.variable(names.get(k, "%s%d" % (prefix, k))))
+        elif line.startswith('%'):
+            break
+        elif len(line) > 0:
+            for t in line.split():
+                x = int(t)
+                if x == 0:
+                    db.addClause(clause)
+                    clause = []
+                    continue
+                v = abs(x)
+                while len(tr) <= v:
+                    k = len(tr)
+                    tr.append(db.variable(names.get(k, "%s%d" % (prefix, k))))
+                clause.append(tr[v] if x > 0 else -tr[v])
+        line = source.readline()
+    if len(clause) > 0:
+        db.addClause(clause)
+    return db
+
+def write(f, out):
+    """Zapiše izraz v konjunktivni normalni obliki v formatu DIMACS CNF.
+    
+    Pred glavo se za vsako spremenljivko zapiše komentar oblike
+    "c <številka> <ime>", ki ga upošteva funkcija read. Če je podan par,
+    kot ga vrne funkcija prop.tseitin, se pomožne spremenljivke označijo s
+    komentarjem "c aux <številka>".
+    
+    Argumenta:
+    f   -- izraz v konjunktivni normalni obliki, zbirka stavkov ali par
+           (izraz, pomožne spremenljivke)
+    out -- pot do datoteke ali objekt z metodo write
+    """
+    if isinstance(out, basestring):
+        with open(out, 'w') as o:
+            return write(f, o)
+    aux = {}
+    if type(f) == tuple:
+        f, aux = f
+    db = f if isinstance(f, dpll.ClauseDB) else dpll.ClauseDB(f)
+    for i in range(1, len(db.names)):
+        out.write("c %d %s\n" % (i, db.names[i]))
+        if db.names[i] in aux:
+            out.write("c aux %d\n" % i)
+    out.write("p cnf %d %d\n" % (db.numVars(), len(db)))
+    for i in range(len(db)):
+        out.write(' '.join([str(x) for x in db.clause(i)] + ['0']) + "\n")
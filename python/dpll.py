@@ -1,88 +1,1408 @@
 #!/usr/bin/python
 # -*- coding: utf-8 -*-
 
+from array import array
+import counters
+import horn
+import preprocessing
 import prop
+import twosat
 
-def dpllStep(l, trace=False):
-    """Korak metode DPLL.
+class ClauseDB:
+
+    """Zbirka disjunktov (stavkov) s celoštevilskimi literali.
+    
+    Spremenljivke so oštevilčene od 1 naprej, literal je številka
+    spremenljivke, negirani literal pa njena nasprotna vrednost. Literali
+    vseh stavkov so zaporedoma shranjeni v eni tabeli, začetki stavkov pa v
+    tabeli odmikov.
+    
+    Metode:
+    __init__   -- konstruktor
+    __len__    -- število stavkov
+    variable   -- vrne številko spremenljivke
+    literal    -- vrne celoštevilski literal za logični izraz
+    addClause  -- doda stavek
+    addFormula -- doda stavke izraza v konjunktivni normalni obliki
+    clause     -- vrne literale stavka
+    copy       -- vrne kopijo zbirke
+    numVars    -- število spremenljivk
+    model      -- vrne prireditev vrednosti v obliki slovarja
+    
+    Spremenljivke:
+    var   -- slovar, ki imenom spremenljivk priredi njihove številke
+    names -- seznam imen spremenljivk (na mestu 0 je None)
+    lits  -- tabela literalov vseh stavkov
+    start -- tabela odmikov začetkov stavkov, zadnji element je dolžina
+             tabele lits
+    """
+    
+    def __init__(self, f=None):
+        """Konstruktor. Če je podan izraz f, doda njegove stavke.
+        
+        Argument:
+        f -- izraz v konjunktivni normalni obliki, privzeto None
+        """
+        self.var = {}
+        self.names = [None]
+        self.lits = array('i')
+        self.start = array('i', [0])
+        if f != None:
+            self.addFormula(f)
+            
+    def __len__(self):
+        """Vrne število stavkov."""
+        return len(self.start) - 1
+        
+    def variable(self, p):
+        """Vrne številko spremenljivke z imenom p. Če spremenljivke še ni,
+        ji dodeli novo številko.
+        
+        Argument:
+        p -- ime spremenljivke
+        """
+        if p not in self.var:
+            self.var[p] = len(self.names)
+            self.names.append(p)
+        return self.var[p]
+        
+    def literal(self, f):
+        """Vrne celoštevilski literal, ki ustreza izrazu f.
+        
+        Argument:
+        f -- spremenljivka ali negirana spremenljivka
+        """
+        if isinstance(f, prop.Literal):
+            return self.variable(f.p)
+        elif isinstance(f, prop.Not) and isinstance(f.t, prop.Literal):
+            return -self.variable(f.t.p)
+        else:
+            raise Exception('Only literals and their negations can appear in clauses!')
+            
+    def addClause(self, c):
+        """Doda stavek s podanimi celoštevilskimi literali.
+        
+        Ponovljeni literali se odstranijo. Stavek, ki vsebuje literal in
+        njegovo negacijo, je vedno resničen in se ne doda.
+        
+        Vrne True, če je bil stavek dodan, in False sicer.
+        
+        Argument:
+        c -- seznam celoštevilskih literalov
+        """
+        s = set(c)
+        if any([-x in s for x in s]):
+            return False
+        self.lits.extend([x for i, x in enumerate(c) if x not in c[:i]] if len(s) < len(c) else c)
+        self.start.append(len(self.lits))
+        return True
+        
+    def addFormula(self, f):
+        """Doda stavke izraza f v konjunktivni normalni obliki.
+        
+        Argument:
+        f -- izraz v konjunktivni normalni obliki
+        """
+        for x in (f.l if isinstance(f, prop.And) else [f]):
+            if isinstance(x, prop.Or):
+                self.addClause([self.literal(y) for y in x.l])
+            else:
+                self.addClause([self.literal(x)])
+                
+    def clause(self, i):
+        """Vrne literale i-tega stavka.
+        
+        Argument:
+        i -- indeks stavka
+        """
+        return self.lits[self.start[i]:self.start[i+1]]
+        
+    def copy(self):
+        """Vrne kopijo zbirke stavkov."""
+        db = ClauseDB()
+        db.var = dict(self.var)
+        db.names = self.names[:]
+        db.lits = array('i', self.lits)
+        db.start = array('i', self.start)
+        return db
+        
+    def numVars(self):
+        """Vrne število spremenljivk."""
+        return len(self.names) - 1
+        
+    def model(self, val):
+        """Vrne prireditev vrednosti spremenljivkam v obliki slovarja.
+        
+        Spremenljivke brez vrednosti se ne vključijo.
+        
+        Argument:
+        val -- tabela vrednosti spremenljivk (1, -1 ali 0 za nedoločeno)
+        """
+        return {self.names[i]: val[i] > 0 for i in range(1, len(self.names)) if val[i] != 0}
+
+class Propagator:
+
+    """Stanje iskanja nad zbirko stavkov z opazovanimi literali.
+    
+    Vsak stavek z vsaj dvema literaloma opazuje svoja prva dva literala.
+    Ko literal postane neresničen, se pregledajo le stavki, ki ga opazujejo:
+    stavek si poišče nov neneresničen literal za opazovanje, sicer pa je
+    enotski (preostali opazovani literal se nastavi) ali v protislovju.
+    Literali v tabeli stavkov se pri tem prerazporedijo.
+    
+    Spremenljivke za odločitve izbira hevristika, podana z imenom iz slovarja
+    heuristics.
+    
+    Metode:
+    __init__  -- konstruktor
+    index     -- indeks literala v seznamu opazovanj
+    value     -- vrednost literala
+    assign    -- nastavi literal na resnično vrednost
+    decide    -- začne nov nivo odločitev in nastavi literal
+    undo      -- prekliče vrednosti do danega mesta na sledi
+    backjump  -- prekliče vrednosti do danega nivoja odločitev
+    propagate -- izvede propagacijo enotskih stavkov
+    free      -- vrne prvo spremenljivko brez vrednosti
+    grow      -- prilagodi tabele številu spremenljivk v zbirki
+    
+    Spremenljivke:
+    heuristic -- hevristika za izbiro odločitev
+    db       -- zbirka stavkov
+    val      -- tabela vrednosti spremenljivk (1, -1 ali 0 za nedoločeno)
+    level    -- tabela nivojev odločitev, na katerih so bile spremenljivke
+                nastavljene
+    reason   -- tabela indeksov stavkov, ki so vsilili vrednosti
+                spremenljivk (-1 za odločitve in enotske stavke)
+    trail    -- seznam nastavljenih literalov v vrstnem redu nastavljanja
+    lim      -- seznam dolžin sledi ob začetkih nivojev odločitev
+    head     -- mesto na sledi, od katerega literali še niso propagirani
+    watches  -- seznam seznamov stavkov, ki opazujejo posamezni literal
+    conflict -- ali je že začetna zbirka stavkov v protislovju
+    decisions    -- število odločitev
+    propagations -- število propagiranih literalov
+    conflicts    -- število protislovij
+    stats        -- statistika (objekt razreda counters.Stats), ki dobiva
+                    dogodke "decision" in "conflict", ali None
+    """
+    
+    def __init__(self, db, heuristic="order", phase=False, polarity=1):
+        """Konstruktor. Nastavi opazovane literale in vrednosti literalov
+        iz enotskih stavkov.
+        
+        Argumenti:
+        db        -- zbirka stavkov
+        heuristic -- ime hevristike za izbiro odločitev, privzeto "order"
+        phase     -- ali naj se shranjujejo zadnje vrednosti spremenljivk,
+                     privzeto False
+        polarity  -- začetna vrednost odločitev (1 ali -1), privzeto 1
+        """
+        if heuristic not in heuristics:
+            raise Exception('Unknown heuristic!')
+        n = db.numVars()
+        self.db = db
+        self.val = array('b', [0]) * (n + 1)
+        self.level = array('i', [0]) * (n + 1)
+        self.reason = array('i', [-1]) * (n + 1)
+        self.trail = []
+        self.lim = []
+        self.head = 0
+        self.watches = [[] for i in range(2*n + 2)]
+        self.conflict = False
+        self.decisions = 0
+        self.propagations = 0
+        self.conflicts = 0
+        self.stats = None
+        lits = db.lits
+        start = db.start
+        for i in range(len(db)):
+            if start[i+1] - start[i] >= 2:
+                self.watches[self.index(lits[start[i]])].append(i)
+                self.watches[self.index(lits[start[i]+1])].append(i)
+            elif start[i+1] == start[i]:
+                self.conflict = True
+            else:
+                v = self.value(lits[start[i]])
+                if v < 0:
+                    self.conflict = True
+                elif v == 0:
+                    self.assign(lits[start[i]])
+        self.heuristic = heuristics[heuristic](self, phase, polarity)
+        
+    def index(self, x):
+        """Vrne indeks literala x v seznamu opazovanj.
+        
+        Argument:
+        x -- celoštevilski literal
+        """
+        return 2*x if x > 0 else 1 - 2*x
+        
+    def value(self, x):
+        """Vrne vrednost literala x (1, -1 ali 0 za nedoločeno).
+        
+        Argument:
+        x -- celoštevilski literal
+        """
+        return self.val[x] if x > 0 else -self.val[-x]
+        
+    def assign(self, x, reason=-1):
+        """Nastavi literal x na resnično vrednost in ga doda na sled.
+        
+        Argumenta:
+        x      -- celoštevilski literal
+        reason -- indeks stavka, ki je vsilil vrednost, privzeto -1
+        """
+        if x > 0:
+            self.val[x] = 1
+        else:
+            self.val[-x] = -1
+        self.level[abs(x)] = len(self.lim)
+        self.reason[abs(x)] = reason
+        self.trail.append(x)
+        
+    def decide(self, x):
+        """Začne nov nivo odločitev in nastavi literal x na resnično vrednost.
+        
+        Argument:
+        x -- celoštevilski literal
+        """
+        self.lim.append(len(self.trail))
+        self.assign(x)
+        self.decisions += 1
+        if self.stats != None:
+            self.stats.emit("decision", x)
+            
+    def undo(self, mark):
+        """Prekliče vrednosti, nastavljene po mestu mark na sledi.
+        
+        Argument:
+        mark -- dolžina sledi, do katere se prekliče
+        """
+        trail = self.trail
+        val = self.val
+        if self.heuristic.track and len(trail) > mark:
+            self.heuristic.unassign(trail[mark:])
+        while len(trail) > mark:
+            val[abs(trail.pop())] = 0
+        if self.head > mark:
+            self.head = mark
+            
+    def backjump(self, level):
+        """Prekliče vrednosti, nastavljene na nivojih odločitev, višjih od
+        level.
+        
+        Argument:
+        level -- nivo odločitev, na katerega se vrnemo
+        """
+        if len(self.lim) > level:
+            self.undo(self.lim[level])
+            del self.lim[level:]
+            
+    def propagate(self):
+        """Izvede propagacijo enotskih stavkov za vse literale na sledi, ki
+        še niso bili propagirani.
+        
+        Vrne indeks stavka v protislovju ali None, če protislovja ni.
+        """
+        lits = self.db.lits
+        start = self.db.start
+        val = self.val
+        level = self.level
+        reason = self.reason
+        trail = self.trail
+        watches = self.watches
+        lvl = len(self.lim)
+        mark = self.head
+        while self.head < len(trail):
+            x = -trail[self.head]
+            self.head += 1
+            ws = watches[2*x if x > 0 else 1 - 2*x]
+            i = 0
+            j = 0
+            while i < len(ws):
+                c = ws[i]
+                i += 1
+                s = start[c]
+                if lits[s] == x:
+                    lits[s] = lits[s+1]
+                    lits[s+1] = x
+                y = lits[s]
+                v = val[y] if y > 0 else -val[-y]
+                if v > 0:
+                    ws[j] = c
+                    j += 1
+                    continue
+                for k in range(s+2, start[c+1]):
+                    z = lits[k]
+                    if (val[z] if z > 0 else -val[-z]) >= 0:
+                        lits[s+1] = z
+                        lits[k] = x
+                        watches[2*z if z > 0 else 1 - 2*z].append(c)
+                        break
+                else:
+                    ws[j] = c
+                    j += 1
+                    if v < 0:
+                        while i < len(ws):
+                            ws[j] = ws[i]
+                            i += 1
+                            j += 1
+                        del ws[j:]
+                        self.propagations += self.head - mark
+                        self.conflicts += 1
+                        if self.stats != None:
+                            self.stats.emit("conflict", c)
+                        return c
+                    if y > 0:
+                        val[y] = 1
+                    else:
+                        val[-y] = -1
+                    level[abs(y)] = lvl
+                    reason[abs(y)] = c
+                    trail.append(y)
+            del ws[j:]
+        self.propagations += self.head - mark
+        return None
+        
+    def free(self):
+        """Vrne prvo spremenljivko brez vrednosti ali 0, če je ni."""
+        for i in range(1, len(self.val)):
+            if self.val[i] == 0:
+                return i
+        return 0
+        
+    def grow(self):
+        """Prilagodi tabele številu spremenljivk v zbirki stavkov, če so
+        bile medtem dodane nove spremenljivke."""
+        n = self.db.numVars()
+        k = n + 1 - len(self.val)
+        if k <= 0:
+            return
+        self.val.extend(array('b', [0]) * k)
+        self.level.extend(array('i', [0]) * k)
+        self.reason.extend(array('i', [-1]) * k)
+        self.watches.extend([[] for i in range(2*k)])
+        self.heuristic.grow(n)
+
+class Heuristic:
+
+    """Hevristika za izbiro odločitev.
+    
+    Osnovna hevristika izbere prvo spremenljivko brez vrednosti. Če je
+    vklopljeno shranjevanje vrednosti (phase saving), se spremenljivka
+    nastavi na zadnjo vrednost, ki jo je imela, sicer pa na začetno
+    vrednost.
+    
+    Metode:
+    __init__ -- konstruktor
+    pick     -- vrne literal za naslednjo odločitev
+    literal  -- vrne literal za dano spremenljivko
+    unassign -- obvestilo o preklicu vrednosti
+    bump     -- poveča pomembnost spremenljivke
+    decay    -- zmanjša pomembnost vseh spremenljivk
+    conflict -- obvestilo o protislovju
+    grow     -- doda nove spremenljivke
+    
+    Spremenljivke:
+    s        -- stanje iskanja
+    phase    -- ali naj se shranjujejo zadnje vrednosti spremenljivk
+    polarity -- začetna vrednost odločitev
+    saved    -- tabela shranjenih vrednosti spremenljivk
+    track    -- ali je treba hevristiko obveščati o preklicih vrednosti
+    """
+    
+    def __init__(self, s, phase=False, polarity=1):
+        """Konstruktor.
+        
+        Argumenti:
+        s        -- stanje iskanja
+        phase    -- ali naj se shranjujejo zadnje vrednosti spremenljivk,
+                    privzeto False
+        polarity -- začetna vrednost odločitev (1 ali -1), privzeto 1
+        """
+        self.s = s
+        self.phase = phase
+        self.polarity = polarity
+        self.saved = array('b', [polarity]) * (len(s.val))
+        self.track = phase
+        
+    def pick(self):
+        """Vrne literal za naslednjo odločitev ali 0, če imajo vse
+        spremenljivke vrednost."""
+        return self.literal(self.s.free())
+        
+    def literal(self, k):
+        """Vrne literal za spremenljivko k glede na shranjeno vrednost.
+        
+        Argument:
+        k -- številka spremenljivke ali 0
+        """
+        return k if self.saved[k] > 0 else -k
+        
+    def unassign(self, lits):
+        """Obvestilo o preklicu vrednosti literalov.
+        
+        Argument:
+        lits -- seznam literalov, katerih vrednosti so preklicane
+        """
+        if self.phase:
+            for x in lits:
+                self.saved[abs(x)] = 1 if x > 0 else -1
+                
+    def bump(self, k):
+        """Poveča pomembnost spremenljivke k.
+        
+        Generična metoda, ne naredi ničesar.
+        
+        Argument:
+        k -- številka spremenljivke
+        """
+        pass
+        
+    def decay(self):
+        """Zmanjša pomembnost vseh spremenljivk.
+        
+        Generična metoda, ne naredi ničesar.
+        """
+        pass
+        
+    def conflict(self, c):
+        """Obvestilo o protislovju v stavku c, ki ga ne sledi analiza.
+        
+        Poveča pomembnost spremenljivk v stavku.
+        
+        Argument:
+        c -- indeks stavka v protislovju
+        """
+        for x in self.s.db.clause(c):
+            self.bump(abs(x))
+        self.decay()
+        
+    def grow(self, n):
+        """Doda spremenljivke do številke n z začetno vrednostjo.
+        
+        Argument:
+        n -- novo število spremenljivk
+        """
+        self.saved.extend(array('b', [self.polarity]) * (n + 1 - len(self.saved)))
+
+class VSIDS(Heuristic):
+
+    """Hevristika VSIDS (variable state independent decaying sum).
+    
+    Izbere spremenljivko brez vrednosti z največjo aktivnostjo. Aktivnost
+    spremenljivke se poveča, ko sodeluje v protislovju, povečanje pa s
+    časom raste, kar ustreza eksponentnemu upadanju starih aktivnosti.
+    Spremenljivke so urejene v dvojiški kopici.
+    
+    Deduje od razreda Heuristic.
+    
+    Nepodedovane metode:
+    up   -- premakne element kopice navzgor
+    down -- premakne element kopice navzdol
+    push -- doda spremenljivko v kopico
+    pop  -- odstrani in vrne spremenljivko z največjo aktivnostjo
+    
+    Nepodedovane spremenljivke:
+    activity  -- tabela aktivnosti spremenljivk
+    increment -- trenutno povečanje aktivnosti
+    heap      -- dvojiška kopica spremenljivk
+    pos       -- tabela mest spremenljivk v kopici (-1, če je ni v kopici)
+    """
+    
+    def __init__(self, s, phase=False, polarity=1):
+        """Konstruktor. V kopico postavi vse spremenljivke.
+        
+        Argumenti:
+        s        -- stanje iskanja
+        phase    -- ali naj se shranjujejo zadnje vrednosti spremenljivk,
+                    privzeto False
+        polarity -- začetna vrednost odločitev (1 ali -1), privzeto 1
+        """
+        Heuristic.__init__(self, s, phase, polarity)
+        n = len(s.val) - 1
+        self.activity = array('d', [0.0]) * (n + 1)
+        self.increment = 1.0
+        self.heap = list(range(1, n + 1))
+        self.pos = array('i', range(-1, n))
+        self.track = True
+        
+    def up(self, i):
+        """Premakne element kopice na mestu i navzgor.
+        
+        Argument:
+        i -- mesto v kopici
+        """
+        heap = self.heap
+        pos = self.pos
+        act = self.activity
+        k = heap[i]
+        while i > 0:
+            j = (i - 1) >> 1
+            if act[heap[j]] >= act[k]:
+                break
+            heap[i] = heap[j]
+            pos[heap[i]] = i
+            i = j
+        heap[i] = k
+        pos[k] = i
+        
+    def down(self, i):
+        """Premakne element kopice na mestu i navzdol.
+        
+        Argument:
+        i -- mesto v kopici
+        """
+        heap = self.heap
+        pos = self.pos
+        act = self.activity
+        k = heap[i]
+        n = len(heap)
+        while True:
+            j = 2*i + 1
+            if j >= n:
+                break
+            if j + 1 < n and act[heap[j+1]] > act[heap[j]]:
+                j += 1
+            if act[heap[j]] <= act[k]:
+                break
+            heap[i] = heap[j]
+            pos[heap[i]] = i
+            i = j
+        heap[i] = k
+        pos[k] = i
+        
+    def push(self, k):
+        """Doda spremenljivko k v kopico, če je še ni v njej.
+        
+        Argument:
+        k -- številka spremenljivke
+        """
+        if self.pos[k] < 0:
+            self.heap.append(k)
+            self.up(len(self.heap) - 1)
+            
+    def pop(self):
+        """Odstrani in vrne spremenljivko z največjo aktivnostjo."""
+        heap = self.heap
+        k = heap[0]
+        self.pos[k] = -1
+        last = heap.pop()
+        if len(heap) > 0:
+            heap[0] = last
+            self.down(0)
+        return k
+        
+    def pick(self):
+        """Vrne literal za spremenljivko brez vrednosti z največjo
+        aktivnostjo ali 0, če imajo vse spremenljivke vrednost."""
+        val = self.s.val
+        while len(self.heap) > 0:
+            k = self.pop()
+            if val[k] == 0:
+                return self.literal(k)
+        return 0
+        
+    def unassign(self, lits):
+        """Obvestilo o preklicu vrednosti literalov. Spremenljivke vrne v
+        kopico.
+        
+        Argument:
+        lits -- seznam literalov, katerih vrednosti so preklicane
+        """
+        Heuristic.unassign(self, lits)
+        for x in lits:
+            self.push(abs(x))
+            
+    def bump(self, k):
+        """Poveča aktivnost spremenljivke k.
+        
+        Argument:
+        k -- številka spremenljivke
+        """
+        act = self.activity
+        act[k] += self.increment
+        if act[k] > 1e100:
+            for i in range(len(act)):
+                act[i] *= 1e-100
+            self.increment *= 1e-100
+        if self.pos[k] >= 0:
+            self.up(self.pos[k])
+            
+    def decay(self):
+        """Zmanjša aktivnost vseh spremenljivk s povečanjem prihodnjih
+        povečanj."""
+        self.increment /= 0.95
+        
+    def grow(self, n):
+        """Doda spremenljivke do številke n in jih postavi v kopico.
+        
+        Argument:
+        n -- novo število spremenljivk
+        """
+        m = len(self.activity)
+        Heuristic.grow(self, n)
+        self.activity.extend(array('d', [0.0]) * (n + 1 - m))
+        self.pos.extend(array('i', [-1]) * (n + 1 - m))
+        for k in range(m, n + 1):
+            self.push(k)
+
+class JeroslowWang(Heuristic):
+
+    """Dvostranska hevristika Jeroslowa in Wanga.
+    
+    Vsak literal dobi utež, ki je vsota števil 2^-|c| po vseh stavkih c, v
+    katerih se pojavi. Izbere se spremenljivka brez vrednosti z največjo
+    vsoto uteži obeh literalov, in sicer literal z večjo utežjo. Uteži se
+    izračunajo enkrat, na začetnih stavkih.
+    
+    Izbira odločitve stavkov ne pregleduje, vendar se uteži med iskanjem ne
+    spreminjajo, zato je vrstni red odločitev tog kot pri privzeti
+    hevristiki in iskanje brez učenja (funkcija dpll) že pri sudokuju
+    problemi.sud ne konča v razumnem času. Hevristika je namenjena le
+    primerjavam z ostalimi hevristikami.
+    
+    Deduje od razreda Heuristic.
+    
+    Nepodedovana spremenljivka:
+    order -- seznam literalov, urejenih po padajoči uteži spremenljivke
+    """
+    
+    def __init__(self, s, phase=False, polarity=1):
+        """Konstruktor. Izračuna uteži literalov.
+        
+        Argumenti:
+        s        -- stanje iskanja
+        phase    -- ali naj se shranjujejo zadnje vrednosti spremenljivk,
+                    privzeto False
+        polarity -- začetna vrednost odločitev (1 ali -1), privzeto 1
+        """
+        Heuristic.__init__(self, s, phase, polarity)
+        n = len(s.val) - 1
+        db = s.db
+        w = array('d', [0.0]) * (2*n + 2)
+        for i in range(len(db)):
+            u = 2.0 ** (db.start[i] - db.start[i+1])
+            for j in range(db.start[i], db.start[i+1]):
+                w[s.index(db.lits[j])] += u
+        key = lambda k: w[2*k] + w[2*k+1]
+        self.order = [k if w[2*k] >= w[2*k+1] else -k for k in sorted(range(1, n + 1), key=key, reverse=True)]
+        if not phase:
+            for x in self.order:
+                self.saved[abs(x)] = 1 if x > 0 else -1
+                
+    def pick(self):
+        """Vrne literal za spremenljivko brez vrednosti z največjo utežjo
+        ali 0, če imajo vse spremenljivke vrednost."""
+        val = self.s.val
+        for x in self.order:
+            if val[abs(x)] == 0:
+                return self.literal(abs(x))
+        return 0
+        
+    def grow(self, n):
+        """Doda spremenljivke do številke n na konec vrstnega reda.
+        
+        Argument:
+        n -- novo število spremenljivk
+        """
+        m = len(self.saved)
+        Heuristic.grow(self, n)
+        self.order.extend(range(m, n + 1))
+
+class MOMS(Heuristic):
+
+    """Hevristika MOMS (maximum occurrences in clauses of minimum size).
+    
+    Med stavki, ki še niso resnični, poišče tiste z najmanj literali brez
+    vrednosti, in izbere spremenljivko, ki se v njih največkrat pojavi,
+    pri čemer ima prednost spremenljivka s čim bolj uravnoteženimi
+    pojavitvami obeh literalov. Nastavi se literal z več pojavitvami.
+    Vsaka izbira pregleda vse stavke (tudi naučene), zato je ena odločitev
+    za več velikostnih razredov dražja kot pri hevristiki VSIDS. Hevristika
+    je namenjena le primerjavam z ostalimi hevristikami.
+    
+    Deduje od razreda Heuristic.
+    """
+    
+    def pick(self):
+        """Vrne izbrani literal ali 0, če imajo vse spremenljivke vrednost."""
+        s = self.s
+        lits = s.db.lits
+        start = s.db.start
+        val = s.val
+        best = None
+        count = {}
+        for i in range(len(s.db)):
+            free = []
+            for j in range(start[i], start[i+1]):
+                x = lits[j]
+                v = val[x] if x > 0 else -val[-x]
+                if v > 0:
+                    break
+                elif v == 0:
+                    free.append(x)
+            else:
+                if len(free) == 0 or (best != None and len(free) > best):
+                    continue
+                if best == None or len(free) < best:
+                    best = len(free)
+                    count = {}
+                for x in free:
+                    count[x] = count.get(x, 0) + 1
+        if best == None:
+            return s.free()
+        key = lambda k: (count.get(k, 0) + count.get(-k, 0)) * 1024 + count.get(k, 0) * count.get(-k, 0)
+        k = max(set([abs(x) for x in count]), key=key)
+        if self.phase:
+            return self.literal(k)
+        return k if count.get(k, 0) >= count.get(-k, 0) else -k
+
+# Hevristike za izbiro odločitev po imenih
+heuristics = {"order": Heuristic, "vsids": VSIDS, "jw": JeroslowWang, "moms": MOMS}
+
+def dpllStep(s, trace=False):
+    """Iskanje po metodi DPLL.
+    
+    Iskanje teče v zanki brez rekurzije. Odločitve so shranjene na sledi
+    stanja iskanja (na začetkih nivojev odločitev), ob vračanju pa se
+    vrednosti prekličejo po sledi, zato poraba pomnilnika ni odvisna od
+    globine iskanja. Za vsak nivo se hrani le še oznaka, ali je bila
+    odločitev že obrnjena.
+    
+    Vrne True, če je uspel nastaviti vrednosti spremenljivk tako, da so vsi
+    stavki resnični, in False sicer.
     
     Argumenta:
-    l     -- seznam disjunktov
+    s     -- stanje iskanja
     trace -- ali naj se izpisuje sled dokazovanja, privzeto False
     """
-    num = 1
-    out = []
-    while num > 0:
-        while num > 0:
-            literals = {}
-            next = []
-            for x in l:
-                if isinstance(x, prop.Literal):
-                    if x.p in literals and not literals[x.p]:
-                        if trace:
-                            print("Contradiction for literal %s" % x.p)
-                        return False
-                    else:
-                        literals[x.p] = True
-                elif isinstance(x, prop.Not):
-                    if x.t.p in literals and literals[x.t.p]:
-                        if trace:
-                            print("Contradiction for literal %s" % x.p)
-                        return False
+    flipped = []
+    while True:
+        mark = s.head
+        c = s.propagate()
+        if c == None:
+            if trace > 1:
+                print("Found %d literals" % (len(s.trail) - mark))
+            x = s.heuristic.pick()
+            if x == 0:
+                return True
+            if trace:
+                print("Trying %s:%s" % (s.db.names[abs(x)], 'T' if x > 0 else 'F'))
+            s.decide(x)
+            flipped.append(False)
+            continue
+        s.heuristic.conflict(c)
+        if trace:
+            print("Contradiction in clause %s" % [s.db.names[abs(x)] if x > 0 else '~' + s.db.names[-x] for x in s.db.clause(c)])
+        while len(flipped) > 0 and flipped[-1]:
+            x = s.trail[s.lim[-1]]
+            if trace:
+                print("Failed %s:%s" % (s.db.names[abs(x)], 'T' if x > 0 else 'F'))
+            flipped.pop()
+            s.backjump(len(flipped))
+        if len(flipped) == 0:
+            return False
+        x = s.trail[s.lim[-1]]
+        if trace:
+            print("Failed %s:%s" % (s.db.names[abs(x)], 'T' if x > 0 else 'F'))
+            print("Trying %s:%s" % (s.db.names[abs(x)], 'F' if x > 0 else 'T'))
+        s.backjump(len(flipped) - 1)
+        s.decide(-x)
+        flipped[-1] = True
+
+class Solver(Propagator):
+
+    """Reševalnik s spoznavanjem stavkov iz protislovij (CDCL).
+    
+    Ob protislovju analizira graf implikacij do prve edinstvene točke
+    (first UIP), doda naučeni stavek in se vrne na najvišji nivo odločitev,
+    na katerem je naučeni stavek enotski. Naučeni stavki imajo aktivnost, ki
+    se poveča, ko stavek sodeluje v analizi; ob ponovnih zagonih (po
+    Lubyjevem zaporedju) se manj aktivna polovica naučenih stavkov odstrani.
+    
+    Reševalnik je inkrementalen: med klici metode solve lahko dodajamo
+    stavke (tudi z novimi spremenljivkami), naučeni stavki in aktivnosti pa
+    se ohranijo. Metodi solve lahko podamo predpostavke, ki se nastavijo kot
+    prve odločitve; če zaradi njih zbirka ni izpolnljiva, se v core shrani
+    podmnožica predpostavk, ki je za to odgovorna.
+    
+    Deduje od razreda Propagator.
+    
+    Nepodedovane metode:
+    __init__     -- konstruktor
+    addClause    -- doda stavek
+    addFormula   -- doda stavke izraza v konjunktivni normalni obliki
+    flush        -- v zbirko prenese dodane stavke
+    analyze      -- analiza protislovja
+    analyzeFinal -- poišče predpostavke, odgovorne za neizpolnljivost
+    learn        -- doda naučeni stavek
+    bump         -- poveča aktivnost stavka
+    compact      -- prepiše zbirko stavkov
+    reduce       -- odstrani manj aktivne naučene stavke
+    solve        -- poišče prireditev, pri kateri so vsi stavki resnični
+    model        -- vrne najdeno prireditev v obliki slovarja
+    
+    Nepodedovane spremenljivke:
+    original   -- število prvotnih stavkov
+    learnts    -- seznam indeksov naučenih stavkov
+    activity   -- tabela aktivnosti stavkov
+    increment  -- trenutno povečanje aktivnosti
+    maxLearnts -- število naučenih stavkov, ob katerem se zbirka skrči
+    seen       -- oznake spremenljivk med analizo protislovja
+    restarts   -- število ponovnih zagonov
+    pending    -- seznam dodanih stavkov, ki še niso v zbirki
+    core       -- predpostavke, odgovorne za neizpolnljivost pri zadnjem
+                  klicu metode solve
+    """
+    
+    def __init__(self, db=None, heuristic="vsids", phase=True):
+        """Konstruktor. Odločitve privzeto nastavljajo spremenljivke na
+        neresnično vrednost.
+        
+        Argumenti:
+        db        -- zbirka stavkov, privzeto None (prazna zbirka)
+        heuristic -- ime hevristike za izbiro odločitev, privzeto "vsids"
+        phase     -- ali naj se shranjujejo zadnje vrednosti spremenljivk,
+                     privzeto True
+        """
+        if db == None:
+            db = ClauseDB()
+        Propagator.__init__(self, db, heuristic, phase, -1)
+        self.original = len(db)
+        self.learnts = []
+        self.activity = array('d', [0.0]) * len(db)
+        self.increment = 1.0
+        self.maxLearnts = max(len(db) // 3, 100)
+        self.seen = bytearray(db.numVars() + 1)
+        self.restarts = 0
+        self.pending = []
+        self.core = []
+        
+    def addClause(self, c):
+        """Doda stavek, ki se v zbirko prenese ob naslednjem klicu metode
+        solve.
+        
+        Argument:
+        c -- seznam celoštevilskih literalov ali spremenljivk in njihovih
+             negacij
+        """
+        self.pending.append([x if type(x) == int else self.db.literal(x) for x in c])
+        
+    def addFormula(self, f):
+        """Doda stavke izraza f v konjunktivni normalni obliki.
+        
+        Argument:
+        f -- izraz v konjunktivni normalni obliki
+        """
+        for x in (f.l if isinstance(f, prop.And) else [f]):
+            self.addClause(x.l if isinstance(x, prop.Or) else [x])
+            
+    def grow(self):
+        """Prilagodi tabele številu spremenljivk v zbirki stavkov."""
+        Propagator.grow(self)
+        self.seen.extend(bytearray(len(self.val) - len(self.seen)))
+        
+    def flush(self):
+        """V zbirko prenese dodane stavke.
+        
+        Klicati jo je treba na nivoju odločitev 0. Stavki se poenostavijo
+        glede na vrednosti na nivoju 0: resnični stavki se izpustijo,
+        neresnični literali pa odstranijo. Enotski stavki se takoj nastavijo,
+        ostali pa se dodajo za prvotne stavke.
+        """
+        if len(self.pending) == 0:
+            return
+        self.grow()
+        extra = []
+        for c in self.pending:
+            lits = set(c)
+            if any([-x in lits or self.value(x) > 0 for x in lits]):
+                continue
+            c = [x for x in sorted(lits, key=c.index) if self.value(x) == 0]
+            if len(c) == 0:
+                self.conflict = True
+            elif len(c) == 1:
+                self.assign(c[0])
+            else:
+                extra.append(c)
+        self.pending = []
+        if len(extra) > 0:
+            self.compact(set(), extra)
+            
+    def analyze(self, c):
+        """Analizira protislovje v stavku c.
+        
+        Vrne par (naučeni stavek, nivo vrnitve). Prvi literal naučenega
+        stavka je negacija prve edinstvene točke, drugi pa literal z
+        najvišjim nivojem med ostalimi.
+        
+        Argument:
+        c -- indeks stavka v protislovju
+        """
+        lits = self.db.lits
+        start = self.db.start
+        level = self.level
+        seen = self.seen
+        trail = self.trail
+        lvl = len(self.lim)
+        learnt = [0]
+        counter = 0
+        p = 0
+        i = len(trail) - 1
+        while True:
+            self.bump(c)
+            for j in range(start[c] + (1 if p != 0 else 0), start[c+1]):
+                q = lits[j]
+                v = abs(q)
+                if not seen[v] and level[v] > 0:
+                    seen[v] = 1
+                    self.heuristic.bump(v)
+                    if level[v] >= lvl:
+                        counter += 1
                     else:
-                        literals[x.t.p] = False
-                elif len(x.l) == 0:
+                        learnt.append(q)
+            while not seen[abs(trail[i])]:
+                i -= 1
+            p = trail[i]
+            i -= 1
+            seen[abs(p)] = 0
+            counter -= 1
+            if counter == 0:
+                break
+            c = self.reason[abs(p)]
+        learnt[0] = -p
+        for q in learnt[1:]:
+            seen[abs(q)] = 0
+        if len(learnt) == 1:
+            return (learnt, 0)
+        m = max(range(1, len(learnt)), key=lambda j: level[abs(learnt[j])])
+        learnt[1], learnt[m] = learnt[m], learnt[1]
+        return (learnt, level[abs(learnt[1])])
+        
+    def analyzeFinal(self, p):
+        """Vrne seznam predpostavk, zaradi katerih je predpostavka p
+        neresnična, skupaj s p.
+        
+        Argument:
+        p -- neresnični celoštevilski literal predpostavke
+        """
+        core = [p]
+        if self.level[abs(p)] == 0:
+            return core
+        seen = self.seen
+        seen[abs(p)] = 1
+        for i in range(len(self.trail) - 1, self.lim[0] - 1, -1):
+            x = self.trail[i]
+            k = abs(x)
+            if seen[k]:
+                if self.reason[k] < 0:
+                    core.append(x)
+                else:
+                    for q in self.db.clause(self.reason[k])[1:]:
+                        if self.level[abs(q)] > 0:
+                            seen[abs(q)] = 1
+                seen[k] = 0
+        return core
+        
+    def learn(self, learnt):
+        """Doda naučeni stavek in začne opazovati njegova prva dva literala.
+        
+        Vrne indeks dodanega stavka.
+        
+        Argument:
+        learnt -- seznam literalov naučenega stavka
+        """
+        c = len(self.db)
+        self.db.lits.extend(learnt)
+        self.db.start.append(len(self.db.lits))
+        self.activity.append(self.increment)
+        self.learnts.append(c)
+        self.watches[self.index(learnt[0])].append(c)
+        self.watches[self.index(learnt[1])].append(c)
+        return c
+        
+    def bump(self, c):
+        """Poveča aktivnost naučenega stavka c.
+        
+        Argument:
+        c -- indeks stavka
+        """
+        if c < self.original:
+            return
+        self.activity[c] += self.increment
+        if self.activity[c] > 1e20:
+            for i in self.learnts:
+                self.activity[i] *= 1e-20
+            self.increment *= 1e-20
+            
+    def compact(self, remove, extra=[]):
+        """Prepiše zbirko stavkov brez naučenih stavkov z indeksi iz
+        množice remove, za prvotne stavke pa doda stavke iz seznama extra.
+        Nastavi opazovane literale na prva dva literala vsakega stavka.
+        
+        Klicati jo je treba na nivoju odločitev 0, ko so vse vrednosti
+        propagirane, dodani stavki pa ne smejo vsebovati literalov z
+        vrednostjo.
+        
+        Argumenta:
+        remove -- množica indeksov naučenih stavkov, ki se odstranijo
+        extra  -- seznam dodanih stavkov, privzeto prazen
+        """
+        db = self.db
+        lits = db.lits
+        start = db.start
+        original = self.original
+        newLits = array('i', lits[:start[original]])
+        newStart = array('i', start[:original+1])
+        newActivity = array('d', self.activity[:original])
+        for c in extra:
+            newLits.extend(c)
+            newStart.append(len(newLits))
+            newActivity.append(0.0)
+        self.original += len(extra)
+        self.learnts = []
+        for c in range(original, len(db)):
+            if c not in remove:
+                self.learnts.append(len(newStart) - 1)
+                newLits.extend(lits[start[c]:start[c+1]])
+                newStart.append(len(newLits))
+                newActivity.append(self.activity[c])
+        db.lits = newLits
+        db.start = newStart
+        self.activity = newActivity
+        self.watches = [[] for i in range(len(self.watches))]
+        for c in range(len(db)):
+            if newStart[c+1] - newStart[c] >= 2:
+                self.watches[self.index(newLits[newStart[c]])].append(c)
+                self.watches[self.index(newLits[newStart[c]+1])].append(c)
+        for x in self.trail:
+            self.reason[abs(x)] = -1
+            
+    def reduce(self):
+        """Odstrani manj aktivno polovico naučenih stavkov z več kot dvema
+        literaloma in ustrezno preštevilči stavke.
+        
+        Klicati jo je treba na nivoju odločitev 0, ko so vse vrednosti
+        propagirane.
+        """
+        start = self.db.start
+        order = sorted(self.learnts, key=lambda c: self.activity[c])
+        self.compact(set([c for c in order[:len(order)//2] if start[c+1] - start[c] > 2]))
+        self.maxLearnts += self.maxLearnts // 10
+        
+    def solve(self, trace=False, assumptions=[]):
+        """Poišče prireditev vrednosti, pri kateri so vsi stavki in vse
+        predpostavke resnični.
+        
+        Vrne True, če jo najde, in False sicer. Najdena prireditev je v
+        tabeli val. Če zbirka stavkov ni izpolnljiva zaradi predpostavk, je v
+        seznamu core podmnožica predpostavk, ki skupaj z zbirko ni
+        izpolnljiva; če zbirka ni izpolnljiva ne glede na predpostavke, je
+        seznam core prazen.
+        
+        Argumenta:
+        trace       -- ali naj se izpisuje sled dokazovanja, privzeto False
+        assumptions -- seznam predpostavk (celoštevilskih literalov ali
+                       spremenljivk in njihovih negacij), privzeto prazen
+        """
+        self.backjump(0)
+        lits = [x if type(x) == int else self.db.literal(x) for x in assumptions]
+        self.flush()
+        self.grow()
+        self.core = []
+        if self.conflict:
+            if trace:
+                print("Empty disjunction found")
+            return False
+        restarts = 0
+        budget = 100
+        while True:
+            c = self.propagate()
+            if c != None:
+                budget -= 1
+                if len(self.lim) == 0:
                     if trace:
-                        print("Empty disjunction found")
+                        print("Contradiction at level 0")
+                    self.conflict = True
                     return False
-                elif not any([prop.Not(y) in x.l for y in x.l if isinstance(y, prop.Literal)]):
-                    next.append(x)
-            num = len(literals)
-            out += list(literals.items())
-            l = [y for y in [x.apply(literals) for x in next] if not isinstance(y, prop.And)]
-            if trace > 1:
-                print("Found %d literals: %s, simplified to %s" % (num, literals, l))
-        pure = {}
-        for d in l:
-            for x in d.l:
-                if isinstance(x, prop.Literal):
-                    pure[x.p] = None if (x.p in pure and pure[x.p] != True) else True
+                learnt, back = self.analyze(c)
+                if trace > 1:
+                    print("Conflict at level %d, learned clause of length %d, backjumping to level %d" % (len(self.lim), len(learnt), back))
+                self.backjump(back)
+                if len(learnt) == 1:
+                    self.assign(learnt[0])
                 else:
-                    pure[x.t.p] = None if (x.t.p in pure and pure[x.t.p] != False) else False
-        purs = [(k, v) for (k, v) in pure.items() if v != None]
-        num = len(purs)
-        out += purs
-        l = [y for y in [x.apply(dict(purs)) for x in l] if not isinstance(y, prop.And)]
-        if trace > 1:
-            print("Found %d pures: %s, simplified to %s" % (num, purs, l))
-    if len(l) == 0:
-        return dict(out)
-    p, v = pure.popitem()
-    if trace:
-        print("Trying %s:T" % p)
-    true = dpllStep([y for y in [x.apply({p: True}) for x in l] if not isinstance(y, prop.And)], trace)
-    if type(true) == dict:
-        return dict(out + [(p, True)] + list(true.items()))
-    if trace:
-        print("Failed %s:T" % p)
-        print("Trying %s:F" % p)
-    false = dpllStep([y for y in [x.apply({p: False}) for x in l] if not isinstance(y, prop.And)], trace)
-    if type(false) == dict:
-        return dict(out + [(p, False)] + list(false.items()))
-    if trace:
-        print("Failed %s:F" % p)
-    return False
-        
-def dpll(f, trace=False):
-    """Glavni program metode DPLL.
+                    self.assign(learnt[0], self.learn(learnt))
+                if self.stats != None:
+                    self.stats.emit("learn", learnt)
+                self.increment /= 0.999
+                self.heuristic.decay()
+            else:
+                if budget <= 0:
+                    restarts += 1
+                    budget = 100 * luby(restarts + 1)
+                    self.restarts += 1
+                    self.backjump(0)
+                    if self.stats != None:
+                        self.stats.emit("restart", self.restarts)
+                    if trace:
+                        print("Restart %d after %d conflicts" % (restarts, self.conflicts))
+                    if len(self.learnts) >= self.maxLearnts:
+                        self.reduce()
+                x = 0
+                while len(self.lim) < len(lits):
+                    p = lits[len(self.lim)]
+                    v = self.value(p)
+                    if v > 0:
+                        self.lim.append(len(self.trail))
+                    elif v < 0:
+                        core = set(self.analyzeFinal(p))
+                        self.core = [y for x, y in zip(lits, assumptions) if x in core]
+                        if trace:
+                            print("Assumption %s:%s failed" % (self.db.names[abs(p)], 'T' if p > 0 else 'F'))
+                        return False
+                    else:
+                        x = p
+                        break
+                if x == 0:
+                    x = self.heuristic.pick()
+                    if x == 0:
+                        return True
+                if trace > 2:
+                    print("Deciding %s:%s" % (self.db.names[abs(x)], 'T' if x > 0 else 'F'))
+                self.decide(x)
+                
+    def model(self):
+        """Vrne najdeno prireditev vrednosti spremenljivkam v obliki
+        slovarja."""
+        return self.db.model(self.val)
+
+def models(f, variables=None, trace=False, heuristic="vsids", phase=True):
+    """Generator, ki po vrsti vrača vse prireditve vrednosti spremenljivkam,
+    pri katerih je izraz resničen.
     
-    Argumenta:
-    f     -- logični izraz
-    trace -- ali naj se izpisuje sled dokazovanja, privzeto False
+    Po vsaki najdeni prireditvi se v reševalnik doda stavek, ki jo
+    prepove, iskanje pa se nadaljuje z ohranjenimi naučenimi stavki.
+    Prireditve se vračajo sproti, tako da se ne hranijo vse hkrati. Če so
+    podane spremenljivke, se prireditve projicirajo nanje: vsaka prireditev
+    podanim spremenljivkam se vrne natanko enkrat, ostale spremenljivke pa
+    se ne vrnejo.
+    
+    Argumenti:
+    f         -- logični izraz ali zbirka stavkov
+    variables -- seznam imen spremenljivk, na katere se projicira, privzeto
+                 None (vse spremenljivke izraza)
+    trace     -- ali naj se izpisuje sled dokazovanja, privzeto False
+    heuristic -- ime hevristike za izbiro odločitev, privzeto "vsids"
+    phase     -- ali naj se shranjujejo zadnje vrednosti spremenljivk,
+                 privzeto True
     """
-    f = prop.cnf(f)
-    if isinstance(f, prop.And):
-        l = f.l
+    db = f.copy() if isinstance(f, ClauseDB) else ClauseDB(prop.cnf(f))
+    if variables == None:
+        proj = list(range(1, db.numVars() + 1))
     else:
-        l = [f]
-    return dpllStep(l, trace)
+        proj = [db.variable(p) for p in variables]
+    s = Solver(db, heuristic, phase)
+    while s.solve(trace):
+        yield {db.names[x]: s.val[x] > 0 for x in proj}
+        s.addClause([-x if s.val[x] > 0 else x for x in proj])
+
+def luby(i):
+    """Vrne i-ti člen Lubyjevega zaporedja 1, 1, 2, 1, 1, 2, 4, ...
+    
+    Argument:
+    i -- indeks člena, šteto od 1 naprej
+    """
+    while True:
+        k = 1
+        while (1 << k) - 1 < i:
+            k += 1
+        if (1 << k) - 1 == i:
+            return 1 << (k - 1)
+        i -= (1 << (k - 1)) - 1
+
+def pureLiterals(db):
+    """Vrne seznam čistih literalov zbirke stavkov, torej literalov, katerih
+    negacija se ne pojavi v nobenem stavku.
+    
+    Argument:
+    db -- zbirka stavkov
+    """
+    pure = {}
+    for x in db.lits:
+        pure[abs(x)] = None if (abs(x) in pure and pure[abs(x)] != x) else x
+    return [x for x in pure.values() if x != None]
+
+def simplify(db, passes, trace=False, stats=None):
+    """Predprocesiranje zbirke stavkov za funkciji dpll in cdcl.
+    
+    Vrne objekt razreda preprocessing.Preprocessor ali False, če je zbirka
+    v protislovju. V statistiko se zapišeta čas faze "preprocess" in
+    števec "removed" (število odstranjenih stavkov).
+    
+    Argumenti:
+    db     -- zbirka stavkov
+    passes -- True za privzete prehode ali seznam imen prehodov
+    trace  -- ali naj se izpisuje sled dokazovanja, privzeto False
+    stats  -- statistika ali None, privzeto None
+    """
+    with counters.phase(stats, "preprocess"):
+        p = preprocessing.Preprocessor(db)
+        r = p.run(None if passes == True else passes, trace)
+    if stats != None:
+        stats.add("removed", sum([x[1] for x in p.stats]))
+    if not r:
+        if trace:
+            print("Preprocessing found a contradiction")
+        return False
+    return p
+
+def dpll(f, trace=False, heuristic="order", phase=False, preprocess=False, stats=None):
+    """Glavni program metode DPLL.
+    
+    Izraz se enkrat pretvori v zbirko stavkov, nad katero nato teče iskanje.
+    Čisti literali se nastavijo le na začetku, saj jih opazovani literali
+    med iskanjem ne zaznajo. Če so vsi stavki Hornovi ali imajo največ dva
+    literala, se problem reši s funkcijo horn.horn oziroma twosat.twosat.
+    Če je podan argument preprocess, se stavki pred iskanjem poenostavijo s
+    prehodi iz modula preprocessing.
+    
+    Vrne prireditev vrednosti spremenljivkam v obliki slovarja ali False,
+    če izraz ni izpolnljiv. Če je podan argument stats, vrne par (rezultat,
+    statistika); statistika vsebuje števce "decisions", "propagations" in
+    "conflicts" ter čase faz "parse", "preprocess" in "search".
+    
+    Argumenti:
+    f          -- logični izraz ali zbirka stavkov
+    trace      -- ali naj se izpisuje sled dokazovanja, privzeto False
+    heuristic  -- ime hevristike za izbiro odločitev ("order", "vsids", "jw"
+                  ali "moms"), privzeto "order"; "jw" in "moms" sta le za
+                  primerjave (glej razreda JeroslowWang in MOMS)
+    phase      -- ali naj se shranjujejo zadnje vrednosti spremenljivk,
+                  privzeto False
+    preprocess -- ali naj se izvede predprocesiranje (True za privzete
+                  prehode ali seznam imen prehodov), privzeto False
+    stats      -- True za novo statistiko ali objekt razreda counters.Stats,
+                  v katerega se prištejejo števci, privzeto None (brez
+                  statistike)
+    """
+    st = counters.create(stats)
+    r = dpllSearch(f, trace, heuristic, phase, preprocess, st)
+    return r if st == None else (r, st)
+
+def dpllSearch(f, trace=False, heuristic="order", phase=False, preprocess=False, stats=None):
+    """Iskanje po metodi DPLL za funkcijo dpll.
+    
+    Vrne prireditev vrednosti spremenljivkam v obliki slovarja ali False,
+    če izraz ni izpolnljiv.
+    
+    Argumenti:
+    f          -- logični izraz ali zbirka stavkov
+    trace      -- ali naj se izpisuje sled dokazovanja, privzeto False
+    heuristic  -- ime hevristike za izbiro odločitev, privzeto "order"
+    phase      -- ali naj se shranjujejo zadnje vrednosti spremenljivk,
+                  privzeto False
+    preprocess -- ali naj se izvede predprocesiranje, privzeto False
+    stats      -- statistika ali None, privzeto None
+    """
+    with counters.phase(stats, "parse"):
+        db = f.copy() if isinstance(f, ClauseDB) else ClauseDB(prop.cnf(f))
+    if preprocess:
+        p = simplify(db, preprocess, trace, stats)
+        if p == False:
+            return False
+        r = dpllSearch(p.db(), trace, heuristic, phase, False, stats)
+        return r if r == False else p.reconstruct(r)
+    if horn.isHorn(db):
+        if trace:
+            print("Horn clauses found")
+        return horn.horn(db, trace)
+    if twosat.isTwoSat(db):
+        if trace:
+            print("2-SAT clauses found")
+        return twosat.twosat(db, trace)
+    s = Propagator(db, heuristic, phase)
+    s.stats = stats
+    if s.conflict:
+        if trace:
+            print("Empty disjunction found")
+        return False
+    purs = [x for x in pureLiterals(db) if s.value(x) == 0]
+    for x in purs:
+        s.assign(x)
+    if trace > 1:
+        print("Found %d pures: %s" % (len(purs), [db.names[abs(x)] for x in purs]))
+    with counters.phase(stats, "search"):
+        r = dpllStep(s, trace)
+    if stats != None:
+        stats.collect(s, ["decisions", "propagations", "conflicts"])
+    return db.model(s.val) if r else False
+
+def cdcl(f, trace=False, heuristic="vsids", phase=True, preprocess=False, stats=None):
+    """Glavni program metode CDCL.
+    
+    Vrne prireditev vrednosti spremenljivkam v obliki slovarja ali False,
+    če izraz ni izpolnljiv. Podana zbirka stavkov se ne spremeni. Če so vsi
+    stavki Hornovi ali imajo največ dva literala, se problem reši s
+    funkcijo horn.horn oziroma twosat.twosat. Če je podan argument
+    preprocess, se stavki pred iskanjem poenostavijo s prehodi iz modula
+    preprocessing. Če je podan argument stats, vrne par (rezultat,
+    statistika); statistika poleg števcev funkcije dpll vsebuje še števec
+    "restarts".
+    
+    Argumenti:
+    f          -- logični izraz ali zbirka stavkov
+    trace      -- ali naj se izpisuje sled dokazovanja, privzeto False
+    heuristic  -- ime hevristike za izbiro odločitev ("order", "vsids", "jw"
+                  ali "moms"), privzeto "vsids"; "jw" in "moms" sta le za
+                  primerjave (glej razreda JeroslowWang in MOMS)
+    phase      -- ali naj se shranjujejo zadnje vrednosti spremenljivk,
+                  privzeto True
+    preprocess -- ali naj se izvede predprocesiranje (True za privzete
+                  prehode ali seznam imen prehodov), privzeto False
+    stats      -- True za novo statistiko ali objekt razreda counters.Stats,
+                  v katerega se prištejejo števci, privzeto None (brez
+                  statistike)
+    """
+    st = counters.create(stats)
+    r = cdclSearch(f, trace, heuristic, phase, preprocess, st)
+    return r if st == None else (r, st)
+
+def cdclSearch(f, trace=False, heuristic="vsids", phase=True, preprocess=False, stats=None):
+    """Iskanje po metodi CDCL za funkcijo cdcl.
+    
+    Vrne prireditev vrednosti spremenljivkam v obliki slovarja ali False,
+    če izraz ni izpolnljiv.
+    
+    Argumenti:
+    f          -- logični izraz ali zbirka stavkov
+    trace      -- ali naj se izpisuje sled dokazovanja, privzeto False
+    heuristic  -- ime hevristike za izbiro odločitev, privzeto "vsids"
+    phase      -- ali naj se shranjujejo zadnje vrednosti spremenljivk,
+                  privzeto True
+    preprocess -- ali naj se izvede predprocesiranje, privzeto False
+    stats      -- statistika ali None, privzeto None
+    """
+    with counters.phase(stats, "parse"):
+        db = f.copy() if isinstance(f, ClauseDB) else ClauseDB(prop.cnf(f))
+    if preprocess:
+        p = simplify(db, preprocess, trace, stats)
+        if p == False:
+            return False
+        r = cdclSearch(p.db(), trace, heuristic, phase, False, stats)
+        return r if r == False else p.reconstruct(r)
+    if horn.isHorn(db):
+        if trace:
+            print("Horn clauses found")
+        return horn.horn(db, trace)
+    if twosat.isTwoSat(db):
+        if trace:
+            print("2-SAT clauses found")
+        return twosat.twosat(db, trace)
+    s = Solver(db, heuristic, phase)
+    s.stats = stats
+    with counters.phase(stats, "search"):
+        r = s.solve(trace)
+    if stats != None:
+        stats.collect(s, ["decisions", "propagations", "conflicts", "restarts"])
+    return db.model(s.val) if r else False
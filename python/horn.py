@@ -0,0 +1,86 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+from array import array
+import dpll
+import prop
+
+def isHorn(db):
+    """Pove, ali so vsi stavki v zbirki Hornovi, torej ali ima vsak stavek
+    največ en pozitiven literal.
+    
+    Argument:
+    db -- zbirka stavkov
+    """
+    lits = db.lits
+    start = db.start
+    for i in range(len(db)):
+        pos = 0
+        for j in range(start[i], start[i+1]):
+            if lits[j] > 0:
+                pos += 1
+                if pos > 1:
+                    return False
+    return True
+
+def horn(f, trace=False):
+    """Reši problem izpolnljivosti za Hornove stavke v linearnem času
+    (algoritem Dowlinga in Gallierja).
+    
+    Za vsak stavek se hrani število negativnih literalov, katerih
+    spremenljivke še niso resnične. Spremenljivke, ki morajo biti resnične,
+    se obdelujejo iz vrste; ob vsaki se zmanjšajo števci stavkov, v katerih
+    se pojavi negirana. Ko števec pade na 0, mora biti resnična glava
+    stavka (pozitivni literal); če je stavek nima, izraz ni izpolnljiv.
+    Vsak literal se tako obdela največ enkrat.
+    
+    Vrne najmanjšo prireditev vrednosti vsem spremenljivkam v obliki
+    slovarja ali False, če izraz ni izpolnljiv.
+    
+    Argumenta:
+    f     -- logični izraz v konjunktivni normalni obliki s Hornovimi
+             stavki ali zbirka takih stavkov
+    trace -- ali naj se izpisuje sled dokazovanja, privzeto False
+    """
+    db = f if isinstance(f, dpll.ClauseDB) else dpll.ClauseDB(prop.cnf(f))
+    lits = db.lits
+    start = db.start
+    n = db.numVars()
+    count = array('i', [0]) * len(db)
+    head = array('i', [0]) * len(db)
+    occurs = [[] for i in range(n + 1)]
+    val = array('b', [-1]) * (n + 1)
+    queue = []
+    for i in range(len(db)):
+        for j in range(start[i], start[i+1]):
+            x = lits[j]
+            if x > 0:
+                if head[i] != 0:
+                    raise Exception('Not a Horn clause!')
+                head[i] = x
+            else:
+                count[i] += 1
+                occurs[-x].append(i)
+        if count[i] == 0:
+            if head[i] == 0:
+                if trace:
+                    print("Empty disjunction found")
+                return False
+            queue.append(head[i])
+    while len(queue) > 0:
+        x = queue.pop()
+        if val[x] > 0:
+            continue
+        val[x] = 1
+        if trace > 1:
+            print("Setting %s:T" % db.names[x])
+        for i in occurs[x]:
+            count[i] -= 1
+            if count[i] == 0:
+                if head[i] == 0:
+                    if trace:
+                        print("Contradiction in clause %s" % ['~' + db.names[-y] for y in db.clause(i)])
+                    return False
+                if val[head[i]] < 0:
+                    queue.append(head[i])
+    return db.model(val)
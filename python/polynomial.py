@@ -1,7 +1,22 @@
 #!/usr/bin/python
 # -*- coding: utf-8 -*-
 
-def sat(f, d=None, root=False, trace=False):
+import multiprocessing
+import counters
+import prop
+
+# Kode vrednosti v tabelah stanja grafa
+VALUES = (None, False, True)
+
+def code(b):
+    """Vrne kodo logične vrednosti b za tabele stanja grafa.
+    
+    Argument:
+    b -- logična vrednost ali None
+    """
+    return 0 if b == None else (2 if b else 1)
+
+def sat(f, d=None, root=False, trace=False, stats=None):
     """Poskusi določiti izpolnljivost logične formule f s pomočjo linearnega
     algoritma.
     
@@ -10,24 +25,51 @@ def sat(f, d=None, root=False, trace=False):
     jo vrne v obliki slovarja.
     Če ne ugotovi, ali je formula izpolnljiva, vrne None.
     
+    Če je podan argument stats, vrne par (rezultat, statistika); statistika
+    vsebuje števec "valuations" (število valuiranih variant vozlišč) ter
+    čase faz "build" in "valuate".
+    
+    Argumenti:
+    f     -- logični izraz
+    d     -- slovar podizrazov (graf), privzeto None (naredi nov graf); če
+             je podan navaden slovar, se vanj na koncu prepišejo vozlišča
+    root  -- ali naj se vrne koren grafa v primeru neodločenosti
+    trace -- ali naj se izpisuje sled dokazovanja, privzeto False
+    stats -- True za novo statistiko ali objekt razreda counters.Stats, v
+             katerega se prištejejo števci, privzeto None (brez statistike)
+    """
+    st = counters.create(stats)
+    g = d if isinstance(d, DAG) else DAG()
+    r = satSearch(f, g, root, trace, st)
+    if type(d) == dict:
+        d.update(g)
+    return r if st == None else (r, st)
+
+def satSearch(f, d, root=False, trace=False, stats=None):
+    """Linearni algoritem za funkcijo sat.
+    
     Argumenti:
     f     -- logični izraz
-    d     -- slovar podizrazov, privzeto None (naredi nov slovar)
+    d     -- graf
     root  -- ali naj se vrne koren grafa v primeru neodločenosti
     trace -- ali naj se izpisuje sled dokazovanja, privzeto False
+    stats -- statistika ali None, privzeto None
     """
-    if not type(d) == dict:
-        d = {}
-    n = f.simplify().ncf().node(d)
-    if not n.valuate(True, (None, 0), None, trace):
+    d.stats = stats
+    with counters.phase(stats, "build"):
+        n = f.simplify().ncf().node(d)
+    with counters.phase(stats, "valuate"):
+        r = d.dispatch(n.valuate, True, (None, 0), None, trace)
+    d.collect()
+    if not r:
         return False
-    out = getValues(d, n)
+    out = prop.getValues(d, n)
     if not root and type(out) != dict:
         return None
     else:
         return out
-        
-def sat3(f, d=None, root=False, trace=False):
+
+def sat3(f, d=None, root=False, trace=False, processes=1, stats=None):
     """Poskusi določiti izpolnljivost logične formule f s pomočjo kubičnega
     algoritma.
     
@@ -36,63 +78,473 @@ def sat3(f, d=None, root=False, trace=False):
     jo vrne v obliki slovarja.
     Če ne ugotovi, ali je formula izpolnljiva, vrne None.
     
+    Če je procesov več, se preizkusi variant porazdelijo med procese (glej
+    funkcijo probeParallel); rezultat je enak kot pri zaporednem
+    preizkušanju.
+    
+    Če je podan argument stats, vrne par (rezultat, statistika); statistika
+    poleg števcev in časov funkcije sat vsebuje še števec "probes" in čas
+    faze "probe".
+    
     Argumenti:
-    f     -- logični izraz
-    d     -- slovar podizrazov, privzeto None (naredi nov slovar)
-    root  -- ali naj se vrne koren grafa v primeru neodločenosti
-    trace -- ali naj se izpisuje sled dokazovanja, privzeto False
+    f         -- logični izraz
+    d         -- slovar podizrazov (graf), privzeto None (naredi nov graf);
+                 če je podan navaden slovar, se vanj prepišejo vozlišča
+    root      -- ali naj se vrne koren grafa v primeru neodločenosti
+    trace     -- ali naj se izpisuje sled dokazovanja, privzeto False
+    processes -- število procesov za preizkušanje, privzeto 1 (zaporedno
+                 preizkušanje); None pomeni toliko procesov, kolikor je
+                 procesorjev
+    stats     -- True za novo statistiko ali objekt razreda counters.Stats,
+                 v katerega se prištejejo števci, privzeto None (brez
+                 statistike)
     """
-    if not type(d) == dict:
-        d = {}
-    rt = sat(f, d, True, trace)
+    st = counters.create(stats)
+    g = d if isinstance(d, DAG) else DAG()
+    r = sat3Search(f, g, root, trace, processes, st)
+    if type(d) == dict:
+        d.update(g)
+    return r if st == None else (r, st)
+
+def sat3Search(f, d, root=False, trace=False, processes=1, stats=None):
+    """Kubični algoritem za funkcijo sat3.
+    
+    Argumenti:
+    f         -- logični izraz
+    d         -- graf
+    root      -- ali naj se vrne koren grafa v primeru neodločenosti
+    trace     -- ali naj se izpisuje sled dokazovanja, privzeto False
+    processes -- število procesov za preizkušanje, privzeto 1
+    stats     -- statistika ali None, privzeto None
+    """
+    rt = satSearch(f, d, True, trace, stats)
     if rt == False or type(rt) == dict:
         return rt
-    
-    next = sum([[(n, k) for k in range(n.numVariants()) if n.v[k] == None] for n in d.values()], [])
-    lt = len(next)
-    ln = lt+1
-    while lt < ln:
-        todo = next
-        next = []
-        for n, k in todo:
-            if n.v[k] != None:
-                continue
-            if trace > 1:
-                print("Trying to assign temporary values to %d:%s" % (k, n))
-            if n.valuate(True, (None, k), (True, k), trace):
-                s = getValues(d, rt, True)
-                if type(s) == dict:
-                    return s
-                if n.valuate(False, (None, k), (False, k), trace):
-                    s = getValues(d, rt, False)
-                    if type(s) == dict:
-                        return s
-                    for nn in d.values():
-                        nn.clearTemp()
-                else:
-                    for nn in d.values():
-                        for i in range(nn.numVariants()):
-                            if nn.vt[i] != None:
-                                nn.setValue(nn.vt[i], nn.ct[i], (None, i))
-                        nn.clearTemp()
-            else:
-                for nn in d.values():
-                    nn.clearTemp()
-                if n.valuate(False, (None, k), (None, k), trace):
-                    s = getValues(d, rt)
-                    if type(s) == dict:
-                        return s
+        
+    pool = None
+    if processes != 1:
+        if processes == None:
+            processes = multiprocessing.cpu_count()
+        pool = multiprocessing.Pool(processes, probeInit, (f, len(d.nodes), trace))
+        history = []
+    try:
+        with counters.phase(stats, "probe"):
+            next = [(n, k) for n in d.nodes for k in range(n.numVariants()) if n.getValue((None, k)) == None]
+            lt = len(next)
+            ln = lt+1
+            while lt < ln:
+                todo = next
+                next = []
+                if pool == None:
+                    s = probeSequential(d, rt, todo, next, trace)
                 else:
-                    return False
-            if n.v[k] != None:
-                next.append((n, k))
-        ln = lt
-        lt = len(next)
+                    s = probeParallel(pool, processes, d, rt, todo, next, history, trace)
+                if s == False or type(s) == dict:
+                    return s
+                ln = lt
+                lt = len(next)
+    finally:
+        d.collect()
+        if pool != None:
+            pool.terminate()
+    s = prop.getValues(d, rt)
+    if type(s) == dict:
+        return s
     if root:
         return rt
     else:
-        False
+        return None
+
+def probe(d, rt, n, k, trace=False):
+    """Preizkusi varianto k vozlišča n pod obema predpostavkama.
+    
+    Če varianta pod eno od predpostavk ne uspe, se ji nastavi nasprotna
+    trajna vrednost. Če varianta ne uspe pod nobeno predpostavko, vrne
+    False. Če najde prireditev vrednosti spremenljivkam, da je formula
+    izpolnljiva, jo vrne v obliki slovarja. Sicer vrne None.
+    
+    Argumenti:
+    d     -- graf
+    rt    -- koren grafa
+    n     -- vozlišče
+    k     -- varianta vozlišča
+    trace -- ali naj se izpisuje sled dokazovanja, privzeto False
+    """
+    if trace > 1:
+        print("Trying to assign temporary values to %d:%s" % (k, n))
+    d.probes += 1
+    if d.stats != None:
+        d.stats.emit("probe", n, k)
+    if d.dispatch(n.valuate, True, (None, k), (True, k), trace):
+        s = prop.getValues(d, rt, True)
+        if type(s) == dict:
+            return s
+        if d.dispatch(n.valuate, False, (None, k), (False, k), trace):
+            s = prop.getValues(d, rt, False)
+            if type(s) == dict:
+                return s
+            d.clearTemp()
+        else:
+            d.promote()
+            d.clearTemp()
+    else:
+        d.clearTemp()
+        if d.dispatch(n.valuate, False, (None, k), (None, k), trace):
+            s = prop.getValues(d, rt)
+            if type(s) == dict:
+                return s
+        else:
+            return False
+    return None
+
+def probeSequential(d, rt, todo, next, trace=False):
+    """Zaporedno preizkusi variante iz seznama todo.
+    
+    Variante, ki tudi po preizkusu nimajo trajne vrednosti, doda v seznam
+    next. Vrne False, če formula ni izpolnljiva, slovar z izpolnjujočo
+    prireditvijo, če jo najde, in None sicer.
+    
+    Argumenti:
+    d     -- graf
+    rt    -- koren grafa
+    todo  -- seznam parov (vozlišče, varianta)
+    next  -- seznam, v katerega se dodajajo variante brez trajne vrednosti
+    trace -- ali naj se izpisuje sled dokazovanja, privzeto False
+    """
+    for n, k in todo:
+        if n.getValue((None, k)) != None:
+            continue
+        s = probe(d, rt, n, k, trace)
+        if s == False or type(s) == dict:
+            return s
+        if n.getValue((None, k)) == None:
+            next.append((n, k))
+    return None
+
+def probeForced(d, rt, n, k, trace=False):
+    """Preizkusi varianto k vozlišča n pod obema predpostavkama, ne da bi
+    spremenil trajne vrednosti.
+    
+    Vrne par (s, b), kjer je s enak False, če varianta ne uspe pod nobeno
+    predpostavko, slovarju z izpolnjujočo prireditvijo, če jo najde, in
+    None sicer, b pa vrednost, ki jo mora imeti varianta, ker pod nasprotno
+    predpostavko ne uspe, ali None.
+    
+    Argumenti:
+    d     -- graf
+    rt    -- koren grafa
+    n     -- vozlišče
+    k     -- varianta vozlišča
+    trace -- ali naj se izpisuje sled dokazovanja, privzeto False
+    """
+    if trace > 1:
+        print("Trying to assign temporary values to %d:%s" % (k, n))
+    d.probes += 1
+    out = (None, None)
+    if d.dispatch(n.valuate, True, (None, k), (True, k), trace):
+        s = prop.getValues(d, rt, True)
+        if type(s) == dict:
+            out = (s, None)
+        elif d.dispatch(n.valuate, False, (None, k), (False, k), trace):
+            s = prop.getValues(d, rt, False)
+            if type(s) == dict:
+                out = (s, None)
+        else:
+            out = (None, True)
+    else:
+        d.clearTemp()
+        if d.dispatch(n.valuate, False, (None, k), (False, k), trace):
+            s = prop.getValues(d, rt, False)
+            out = (s, None) if type(s) == dict else (None, False)
+        else:
+            out = (False, None)
+    d.clearTemp()
+    return out
+
+def force(d, n, k, b, trace=False):
+    """Varianti k vozlišča n nastavi trajno vrednost b.
+    
+    Vrne True, če to uspe, in False sicer.
+    
+    Argumenti:
+    d     -- graf
+    n     -- vozlišče
+    k     -- varianta vozlišča
+    b     -- vrednost variante
+    trace -- ali naj se izpisuje sled dokazovanja, privzeto False
+    """
+    return n.getValue((None, k)) == b or d.dispatch(n.valuate, b, (None, k), (None, k), trace)
+
+def probeParallel(pool, processes, d, rt, todo, next, history, trace=False):
+    """Preizkusi variante iz seznama todo v skupini procesov.
+    
+    Vse variante se preizkusijo glede na trenutne trajne vrednosti.
+    Procesi ne vračajo stanja grafa, ampak le vrednosti, ki jih morajo
+    imeti posamezne variante; te se nastavijo v vrstnem redu seznama in
+    zabeležijo v zgodovino, po kateri procesi pred naslednjim preizkusom
+    uskladijo svoje grafe. Variante, ki tudi po tem nimajo trajne
+    vrednosti, doda v seznam next; funkcija sat3 preizkušanje ponavlja,
+    dokler se njihovo število zmanjšuje. Trajne vrednosti ob koncu so zato
+    enake kot pri zaporednem preizkušanju, izpolnjujoča prireditev pa se
+    lahko razlikuje.
+    
+    Vrne False, če formula ni izpolnljiva, slovar z izpolnjujočo
+    prireditvijo, če jo najde, in None sicer.
+    
+    Argumenti:
+    pool      -- skupina procesov, inicializiranih s funkcijo probeInit
+    processes -- število procesov v skupini
+    d         -- graf
+    rt        -- koren grafa
+    todo      -- seznam parov (vozlišče, varianta)
+    next      -- seznam, v katerega se dodajajo variante brez trajne
+                 vrednosti
+    history   -- seznam trojic (odmik vozlišča, varianta, vrednost) z
+                 zgodovino nastavljenih vrednosti
+    trace     -- ali naj se izpisuje sled dokazovanja, privzeto False
+    """
+    chunk = max(1, len(todo) // (4*processes))
+    h = tuple(history)
+    tasks = [(h, [(n.i, k) for n, k in todo[i:i+chunk]]) for i in range(0, len(todo), chunk)]
+    nodes = dict((n.i, n) for n, k in todo)
+    for j, s, forced in pool.imap(probeTask, tasks):
+        d.probes += j
+        if s == False or type(s) == dict:
+            return s
+        for i, k, b in forced:
+            n = nodes[i]
+            if n.getValue((None, k)) != b:
+                if not force(d, n, k, b, trace):
+                    return False
+                history.append((i, k, b))
+    next.extend([(n, k) for n, k in todo if n.getValue((None, k)) == None])
+    return None
+
+# Stanje procesa za vzporedno preizkušanje
+worker = None
+
+def probeInit(f, count, trace=False):
+    """Inicializira proces za vzporedno preizkušanje.
+    
+    Zgradi graf za formulo f na enak način kot funkcija sat3.
+    
+    Argumenti:
+    f     -- logični izraz
+    count -- pričakovano število vozlišč grafa
+    trace -- ali naj se izpisuje sled dokazovanja, privzeto False
+    """
+    global worker
+    d = DAG()
+    rt = sat(f, d, True)
+    if len(d.nodes) != count:
+        raise Exception('Inconsistent graph in worker process!')
+    worker = (d, rt, dict((n.i, n) for n in d.nodes), [], trace)
+
+def probeTask(task):
+    """Preizkusi del seznama variant v procesu za vzporedno preizkušanje.
+    
+    Graf procesa najprej uskladi z zgodovino nastavljenih vrednosti. Vrne
+    trojico (j, s, forced), kjer je j število preizkusov, s False ali
+    slovar z izpolnjujočo prireditvijo, če ga kateri od preizkusov vrne, in
+    None sicer, forced pa seznam trojic (odmik vozlišča, varianta,
+    vrednost) za variante, ki morajo imeti določeno vrednost.
+    
+    Argument:
+    task -- par (zgodovina nastavljenih vrednosti kot seznam trojic
+            (odmik vozlišča, varianta, vrednost), seznam parov (odmik
+            vozlišča, varianta))
+    """
+    d, rt, nodes, done, trace = worker
+    history, todo = task
+    for i, k, b in history[len(done):]:
+        if not force(d, nodes[i], k, b, trace):
+            raise Exception('Inconsistent graph in worker process!')
+        done.append((i, k, b))
+    forced = []
+    for j, (i, k) in enumerate(todo):
+        s, b = probeForced(d, rt, nodes[i], k, trace)
+        if s == False or type(s) == dict:
+            return (j + 1, s, forced)
+        if b != None:
+            forced.append((i, k, b))
+    return (len(todo), None, forced)
 
+class DAG(dict):
+
+    """Slovar podizrazov, ki hrani tudi stanje vozlišč grafa.
+    
+    Ključi slovarja so logični izrazi, vrednosti pa pripadajoča vozlišča.
+    Vsaka varianta vsakega vozlišča ima svoje mesto v stisnjenih tabelah
+    stanja; vozlišče hrani le odmik svoje prve variante. Vrednosti so
+    shranjene s kodami 0 (ni vrednosti), 1 (False) in 2 (True). Mesta, na
+    katera so bile zapisane začasne vrednosti ali zagotovila, se beležijo v
+    dnevnik, tako da brisanje in uveljavljanje začasnih oznak obiščeta le
+    spremenjena mesta.
+    
+    Valuacije in posodobitve vozlišč se ne kličejo rekurzivno, ampak se kot
+    dogodki dodajo v delovni seznam, ki ga prazni metoda dispatch. Dogodki,
+    ki jih sproži obdelava enega dogodka, se v seznam dodajo skupaj. Pri
+    vrstnem redu LIFO se obdelajo v enakem vrstnem redu kot pri rekurzivnih
+    klicih, zato so rezultati enaki kot pri rekurziji. Če vrstni red ni
+    podan, se dogodki obdelajo takoj z rekurzivnimi klici.
+    
+    Metode:
+    __init__  -- konstruktor
+    alloc     -- rezervira mesta za variante vozlišča
+    dispatch  -- obdela dogodek in vse dogodke, ki jih ta sproži
+    collect   -- prenese števce v statistiko
+    touch     -- zabeleži mesto začasnega zapisa v dnevnik
+    clearTemp -- pobriše začasne oznake, zabeležene v dnevniku
+    promote   -- začasne vrednosti ob veljavnosti začetnega vozlišča,
+                 zabeležene v dnevniku, nastavi kot trajne
+                 
+    Spremenljivke:
+    nodes -- seznam vozlišč v vrstnem redu nastajanja
+    log   -- dnevnik mest z začasnimi zapisi
+    order -- vrstni red obdelave dogodkov ("lifo" ali None)
+    queue -- delovni seznam dogodkov
+    new   -- dogodki, ki jih je sprožila obdelava trenutnega dogodka
+    busy  -- ali se delovni seznam trenutno obdeluje
+    valuations -- število valuiranih variant vozlišč
+    probes     -- število preizkusov variant
+    stats      -- statistika (objekt razreda counters.Stats), ki dobiva
+                  dogodek "probe", ali None
+    v     -- trenutno znane vrednosti variant
+    vt    -- začasne vrednosti ob predpostavki o veljavnosti začetnega
+             vozlišča
+    vf    -- začasne vrednosti ob predpostavki o neveljavnosti začetnega
+             vozlišča
+    c     -- vozlišča, od katerih so prišle vrednosti
+    ct    -- vozlišča, od katerih so prišle začasne vrednosti ob
+             predpostavki o veljavnosti začetnega vozlišča
+    cf    -- vozlišča, od katerih so prišle začasne vrednosti ob
+             predpostavki o neveljavnosti začetnega vozlišča
+    s     -- ali vrednosti otrok zagotavljajo trenutno znane vrednosti
+    st    -- ali vrednosti otrok zagotavljajo začasne vrednosti ob
+             predpostavki o veljavnosti začetnega vozlišča
+    sf    -- ali vrednosti otrok zagotavljajo začasne vrednosti ob
+             predpostavki o neveljavnosti začetnega vozlišča
+    """
+    
+    def __init__(self, order="lifo"):
+        """Konstruktor. Nastavi vrstni red obdelave dogodkov.
+        
+        Argument:
+        order -- vrstni red obdelave dogodkov: "lifo" ali None (rekurzivni
+                 klici), privzeto "lifo"
+        """
+        if order not in ["lifo", None]:
+            raise Exception('Unknown propagation order!')
+        dict.__init__(self)
+        self.nodes = []
+        self.log = []
+        self.order = order
+        self.queue = []
+        self.new = []
+        self.busy = False
+        self.valuations = 0
+        self.probes = 0
+        self.stats = None
+        self.v = bytearray()
+        self.vt = bytearray()
+        self.vf = bytearray()
+        self.c = []
+        self.ct = []
+        self.cf = []
+        self.s = bytearray()
+        self.st = bytearray()
+        self.sf = bytearray()
+        
+    def alloc(self, n, k):
+        """Doda vozlišče n in rezervira mesta za njegovih k variant.
+        
+        Vrne odmik prve variante.
+        
+        Argumenta:
+        n -- vozlišče
+        k -- število variant
+        """
+        i = len(self.v)
+        self.nodes.append(n)
+        for t in [self.v, self.vt, self.vf, self.s, self.st, self.sf]:
+            t.extend(bytearray(k))
+        for t in [self.c, self.ct, self.cf]:
+            t.extend([None]*k)
+        return i
+        
+    def dispatch(self, m, *args):
+        """Obdela valuacijo ali posodobitev vozlišča.
+        
+        Če se delovni seznam že obdeluje, doda dogodek v seznam in vrne
+        True; morebitno neuspešnost bo zaznala zanka, ki obdeluje seznam.
+        Sicer obdeluje seznam, dokler se ne izprazni ali dokler kakšen
+        dogodek ne spodleti. Vrne True, če so vsi dogodki uspeli, in False
+        sicer.
+        
+        Argumenta:
+        m    -- metoda vozlišča (valuate, update ali parents)
+        args -- argumenti metode
+        """
+        if self.order == None:
+            return m(*args)
+        self.new.append((m, args))
+        if self.busy:
+            return True
+        self.busy = True
+        queue = self.queue
+        try:
+            while True:
+                self.new.reverse()
+                queue.extend(self.new)
+                del self.new[:]
+                if len(queue) == 0:
+                    return True
+                m, args = queue.pop()
+                if not m(*args):
+                    del queue[:]
+                    del self.new[:]
+                    return False
+        finally:
+            self.busy = False
+            
+    def collect(self):
+        """Prišteje števca valuacij in preizkusov v statistiko, če je ta
+        podana, in ju ponastavi."""
+        if self.stats != None:
+            self.stats.collect(self, ["valuations", "probes"])
+        self.valuations = 0
+        self.probes = 0
+        
+    def touch(self, i):
+        """Zabeleži začasni zapis na mesto i.
+        
+        Argument:
+        i -- mesto v tabelah stanja
+        """
+        self.log.append(i)
+        
+    def clearTemp(self):
+        """Pobriše začasne oznake zabeleženih variant brez trajne vrednosti
+        in izprazni dnevnik."""
+        v = self.v
+        for i in self.log:
+            if v[i] == 0:
+                self.vt[i] = 0
+                self.vf[i] = 0
+                self.ct[i] = None
+                self.cf[i] = None
+                self.st[i] = 0
+                self.sf[i] = 0
+        self.log = []
+        
+    def promote(self):
+        """Zabeležene začasne vrednosti ob predpostavki o veljavnosti
+        začetnega vozlišča nastavi kot trajne."""
+        for i in self.log:
+            if self.vt[i] != 0:
+                self.v[i] = self.vt[i]
+                self.vf[i] = self.vt[i]
+                self.c[i] = self.ct[i]
 
 def abbrev(p, s=None):
     """Vrne okrajšano obliko opisa stanja valuacije.
@@ -111,9 +563,9 @@ def abbrev(p, s=None):
         return 'F' if s else 'f'
     else:
         return 'N' if s else 'n'
-    
-class DAGNode:
-    
+
+class DAGNode(object):
+
     """Abstraktni razred vozlišča v usmerjenem acikličnem grafu (DAG).
     
     Metode:
@@ -131,42 +583,32 @@ class DAGNode:
     update      -- posodobitev po spremembi stanja enega od otrok
     
     Spremenljivke:
-    a  -- seznam prednikov
-    v  -- trenutno znane vrednosti izraza
-    vt -- začasne vrednosti ob predpostavki o veljavnosti začetnega vozlišča
-    vf -- začasne vrednosti ob predpostavki o neveljavnosti začetnega vozlišča
-    c  -- vozlišča, od katerega so prišle vrednosti izraza
-    ct -- vozlišča, od katerega so prišle vrednosti izraza ob predpostavki o
-          veljavnosti začetnega vozlišča
-    cf -- vozlišča, od katerega so prišle vrednosti izraza ob predpostavki o
-          neveljavnosti začetnega vozlišča
-    s  -- ali vrednosti otrok zagotavljajo trenutno znane vrednosti
-    st -- ali vrednosti otrok zagotavljajo trenutno znane začasne vrednosti
-          ob predpostavki o veljavnosti začetnega vozlišča
-    sf -- ali vrednosti otrok zagotavljajo trenutno znane začasne vrednosti
-          ob predpostavki o neveljavnosti začetnega vozlišča
+    d -- graf, ki hrani stanje vozlišča
+    i -- odmik prve variante vozlišča v tabelah stanja grafa
+    a -- seznam prednikov
     """
     
+    __slots__ = ('d', 'i', 'a')
+    
     def __init__(self):
         """Konstruktor. Na abstraktnem razredu ga ne smemo klicati."""
         raise Exception('Instantiating an abstract class.')
         
     def __repr__(self):
         """Znakovna predstavitev."""
-        return '%s(%s,%s)' % tuple([abbrev(x, y) for (x, y) in [(self.v, self.s), (self.vt, self.st), (self.vf, self.sf)]])
+        d = self.d
+        j = self.i + self.numVariants()
+        return '%s(%s,%s)' % tuple([abbrev([VALUES[z] for z in x[self.i:j]], [z == 1 for z in y[self.i:j]]) for (x, y) in [(d.v, d.s), (d.vt, d.st), (d.vf, d.sf)]])
         
-    def init(self):
-        """Inicializacija vozlišča."""
+    def init(self, d):
+        """Inicializacija vozlišča. Rezervira mesta za variante v grafu d.
+        
+        Argument:
+        d -- graf
+        """
         self.a = []
-        self.v = [None]*self.numVariants()
-        self.vt = [None]*self.numVariants()
-        self.vf = [None]*self.numVariants()
-        self.c = [None]*self.numVariants()
-        self.ct = [None]*self.numVariants()
-        self.cf = [None]*self.numVariants()
-        self.s = [False]*self.numVariants()
-        self.st = [False]*self.numVariants()
-        self.sf = [False]*self.numVariants()
+        self.d = d
+        self.i = d.alloc(self, self.numVariants())
         
     def getValue(self, p=None):
         """Vrne trajno ali začasno vrednost izraza.
@@ -179,11 +621,11 @@ class DAGNode:
         else:
             k = 0
         if p == None:
-            return self.v[k]
+            return VALUES[self.d.v[self.i + k]]
         elif p:
-            return self.vt[k]
+            return VALUES[self.d.vt[self.i + k]]
         else:
-            return self.vf[k]
+            return VALUES[self.d.vf[self.i + k]]
             
     def setValue(self, b, c=None, p=None):
         """Nastavi trajno ali začasno vrednost izraza. Če sta začasni
@@ -198,23 +640,28 @@ class DAGNode:
             p, k = p
         else:
             k = 0
+        d = self.d
+        k += self.i
+        b = code(b)
         if p == None:
-            self.v[k] = b
-            self.vt[k] = b
-            self.vf[k] = b
-            self.c[k] = c
+            d.v[k] = b
+            d.vt[k] = b
+            d.vf[k] = b
+            d.c[k] = c
         elif p:
-            self.vt[k] = b
-            self.ct[k] = c
-            if self.vf[k] == b:
-                self.v[k] = b
-                self.c[k] = (c, self.cf[k])
+            d.touch(k)
+            d.vt[k] = b
+            d.ct[k] = c
+            if d.vf[k] == b:
+                d.v[k] = b
+                d.c[k] = (c, d.cf[k])
         else:
-            self.vf[k] = b
-            self.cf[k] = c
-            if self.vt[k] == b:
-                self.v[k] = b
-                self.c[k] = (self.ct[k], c)
+            d.touch(k)
+            d.vf[k] = b
+            d.cf[k] = c
+            if d.vt[k] == b:
+                d.v[k] = b
+                d.c[k] = (d.ct[k], c)
                 
     def getSure(self, p=None):
         """Pove, ali vrednosti otrok zagotavljajo trenutno vrednost.
@@ -227,11 +674,11 @@ class DAGNode:
         else:
             k = 0
         if p == None:
-            return self.s[k]
+            return self.d.s[self.i + k] == 1
         elif p:
-            return self.st[k]
+            return self.d.st[self.i + k] == 1
         else:
-            return self.sf[k]
+            return self.d.sf[self.i + k] == 1
             
     def setSure(self, p=None, trace=False):
         """Nastavi zagotovilo o trenutni vrednosti. Če obstajata zagotovili
@@ -247,39 +694,44 @@ class DAGNode:
             p, k = p
         else:
             k = 0
+        d = self.d
+        j = self.i + k
         if p == None:
-            if self.s[k]:
+            if d.s[j]:
                 return False
-            self.s[k] = True
-            self.st[k] = True
-            self.sf[k] = True
+            d.s[j] = 1
+            d.st[j] = 1
+            d.sf[j] = 1
         elif p:
-            if self.st[k]:
+            if d.st[j]:
                 return False
-            self.st[k] = True
-            if self.sf[k]:
-                self.s[k] = True
+            d.touch(j)
+            d.st[j] = 1
+            if d.sf[j]:
+                d.s[j] = 1
         else:
-            if self.sf[k]:
+            if d.sf[j]:
                 return False
-            self.sf[k] = True
-            if self.st[k]:
-                self.s[k] = True
+            d.touch(j)
+            d.sf[j] = 1
+            if d.st[j]:
+                d.s[j] = 1
         if trace > 3:
             print("Ensured at %s the value of the node %s" % (abbrev((p, k)), self))
         return True
-                
+        
     def clearTemp(self):
         """Pobriše začasne oznake."""
-        for i in range(self.numVariants()):
-            if self.v[i] == None:
-                self.vt[i] = None
-                self.vf[i] = None
-                self.ct[i] = None
-                self.cf[i] = None
-                self.st[i] = False
-                self.sf[i] = False
-            
+        d = self.d
+        for i in range(self.i, self.i + self.numVariants()):
+            if d.v[i] == 0:
+                d.vt[i] = 0
+                d.vf[i] = 0
+                d.ct[i] = None
+                d.cf[i] = None
+                d.st[i] = 0
+                d.sf[i] = 0
+                
     def numVariants(self):
         """Vrne število variant podizrazov, ki jih je treba preveriti.
         
@@ -311,6 +763,7 @@ class DAGNode:
             return v == b
         if trace > 2:
             print("Valuating to %s:%s the node %s" % (abbrev(p), abbrev(b), self))
+        self.d.valuations += 1
         self.setValue(b, c, p)
         return None
         
@@ -333,7 +786,7 @@ class DAGNode:
                 x, t = x
             else:
                 t = 0
-            if not x.update(b, (self, k), (p, t), trace):
+            if not self.d.dispatch(x.update, b, (self, k), (p, t), trace):
                 return False
         return True
         
@@ -350,9 +803,9 @@ class DAGNode:
         trace -- ali naj se izpisuje sled dokazovanja, privzeto False
         """
         return True
-        
+
 class DAGLiteral(DAGNode):
-    
+
     """Razred vozlišča v DAG, ki predstavlja logično spremenljivko.
     
     Deduje od razreda DAGNode.
@@ -361,6 +814,8 @@ class DAGLiteral(DAGNode):
     p -- ime spremenljivke
     """
     
+    __slots__ = ('p', )
+    
     def __init__(self, d, p):
         """Konstruktor. Nastavi ime spremenljivke.
         
@@ -369,7 +824,7 @@ class DAGLiteral(DAGNode):
         p -- ime spremenljivke
         """
         self.p = p
-        self.init()
+        self.init(d)
         
     def __repr__(self):
         """Znakovna predstavitev."""
@@ -393,7 +848,7 @@ class DAGLiteral(DAGNode):
         return DAGNode.valuate(self, b, c, p, trace) != False and self.parents(b, p, trace)
 
 class DAGNot(DAGNode):
-    
+
     """Razred vozlišča v DAG, ki predstavlja logično negacijo.
     
     Deduje od razreda DAGNode.
@@ -402,6 +857,8 @@ class DAGNot(DAGNode):
     t -- vozlišče, ki ustreza negiranemu izrazu
     """
     
+    __slots__ = ('t', )
+    
     def __init__(self, d, t):
         """Konstruktor. Za negirani izraz poišče ali ustvari vozlišče
         ter se vanj doda kot starš.
@@ -412,7 +869,7 @@ class DAGNot(DAGNode):
         """
         self.t = t.node(d)
         self.t.a.append(self)
-        self.init()
+        self.init(d)
         
     def __repr__(self):
         """Znakovna predstavitev."""
@@ -438,10 +895,10 @@ class DAGNot(DAGNode):
         if val == None:
             if type(p) == tuple:
                 p = p[0]
-            return self.t.valuate(not b, (self, 0), p, trace) and self.parents(b, p, trace)
+            return self.d.dispatch(self.t.valuate, not b, (self, 0), p, trace) and self.parents(b, p, trace)
         else:
             return val
-        
+            
     def update(self, b, c=None, p=None, trace=False):
         """Posodobi stanje po valuaciji otroka v logično vrednost b.
         
@@ -467,7 +924,7 @@ class DAGNot(DAGNode):
         return (b == None and not sure) or self.parents(b, p, trace)
 
 class DAGAnd(DAGNode):
-    
+
     """Razred vozlišča v DAG, ki predstavlja logično konjunkcijo.
     
     Deduje od razreda DAGNode.
@@ -476,6 +933,8 @@ class DAGAnd(DAGNode):
     l -- seznam vozlišč, ki ustrezajo konjunktom
     """
     
+    __slots__ = ('l', )
+    
     def __init__(self, d, l):
         """Konstruktor. Za vsak konjunkt poišče ali ustvari vozlišče
         ter se doda kot starš dobljenemu vozlišču.
@@ -487,7 +946,7 @@ class DAGAnd(DAGNode):
         self.l = [x.node(d) for x in l]
         for i, x in enumerate(self.l):
             x.a.append((self, i))
-        self.init()
+        self.init(d)
         
     def __repr__(self):
         """Znakovna predstavitev."""
@@ -514,7 +973,7 @@ class DAGAnd(DAGNode):
         
         Vrne 1 ali število konjunktov minus 1."""
         return max(1, len(self.l)-1)
-                            
+        
     def valuate(self, b, c=None, p=None, trace=False):
         """Valuacija v logično vrednost b.
         
@@ -542,14 +1001,14 @@ class DAGAnd(DAGNode):
                     return False
                 self.setSure(p, trace)
             elif len(self.l) == 1:
-                if not self.l[0].valuate(b, (self, k), p, trace):
+                if not self.d.dispatch(self.l[0].valuate, b, (self, k), p, trace):
                     return False
             else:
                 i = k
                 if b:
                     while i < len(self.l)-1:
-                        val = DAGNode.valuate(self, True, (self, k), (p, i+1), trace) if i < len(self.l)-2 else self.l[-1].valuate(True, (self, k), p, trace)
-                        if val == False or not self.l[i].valuate(True, (self, k), p, trace):
+                        val = DAGNode.valuate(self, True, (self, k), (p, i+1), trace) if i < len(self.l)-2 else self.d.dispatch(self.l[-1].valuate, True, (self, k), p, trace)
+                        if val == False or not self.d.dispatch(self.l[i].valuate, True, (self, k), p, trace):
                             return False
                         elif val:
                             break
@@ -557,18 +1016,18 @@ class DAGAnd(DAGNode):
                 else:
                     while i < len(self.l)-1:
                         if self.l[i].getValue(p):
-                            val = DAGNode.valuate(self, False, (self, k), (p, i+1), trace) if i < len(self.l)-2 else self.l[-1].valuate(False, (self, k), p, trace)
+                            val = DAGNode.valuate(self, False, (self, k), (p, i+1), trace) if i < len(self.l)-2 else self.d.dispatch(self.l[-1].valuate, False, (self, k), p, trace)
                             if val == False:
                                 return False
                             if val:
                                 break
                         else:
-                            if (self.getValue((p, i+1)) if i < len(self.l)-2 else self.l[-1].getValue(p)) and not self.l[i].valuate(False, (self, k), p, trace):
+                            if (self.getValue((p, i+1)) if i < len(self.l)-2 else self.l[-1].getValue(p)) and not self.d.dispatch(self.l[i].valuate, False, (self, k), p, trace):
                                 return False
                             break
                         i += 1
             if k > 0:
-                return self.update(b, (self, k), (p, k-1), trace)
+                return self.d.dispatch(self.update, b, (self, k), (p, k-1), trace)
             else:
                 return self.parents(b, p, trace)
         else:
@@ -600,7 +1059,7 @@ class DAGAnd(DAGNode):
                 if k == len(self.l)-1:
                     k -= 1
                     if self.getValue((p, k)) == False:
-                        if not self.l[k].valuate(False, c, p, trace):
+                        if not self.d.dispatch(self.l[k].valuate, False, c, p, trace):
                             return False
                         else:
                             b = None
@@ -608,7 +1067,7 @@ class DAGAnd(DAGNode):
                         b = None
                 elif (c[0] if type(c) == tuple else c) != self:
                     if self.getValue((p, k)) == False:
-                        if not (self.valuate(False, c, (p, k+1), trace) if k < len(self.l)-2 else self.l[-1].valuate(False, c, p, trace)):
+                        if not (self.d.dispatch(self.valuate, False, c, (p, k+1), trace) if k < len(self.l)-2 else self.d.dispatch(self.l[-1].valuate, False, c, p, trace)):
                             return False
                         else:
                             b = None
@@ -616,7 +1075,7 @@ class DAGAnd(DAGNode):
                         b = None
                 else:
                     if self.getValue((p, k)) == False:
-                        if not self.l[k].valuate(False, c, p, trace):
+                        if not self.d.dispatch(self.l[k].valuate, False, c, p, trace):
                             return False
                         else:
                             b = None
@@ -633,7 +1092,7 @@ class DAGAnd(DAGNode):
                     if k < 0:
                         break
                     if self.getValue((p, k)) == False:
-                        if not self.l[k].valuate(False, c, p, trace):
+                        if not self.d.dispatch(self.l[k].valuate, False, c, p, trace):
                             return False
                         else:
                             b = None
@@ -0,0 +1,153 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+import multiprocessing
+import time
+import traceback
+import dpll
+import polynomial
+
+# Združljivost za Python 2 in Python 3
+try:
+    from queue import Empty
+except ImportError:
+    from Queue import Empty
+
+# Konfiguracije reševalnikov: ime -> (funkcija, dodatni argumenti)
+engines = {
+    "dpll": (dpll.dpll, {}),
+    "dpll-vsids": (dpll.dpll, {"heuristic": "vsids", "phase": True}),
+    "cdcl": (dpll.cdcl, {}),
+    "cdcl-moms": (dpll.cdcl, {"heuristic": "moms"}),
+    "sat": (polynomial.sat, {}),
+    "sat3": (polynomial.sat3, {})
+}
+
+# Privzeti nabor konfiguracij
+default = ["cdcl", "dpll-vsids", "dpll", "sat3"]
+
+# Čas v sekundah med preverjanji, ali procesi reševalnikov še tečejo
+poll = 0.1
+
+class Failure:
+
+    """Rezultat reševalnika, ki je javil napako ali se je njegov proces
+    končal brez rezultata.
+    
+    Metode:
+    __init__ -- konstruktor
+    __repr__ -- znakovna predstavitev
+    
+    Spremenljivke:
+    error -- opis napake
+    trace -- sled sklada ob napaki ali None
+    """
+    
+    def __init__(self, error, trace=None):
+        """Konstruktor.
+        
+        Argumenta:
+        error -- opis napake
+        trace -- sled sklada ob napaki, privzeto None
+        """
+        self.error = error
+        self.trace = trace
+        
+    def __repr__(self):
+        """Znakovna predstavitev."""
+        return "Failure(%s)" % self.error
+
+def run(name, f, queue):
+    """Požene reševalnik name na izrazu f in rezultat pošlje v vrsto.
+    
+    V vrsto se pošlje par (ime, rezultat). Če reševalnik javi napako, je
+    rezultat objekt razreda Failure z opisom napake in sledjo sklada.
+    
+    Argumenti:
+    name  -- ime konfiguracije reševalnika
+    f     -- logični izraz
+    queue -- vrsta za rezultate
+    """
+    fun, args = engines[name]
+    try:
+        r = fun(f, **args)
+    except Exception as e:
+        r = Failure(repr(e), traceback.format_exc())
+    queue.put((name, r))
+
+def portfolio(f, names=None, timeout=None, trace=False):
+    """Hkrati požene več reševalnikov na izrazu f v ločenih procesih.
+    
+    Vrne par (rezultat, ime), kjer je rezultat prvi dokončen odgovor
+    (prireditev vrednosti spremenljivkam v obliki slovarja ali False, če
+    izraz ni izpolnljiv), ime pa ime konfiguracije, ki ga je dala. Ostali
+    procesi se tedaj prekinejo. Če noben reševalnik ne da dokončnega
+    odgovora (npr. polynomial.sat vrne None) ali se izteče čas, vrne par
+    (None, None). Če pri tem kateri od reševalnikov javi napako ali se
+    njegov proces konča brez rezultata (npr. zaradi signala ali pomanjkanja
+    pomnilnika), pa vrne par (neuspeh, ime) za prvi tak reševalnik, kjer je
+    neuspeh objekt razreda Failure.
+    
+    Vrsta z rezultati se bere v intervalih dolžine poll, med katerimi se
+    preveri, ali procesi brez rezultata še tečejo. Proces, ki je mrtev ob
+    dveh zaporednih preverjanjih, nima več rezultata na poti.
+    
+    Argumenti:
+    f       -- logični izraz
+    names   -- seznam imen konfiguracij iz slovarja engines, privzeto None
+               (nabor default)
+    timeout -- največji čas v sekundah, privzeto None (brez omejitve)
+    trace   -- ali naj se izpisuje sled, privzeto False
+    """
+    if names == None:
+        names = default
+    if any([x not in engines for x in names]):
+        raise Exception('Unknown engine!')
+    queue = multiprocessing.Queue()
+    procs = [multiprocessing.Process(target=run, args=(x, f, queue)) for x in names]
+    for p in procs:
+        p.daemon = True
+        p.start()
+    end = None if timeout == None else time.time() + timeout
+    waiting = dict(zip(names, procs))
+    dead = []
+    out = (None, None)
+    failed = None
+    try:
+        while len(waiting) > 0:
+            try:
+                name, r = queue.get(True, poll if end == None else max(0, min(poll, end - time.time())))
+            except Empty:
+                if end != None and time.time() >= end:
+                    if trace:
+                        print("Timeout reached")
+                    break
+                lost = [x for x in dead if x in waiting]
+                dead = [x for x in waiting if not waiting[x].is_alive()]
+                if len(lost) == 0:
+                    continue
+                name = lost[0]
+                r = Failure("Process exited with code %s" % waiting[name].exitcode)
+            waiting.pop(name, None)
+            if r == False or type(r) == dict:
+                if trace:
+                    print("Engine %s found an answer" % name)
+                out = (r, name)
+                break
+            elif isinstance(r, Failure):
+                if trace:
+                    print("Engine %s failed: %s" % (name, r.error))
+                    if r.trace != None:
+                        print(r.trace)
+                if failed == None:
+                    failed = (r, name)
+            elif trace:
+                print("Engine %s gave no answer" % name)
+        if out[1] == None and failed != None:
+            out = failed
+    finally:
+        for p in procs:
+            if p.is_alive():
+                p.terminate()
+            p.join()
+    return out
@@ -0,0 +1,443 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+from array import array
+import time
+import dpll
+import twosat
+
+# Privzeto zaporedje prehodov predprocesiranja
+passes = ["units", "equivalences", "subsumption", "strengthening", "elimination"]
+
+def node(x):
+    """Vrne indeks literala x v seznamu pojavitev.
+    
+    Argument:
+    x -- celoštevilski literal
+    """
+    return 2*x if x > 0 else 1 - 2*x
+
+def signature(c):
+    """Vrne podpis stavka c: bitno masko, ki vsebuje bit za vsak literal.
+    
+    Če podpis stavka c vsebuje bit, ki ga ni v podpisu stavka d, c ni
+    podmnožica d.
+    
+    Argument:
+    c -- seznam celoštevilskih literalov
+    """
+    s = 0
+    for x in c:
+        s |= 1 << (node(x) & 63)
+    return s
+
+class Preprocessor:
+
+    """Predprocesiranje zbirke stavkov pred iskanjem.
+    
+    Stavki so shranjeni kot seznami literalov, za vsak literal pa se hrani
+    množica stavkov, v katerih se pojavi (seznam pojavitev). Odstranjeni
+    stavki so nadomeščeni z None. Prehodi predprocesiranja so:
+    units         -- propagacija enotskih stavkov
+    equivalences  -- nadomeščanje ekvivalentnih literalov (glej modul
+                     twosat)
+    subsumption   -- odstranjevanje stavkov, ki vsebujejo kak drug stavek
+    strengthening -- samoizključujoča resolucija: če je c = l \\/ A in
+                     d = ~l \\/ B, kjer je A podmnožica B, se iz d odstrani ~l
+    elimination   -- omejena eliminacija spremenljivk: spremenljivka se
+                     nadomesti z vsemi netavtološkimi resolventami njenih
+                     stavkov, če jih ni več kot odstranjenih stavkov
+    Za rekonstrukcijo prireditve se na sklad shranjujejo nadomeščene
+    spremenljivke in stavki eliminiranih spremenljivk.
+    
+    Metode:
+    __init__      -- konstruktor
+    add           -- doda stavek
+    remove        -- odstrani stavek
+    strengthen    -- odstrani literal iz stavka
+    units         -- propagacija enotskih stavkov
+    subsumed      -- pove, ali je stavek podmnožica drugega stavka
+    forward       -- pove, ali kak stavek vsebuje dani stavek
+    backward      -- odstrani stavke, ki vsebujejo dani stavek
+    equivalences  -- nadomesti ekvivalentne literale
+    subsumption   -- odstrani vsebovane stavke
+    strengthening -- samoizključujoča resolucija
+    resolvents    -- vrne resolvente stavkov spremenljivke
+    elimination   -- omejena eliminacija spremenljivk
+    run           -- izvede prehode in zabeleži statistiko
+    size          -- število stavkov
+    db            -- vrne zbirko preostalih stavkov
+    reconstruct   -- razširi prireditev na vse prvotne spremenljivke
+    
+    Spremenljivke:
+    names    -- seznam imen spremenljivk (na mestu 0 je None)
+    clauses  -- seznam stavkov (None za odstranjene stavke)
+    sig      -- seznam podpisov stavkov
+    occurs   -- seznam množic stavkov, v katerih se pojavi literal
+    val      -- tabela vrednosti spremenljivk, določenih z enotskimi stavki
+    removed  -- tabela oznak odstranjenih (nadomeščenih ali eliminiranih)
+                spremenljivk
+    queue    -- seznam enotskih literalov, ki še niso propagirani
+    stack    -- sklad za rekonstrukcijo prireditve
+    conflict -- ali je zbirka stavkov v protislovju
+    stats    -- seznam trojic (prehod, število odstranjenih stavkov, čas)
+    limit    -- največje število pojavitev obeh literalov spremenljivke, pri
+                katerem se še poskusi eliminacija
+    """
+    
+    def __init__(self, db, limit=10):
+        """Konstruktor. Prebere stavke iz zbirke db.
+        
+        Argumenta:
+        db    -- zbirka stavkov
+        limit -- največje število pojavitev vsaj enega od literalov
+                 spremenljivke, pri katerem se še poskusi eliminacija,
+                 privzeto 10
+        """
+        n = db.numVars()
+        self.names = db.names[:]
+        self.clauses = []
+        self.sig = []
+        self.occurs = [set() for i in range(2*n + 2)]
+        self.val = array('b', [0]) * (n + 1)
+        self.removed = bytearray(n + 1)
+        self.queue = []
+        self.stack = []
+        self.conflict = False
+        self.stats = []
+        self.limit = limit
+        for i in range(len(db)):
+            self.add(list(db.clause(i)))
+            
+    def add(self, c):
+        """Doda stavek c, ki se poenostavi glede na znane vrednosti.
+        
+        Enotski stavki se dodajo v vrsto za propagacijo. Vrne indeks
+        dodanega stavka ali None, če stavek ni bil shranjen.
+        
+        Argument:
+        c -- seznam celoštevilskih literalov
+        """
+        lits = set()
+        d = []
+        for x in c:
+            v = self.val[x] if x > 0 else -self.val[-x]
+            if v > 0 or -x in lits:
+                return None
+            if v == 0 and x not in lits:
+                lits.add(x)
+                d.append(x)
+        if len(d) == 0:
+            self.conflict = True
+            return None
+        elif len(d) == 1:
+            self.queue.append(d[0])
+            return None
+        i = len(self.clauses)
+        self.clauses.append(d)
+        self.sig.append(signature(d))
+        for x in d:
+            self.occurs[node(x)].add(i)
+        return i
+        
+    def remove(self, i):
+        """Odstrani stavek z indeksom i.
+        
+        Argument:
+        i -- indeks stavka
+        """
+        for x in self.clauses[i]:
+            self.occurs[node(x)].discard(i)
+        self.clauses[i] = None
+        
+    def strengthen(self, i, x):
+        """Iz stavka z indeksom i odstrani literal x. Če stavek postane
+        enotski, ga odstrani in literal doda v vrsto za propagacijo.
+        
+        Argumenta:
+        i -- indeks stavka
+        x -- celoštevilski literal
+        """
+        c = self.clauses[i]
+        c.remove(x)
+        self.occurs[node(x)].discard(i)
+        self.sig[i] = signature(c)
+        if len(c) == 1:
+            self.queue.append(c[0])
+            self.remove(i)
+            
+    def units(self):
+        """Propagira enotske literale iz vrste. Stavke z resničnim literalom
+        odstrani, neresnične literale pa odstrani iz stavkov."""
+        while len(self.queue) > 0 and not self.conflict:
+            x = self.queue.pop()
+            v = self.val[x] if x > 0 else -self.val[-x]
+            if v != 0:
+                if v < 0:
+                    self.conflict = True
+                continue
+            self.val[abs(x)] = 1 if x > 0 else -1
+            for i in list(self.occurs[node(x)]):
+                self.remove(i)
+            for i in list(self.occurs[node(-x)]):
+                if self.clauses[i] != None:
+                    self.strengthen(i, -x)
+        if self.conflict:
+            self.queue = []
+            
+    def subsumed(self, c, s, d, t):
+        """Pove, ali je stavek c s podpisom s podmnožica stavka d s
+        podpisom t.
+        
+        Argumenti:
+        c -- seznam literalov prvega stavka
+        s -- podpis prvega stavka
+        d -- seznam literalov drugega stavka
+        t -- podpis drugega stavka
+        """
+        if len(c) > len(d) or s & ~t != 0:
+            return False
+        d = set(d)
+        return all([x in d for x in c])
+        
+    def forward(self, c):
+        """Pove, ali je kak shranjen stavek podmnožica stavka c.
+        
+        Argument:
+        c -- seznam celoštevilskih literalov
+        """
+        s = signature(c)
+        for x in c:
+            for j in self.occurs[node(x)]:
+                if self.subsumed(self.clauses[j], self.sig[j], c, s):
+                    return True
+        return False
+        
+    def backward(self, i, strengthen=False):
+        """Odstrani stavke, ki vsebujejo stavek z indeksom i. Če je
+        strengthen resničen, izvede še samoizključujočo resolucijo s
+        stavkom i.
+        
+        Vrne število odstranjenih stavkov.
+        
+        Argumenta:
+        i          -- indeks stavka
+        strengthen -- ali naj se izvede samoizključujoča resolucija,
+                      privzeto False
+        """
+        c = self.clauses[i]
+        s = self.sig[i]
+        x = min(c, key=lambda y: len(self.occurs[node(y)]))
+        count = 0
+        for j in list(self.occurs[node(x)]):
+            if j != i and self.subsumed(c, s, self.clauses[j], self.sig[j]):
+                self.remove(j)
+                count += 1
+        if strengthen:
+            for x in c[:]:
+                rest = [y for y in c if y != x]
+                r = signature(rest)
+                for j in list(self.occurs[node(-x)]):
+                    d = self.clauses[j]
+                    if d == None or j == i or len(d) <= len(rest) or r & ~self.sig[j] != 0:
+                        continue
+                    if self.subsumed(rest, r, [y for y in d if y != -x], self.sig[j]):
+                        self.strengthen(j, -x)
+                if self.clauses[i] == None:
+                    break
+        return count
+        
+    def equivalences(self):
+        """Nadomesti ekvivalentne literale s predstavniki njihovih krepko
+        povezanih komponent v grafu implikacij dvočlenih stavkov.
+        
+        Pred vsako zamenjavo se propagirajo enotski literali iz vrste;
+        spremenljivke z določeno vrednostjo se ne nadomeščajo.
+        """
+        self.units()
+        if self.conflict:
+            return
+        db = dpll.ClauseDB()
+        for p in self.names[1:]:
+            db.variable(p)
+        for c in self.clauses:
+            if c != None:
+                db.addClause(c)
+        rep = twosat.equivalences(db)
+        if rep == False:
+            self.conflict = True
+            return
+        for k in range(1, len(self.names)):
+            self.units()
+            if self.conflict:
+                return
+            if rep[k] == k or self.removed[k] or self.val[k] != 0:
+                continue
+            self.removed[k] = 1
+            self.stack.append((k, rep[k], None))
+            r = rep[k]
+            for x, y in [(k, r), (-k, -r)]:
+                for i in list(self.occurs[node(x)]):
+                    c = [y if z == x else z for z in self.clauses[i]]
+                    self.remove(i)
+                    self.add(c)
+        self.units()
+        
+    def subsumption(self):
+        """Odstrani stavke, ki vsebujejo kak drug stavek."""
+        order = sorted([i for i, c in enumerate(self.clauses) if c != None], key=lambda i: len(self.clauses[i]))
+        for i in order:
+            if self.clauses[i] != None:
+                self.backward(i)
+                
+    def strengthening(self):
+        """Izvede samoizključujočo resolucijo med vsemi pari stavkov ter
+        sproti odstranjuje vsebovane stavke."""
+        order = sorted([i for i, c in enumerate(self.clauses) if c != None], key=lambda i: len(self.clauses[i]))
+        for i in order:
+            if self.clauses[i] != None:
+                self.backward(i, True)
+            self.units()
+            if self.conflict:
+                return
+                
+    def resolvents(self, k, bound):
+        """Vrne seznam netavtoloških resolvent stavkov, ki vsebujejo
+        spremenljivko k, ali None, če jih je več kot bound.
+        
+        Argumenta:
+        k     -- številka spremenljivke
+        bound -- največje dovoljeno število resolvent
+        """
+        out = []
+        for i in self.occurs[node(k)]:
+            c = [x for x in self.clauses[i] if x != k]
+            for j in self.occurs[node(-k)]:
+                lits = set(c)
+                r = c[:]
+                for x in self.clauses[j]:
+                    if x == -k or x in lits:
+                        continue
+                    if -x in lits:
+                        break
+                    lits.add(x)
+                    r.append(x)
+                else:
+                    out.append(r)
+                    if len(out) > bound:
+                        return None
+        return out
+        
+    def elimination(self):
+        """Eliminira spremenljivke, pri katerih število netavtoloških
+        resolvent ne preseže števila stavkov, ki jih vsebujejo.
+        
+        Pred vsako eliminacijo se propagirajo enotski literali iz vrste;
+        spremenljivke z določeno vrednostjo se ne eliminirajo.
+        """
+        order = sorted(range(1, len(self.names)), key=lambda k: len(self.occurs[2*k]) + len(self.occurs[2*k+1]))
+        for k in order:
+            self.units()
+            if self.conflict:
+                return
+            pos = self.occurs[2*k]
+            neg = self.occurs[2*k+1]
+            if self.removed[k] or self.val[k] != 0 or (len(pos) > self.limit and len(neg) > self.limit):
+                continue
+            res = self.resolvents(k, len(pos) + len(neg))
+            if res == None:
+                continue
+            self.removed[k] = 1
+            self.stack.append((k, None, [self.clauses[i][:] for i in pos]))
+            for i in list(pos) + list(neg):
+                self.remove(i)
+            for c in res:
+                if not self.forward(c):
+                    i = self.add(c)
+                    if i != None:
+                        self.backward(i)
+        self.units()
+        
+    def run(self, names=None, trace=False):
+        """Izvede podane prehode predprocesiranja in za vsakega v seznam
+        stats doda število odstranjenih stavkov in porabljeni čas. Pred
+        vsakim prehodom in po njem se propagirajo enotski literali iz vrste.
+        
+        Vrne False, če je zbirka v protislovju, in True sicer.
+        
+        Argumenta:
+        names -- seznam imen prehodov, privzeto None (seznam passes)
+        trace -- ali naj se izpisuje statistika, privzeto False
+        """
+        if names == None:
+            names = passes
+        for p in names:
+            if p not in passes:
+                raise Exception('Unknown preprocessing pass!')
+            before = self.size()
+            t = time.time()
+            self.units()
+            if self.conflict:
+                break
+            getattr(self, p)()
+            self.units()
+            t = time.time() - t
+            self.stats.append((p, before - self.size(), t))
+            if trace:
+                print("Pass %s removed %d clauses in %.3f s" % (p, before - self.size(), t))
+        return not self.conflict
+        
+    def size(self):
+        """Vrne število preostalih stavkov."""
+        return len([c for c in self.clauses if c != None])
+        
+    def db(self):
+        """Vrne zbirko preostalih stavkov. Spremenljivke obdržijo imena."""
+        db = dpll.ClauseDB()
+        for c in self.clauses:
+            if c != None:
+                db.addClause([db.variable(self.names[x]) if x > 0 else -db.variable(self.names[-x]) for x in c])
+        return db
+        
+    def reconstruct(self, model):
+        """Razširi prireditev vrednosti za preostale stavke na prireditev
+        vsem prvotnim spremenljivkam, pri kateri so vsi prvotni stavki
+        resnični.
+        
+        Spremenljivke brez vrednosti dobijo vrednost False. Eliminirana
+        spremenljivka dobi vrednost True natanko tedaj, ko jo potrebuje kak
+        njen stavek; nadomeščena spremenljivka dobi vrednost svojega
+        predstavnika.
+        
+        Argument:
+        model -- prireditev vrednosti v obliki slovarja
+        """
+        val = array('b', self.val)
+        for k in range(1, len(self.names)):
+            if val[k] == 0:
+                val[k] = 1 if model.get(self.names[k], False) else -1
+        for k, r, cs in reversed(self.stack):
+            if r != None:
+                val[k] = val[r] if r > 0 else -val[-r]
+                continue
+            val[k] = -1
+            for c in cs:
+                if not any([(val[x] if x > 0 else -val[-x]) > 0 for x in c if x != k]):
+                    val[k] = 1
+                    break
+        return {self.names[k]: val[k] > 0 for k in range(1, len(self.names))}
+
+def preprocess(f, names=None, trace=False):
+    """Predprocesira zbirko stavkov s podanimi prehodi.
+    
+    Vrne objekt razreda Preprocessor; preostale stavke vrne njegova metoda
+    db, statistiko prehodov pa hrani spremenljivka stats.
+    
+    Argumenti:
+    f     -- zbirka stavkov
+    names -- seznam imen prehodov, privzeto None (seznam passes)
+    trace -- ali naj se izpisuje statistika, privzeto False
+    """
+    p = Preprocessor(f)
+    p.run(names, trace)
+    return p
@@ -2,6 +2,7 @@
 # -*- coding: utf-8 -*-
 
 import prop
+import cardinality
 import math
 import re
 
@@ -11,8 +12,18 @@ try:
 except NameError:
     basestring = str
 
-def sudoku(s, abc):
-    """Vrne logični izraz, ki opisuje sudoku s z abecedo abc."""
+def sudoku(s, abc, encoding="pairwise"):
+    """Vrne logični izraz, ki opisuje sudoku s z abecedo abc.
+    
+    Pogoj, da ima vsako polje natanko eno vrednost, se zakodira s
+    kodiranjem encoding iz modula cardinality; pomožne spremenljivke polja
+    v vrstici i in stolpcu j imajo predpono "ricjo".
+    
+    Argumenti:
+    s        -- seznam vrstic sudokuja (None za prazna polja)
+    abc      -- abeceda
+    encoding -- ime kodiranja "natanko eden", privzeto "pairwise"
+    """
     n = len(abc)
     r = int(math.sqrt(n))
     
@@ -41,9 +52,7 @@ def sudoku(s, abc):
                         l.append(prop.Not("r%dc%dv%d" % (i, j, k)))
             else:
                 # Vsako polje ima natanko eno vrednost
-                for k in range(n):
-                    l.append(prop.iff("r%dc%do%d" % (i, j, k), prop.And([("r%dc%dv%d" % (i, j, x) if x == k else prop.Not("r%dc%dv%d" % (i, j, x))) for x in range(n)])))
-                l.append(prop.Or(["r%dc%do%d" % (i, j, k) for k in range(n)]))
+                l += cardinality.exactlyOne(["r%dc%dv%d" % (i, j, k) for k in range(n)], encoding, "r%dc%do" % (i, j))
             # V vsaki vrstici se pojavi vsaka vrednost
             l.append(prop.Or(["r%dc%dv%d" % (j, x, i) for x in range(n)]))
             # V vsakem stolpcu se pojavi vsaka vrednost
@@ -64,7 +73,11 @@ def solveSudoku(abc, d):
     for k, v in d.items():
         if not v:
             continue
-        i, j, c = [int(x) for x in re.match('^r([0-9]+)c([0-9]+)v([0-9]+)', k).groups()]
+        m = re.match('^r([0-9]+)c([0-9]+)v([0-9]+)$', k)
+        if m == None:
+            # Pomožna spremenljivka
+            continue
+        i, j, c = [int(x) for x in m.groups()]
         s[i][j] = abc[c]
     return s
         
@@ -80,9 +93,19 @@ sud = \
  [None, None, '6', '7', None, '1', '9', None, '3'],
  ['7', None, None, None, '9', '6', None, '4', None]]
  
-def hadamard(n):
+def hadamard(n, encoding="sequential"):
     """Vrne logični izraz, ki je izpolnljiv, ko obstaja Hadamardova matrika
-    reda n."""
+    reda n.
+    
+    Za vsak par vrstic i in j spremenljivka rirjxk pove, ali se vrstici
+    razlikujeta v stolpcu k. Pogoj, da se razlikujeta v natanko n/2
+    stolpcih, se zakodira s kodiranjem encoding iz modula cardinality;
+    pomožne spremenljivke imajo predpono "rirjn".
+    
+    Argumenta:
+    n        -- red matrike
+    encoding -- ime kodiranja "natanko k", privzeto "sequential"
+    """
     if n == 1:
         return prop.Literal("r0c0")
     if n % 2 == 1:
@@ -94,23 +117,13 @@ def hadamard(n):
         l.append("r0c%d" % i)
         l.append("r%dc0" % i)
         
-    # Štejemo resnične vrednosti XORa i-te in j-te vrstice
     for i in range(n):
         for j in range(i+1, n):
-            # Resničnih je n/2
-            l.append("r%dr%df%dn%d" % (i, j, n, n//2))
-            # Pravili za prvega
-            l.append("r%dr%df1n0" % (i, j))
-            l.append(prop.Not("r%dr%df1n1" % (i, j)))
-            for k in range(1, n):
-                # Ali do indeksa k ni nobenega resničnega?
-                l.append(prop.iff("r%dr%df%dn0" % (i, j, k+1), prop.And("r%dr%df%dn0" % (i, j, k), prop.iff("r%dc%d" % (i, k), "r%dc%d" % (j, k)))))
-                if k < n//2:
-                    # Ali so do indeksa k vsi resnični?
-                    l.append(prop.iff("r%dr%df%dn%d" % (i, j, k+1, k+1), prop.And("r%dr%df%dn%d" % (i, j, k, k), prop.Not(prop.iff("r%dc%d" % (i, k), "r%dc%d" % (j, k))))))
-                for m in range(min(k, n//2)):
-                    # Ali je do indeksa k m+1 resničnih?
-                    l.append(prop.iff("r%dr%df%dn%d" % (i, j, k+1, m+1), prop.Or(prop.And("r%dr%df%dn%d" % (i, j, k, m), prop.Not(prop.iff("r%dc%d" % (i, k), "r%dc%d" % (j, k)))), prop.And("r%dr%df%dn%d" % (i, j, k, m+1), prop.iff("r%dc%d" % (i, k), "r%dc%d" % (j, k))))))
+            # Ali se vrstici razlikujeta v k-tem stolpcu?
+            for k in range(n):
+                l.append(prop.iff("r%dr%dx%d" % (i, j, k), prop.Not(prop.iff("r%dc%d" % (i, k), "r%dc%d" % (j, k)))))
+            # Razlikujeta se v natanko n/2 stolpcih
+            l += cardinality.exactlyK(["r%dr%dx%d" % (i, j, k) for k in range(n)], n//2, encoding, "r%dr%dn" % (i, j))
     return prop.And(l)
 
 def makeHadamard(n, d):
@@ -1,7 +1,10 @@
 #!/usr/bin/python
 # -*- coding: utf-8 -*-
 
+from collections import OrderedDict
+from types import GeneratorType
 import re
+import weakref
 import polynomial
 
 # Združljivost za Python 2 in Python 3
@@ -9,12 +12,49 @@ try:
     basestring
 except NameError:
     basestring = str
+try:
+    RecursionError
+except NameError:
+    RecursionError = RuntimeError
 
 # Ali naj se seznami konjunktov in disjunktov sortirajo?
 # Nastavi na list za nesortiranje
 # Nastavi na sorted za sortiranje
 sortSet = sorted
 
+# Ali naj konstruktorji vračajo internirane izraze?
+# Nastavi s funkcijo interning
+internFormulas = False
+
+# Tabela interniranih izrazov, ključi so pari razreda in strukturnega opisa
+# izraza
+internTable = weakref.WeakValueDictionary()
+
+# Največje število shranjenih rezultatov posamezne pretvorbe (0 za izklop)
+# Nastavi s funkcijo memoization
+memoSize = 0
+
+# Pretvorbe, ki spremenljivke in njihove negacije pustijo nespremenjene
+leafOps = set(["flatten", "simplify", "cnf", "dnf", "ncf"])
+
+# Pretvorbe, ki izraze iščejo v slovarju, zato se vedno izvedejo s funkcijo
+# traverse, ki zgostitev vsakega podizraza izračuna le enkrat
+hashingOps = set(["node"])
+
+# Pretvorbe, katerih rezultati se shranjujejo
+memoized = set(["flatten", "simplify", "cnf", "dnf", "ncf"])
+
+# Pretvorbe, katerih rezultat se ob ponovni uporabi ne spremeni
+idempotent = set(["flatten"])
+
+# Tabele shranjenih rezultatov pretvorb: ime metode -> slovar, ki id izraza
+# priredi par (izraz, rezultat), urejen od najdlje neuporabljenega naprej
+memoTables = {}
+
+# Zgostitve izrazov, izračunane med izvajanjem funkcije traverse (slovar, ki id
+# izraza priredi par (izraz, zgostitev)), ali None, ko se ta ne izvaja
+hashes = None
+
 def paren(s, level, expl):
     """Postavi oklepaje okoli izraza.
     
@@ -28,6 +68,461 @@ def paren(s, level, expl):
     """
     return s if level <= expl else '('+s+')'
 
+def interning(b=True):
+    """Vklopi ali izklopi interniranje izrazov.
+    
+    Ko je interniranje vklopljeno, konstruktorji razredov Literal, Not, And
+    in Or (ter njihovih podrazredov) za strukturno enake izraze vračajo isti
+    objekt. Zgostitev interniranega izraza se izračuna ob konstrukciji,
+    primerjanje dveh interniranih izrazov istega razreda pa je primerjanje
+    identitete. Izrazi različnih razredov (npr. Implies(p, q) in
+    Or([Not(p), q]) ali Tru() in And([])) se internirajo ločeno, enaki pa
+    so še vedno, če so strukturno enaki. Dokler interniranje ni vklopljeno,
+    konstruktorji in primerjave nimajo dodatnih stroškov, po izklopu pa
+    konstruktorji kličejo še metodo __new__ (glej funkcijo restore). Vrne
+    prejšnjo nastavitev.
+    
+    Argument:
+    b -- ali naj se izrazi internirajo, privzeto True
+    """
+    global internFormulas
+    old = internFormulas
+    internFormulas = b
+    if b:
+        LogicalFormula.__new__ = staticmethod(internedNew)
+    elif '__new__' in LogicalFormula.__dict__:
+        LogicalFormula.__new__ = staticmethod(restore)
+    memoTables.clear()
+    return old
+
+def memoization(size=65536):
+    """Nastavi največje število shranjenih rezultatov vsake od pretvorb
+    iz množice memoized (flatten, simplify, cnf, dnf in ncf) ter pobriše
+    shranjene rezultate. Shranjevanje je privzeto izklopljeno.
+    
+    Rezultati se shranjujejo po identiteti izraza, zato se deljeni podizrazi
+    (pri interniranju tudi strukturno enaki) pretvorijo le enkrat, ponovni
+    klici pa vrnejo shranjeni rezultat. Ko je tabela polna, se odstrani
+    najdlje neuporabljeni rezultat. Tabele hranijo reference na izraze in
+    rezultate, zato ti ostanejo živi (in interniranih izrazov ni mogoče
+    sprostiti), dokler se shranjeni rezultati ne pobrišejo s klicem
+    memoization(0). Shranjevanje predpostavlja, da se izrazi po konstrukciji
+    ne spreminjajo; po spremembi spremenljivke sortSet je treba shranjene
+    rezultate pobrisati s klicem te funkcije. Vrne prejšnjo nastavitev.
+    
+    Argument:
+    size -- največje število shranjenih rezultatov (0 za izklop), privzeto
+            65536
+    """
+    global memoSize
+    old = memoSize
+    memoSize = size
+    memoTables.clear()
+    return old
+
+def memoTable(op):
+    """Vrne tabelo shranjenih rezultatov pretvorbe op ali None, če se
+    njeni rezultati ne shranjujejo.
+    
+    Argument:
+    op -- ime pretvorbe
+    """
+    if memoSize <= 0 or op not in memoized:
+        return None
+    t = memoTables.get(op)
+    if t == None:
+        t = memoTables[op] = OrderedDict()
+    return t
+
+def remember(t, op, f, r):
+    """Shrani rezultat r pretvorbe op izraza f v tabelo t.
+    
+    Pri pretvorbah iz množice idempotent se shrani tudi, da se rezultat
+    preslika sam vase. Ko je tabela polna, se odstranijo najdlje
+    neuporabljeni rezultati.
+    
+    Argumenti:
+    t  -- tabela shranjenih rezultatov
+    op -- ime pretvorbe
+    f  -- logični izraz
+    r  -- rezultat pretvorbe
+    """
+    t[id(f)] = (f, r)
+    if op in idempotent and r is not f:
+        t[id(r)] = (r, r)
+    while len(t) > memoSize:
+        t.popitem(False)
+
+class Call(object):
+
+    """Zahteva za pretvorbo podizraza, ki jo korak pretvorbe vrne funkciji
+    traverse.
+    
+    Spremenljivke:
+    f    -- logični izraz
+    op   -- ime pretvorbe
+    args -- dodatni argumenti pretvorbe
+    """
+    
+    __slots__ = ('f', 'op', 'args')
+    
+    def __init__(self, f, op, *args):
+        """Konstruktor.
+        
+        Argumenti:
+        f     -- logični izraz
+        op    -- ime pretvorbe
+        *args -- dodatni argumenti pretvorbe
+        """
+        self.f = f
+        self.op = op
+        self.args = args
+
+class Each(object):
+
+    """Zahteva za pretvorbo vseh izrazov iz seznama, ki jo korak pretvorbe
+    vrne funkciji traverse. Rezultat zahteve je seznam rezultatov. Listi pri
+    pretvorbah iz množice leafOps ostanejo nespremenjeni.
+    
+    Metode:
+    __init__ -- konstruktor
+    steps    -- koraki zahteve
+    
+    Spremenljivke:
+    l    -- seznam logičnih izrazov
+    op   -- ime pretvorbe
+    args -- dodatni argumenti pretvorbe
+    """
+    
+    __slots__ = ('l', 'op', 'args')
+    
+    def __init__(self, l, op, *args):
+        """Konstruktor.
+        
+        Argumenti:
+        l     -- seznam logičnih izrazov
+        op    -- ime pretvorbe
+        *args -- dodatni argumenti pretvorbe
+        """
+        self.l = l
+        self.op = op
+        self.args = args
+        
+    def steps(self):
+        """Koraki zahteve, ki zaporedoma zahtevajo pretvorbo vseh izrazov."""
+        out = []
+        leaf = self.op in leafOps
+        for x in self.l:
+            if leaf and isLeaf(x):
+                out.append(x)
+            else:
+                out.append((yield Call(x, self.op, *self.args)))
+        yield out
+
+def union(f):
+    """Korak izračuna množice spremenljivk konjunkcije ali disjunkcije f.
+    
+    Vrne unijo množic spremenljivk členov in jo shrani v izraz.
+    
+    Argument:
+    f -- konjunkcija ali disjunkcija
+    """
+    if f._vars == None:
+        s = set()
+        for x in f.l:
+            s.update(x._vars if x._vars != None else (yield Call(x, "variables")))
+        f._vars = frozenset(s)
+    yield f._vars
+
+def leaves(f, cls):
+    """Vrne seznam spremenljivk in negacij spremenljivk, ki sestavljajo izraz
+    f razreda cls skupaj z gnezdenimi izrazi razreda cls, ali None, če f
+    vsebuje še kak drug podizraz.
+    
+    Argumenta:
+    f   -- konjunkcija ali disjunkcija
+    cls -- razred And ali Or
+    """
+    l = []
+    stack = list(reversed(f.l))
+    while len(stack) > 0:
+        x = stack.pop()
+        if isinstance(x, cls):
+            stack.extend(reversed(x.l))
+        elif isLeaf(x):
+            l.append(x)
+        else:
+            return None
+    return l
+
+def run(f, op, *args):
+    """Izvede pretvorbo op izraza f.
+    
+    Koraki pretvorbe se izvedejo rekurzivno (glej funkcijo perform), kar je
+    pri plitvih izrazih najhitreje. Če se pri tem preseže omejitev globine
+    rekurzije, če se že izvaja funkcija traverse ali če je pretvorba iz
+    množice hashingOps, se pretvorba izvede s funkcijo traverse z
+    eksplicitnim skladom.
+    
+    Argumenti:
+    f     -- logični izraz
+    op    -- ime pretvorbe
+    *args -- dodatni argumenti pretvorbe
+    """
+    if hashes != None or op in hashingOps:
+        return traverse(f, op, *args)
+    try:
+        return perform(f, op, args)
+    except RecursionError:
+        return traverse(f, op, *args)
+
+def perform(f, op, args):
+    """Rekurzivno izvede korake pretvorbe op izraza f (glej funkcijo
+    traverse). Zahteve za pretvorbo podizrazov se izvedejo z rekurzivnimi
+    klici.
+    
+    Argumenti:
+    f    -- logični izraz
+    op   -- ime pretvorbe
+    args -- terica dodatnih argumentov pretvorbe
+    """
+    t = memoTable(op) if memoSize > 0 and len(args) == 0 else None
+    if t != None:
+        e = t.pop(id(f), None)
+        if e != None:
+            t[id(f)] = e
+            return e[1]
+    stack = None
+    g = getattr(f, op + "Steps")(*args)
+    x = next(g)
+    while True:
+        if type(x) is Call:
+            r = perform(x.f, x.op, x.args)
+        elif type(x) is Each:
+            leaf = x.op in leafOps
+            r = [y if leaf and isLeaf(y) else perform(y, x.op, x.args) for y in x.l]
+        elif type(x) is GeneratorType:
+            if stack == None:
+                stack = []
+            stack.append(g)
+            g = x
+            x = next(g)
+            continue
+        else:
+            next(g, None)
+            if not stack:
+                break
+            r = x
+            g = stack.pop()
+        x = g.send(r)
+    if t != None:
+        remember(t, op, f, x)
+    return x
+
+def traverse(f, op, *args):
+    """Izvede pretvorbo op izraza f z eksplicitnim skladom, torej neodvisno
+    od omejitve globine rekurzije.
+    
+    Pretvorbo posameznega razreda opiše generator, ki ga vrne metoda z
+    imenom op + "Steps". Generator za rezultat pretvorbe podizraza vrne
+    zahtevo Call in prek yield dobi njen rezultat; za seznam rezultatov
+    pretvorbe več izrazov vrne zahtevo Each, za rezultat drugega generatorja
+    (npr. metode nadrazreda) pa kar ta generator. Prva vrnjena vrednost, ki
+    ni zahteva ali generator, je rezultat pretvorbe. Pretvorbe iz množice
+    leafOps liste vrnejo brez generatorja. Rezultati pretvorb iz množice
+    memoized brez dodatnih argumentov se shranjujejo v tabele LRU (glej
+    funkcijo remember).
+    
+    Med izvajanjem se zgostitve izrazov shranjujejo v slovar hashes, gnezdeni
+    klici pretvorb in zgostitev (npr. pri iskanju izraza v slovarju) pa se
+    prav tako izvedejo s to funkcijo, tako da se globoki podizrazi ne
+    pregledujejo rekurzivno in se njihove zgostitve izračunajo le enkrat.
+    
+    Argumenti:
+    f     -- logični izraz
+    op    -- ime pretvorbe
+    *args -- dodatni argumenti pretvorbe
+    """
+    global hashes
+    outer = hashes == None
+    if outer:
+        hashes = {}
+    try:
+        stack = []
+        x = Call(f, op, *args)
+        while True:
+            if type(x) is Call:
+                if x.op in leafOps and isLeaf(x.f):
+                    r = x.f
+                else:
+                    t = hashes if x.op == "hash" else memoTable(x.op) if len(x.args) == 0 else None
+                    e = None if t == None else t.get(id(x.f))
+                    if e == None:
+                        g = getattr(x.f, x.op + "Steps")(*x.args)
+                        stack.append((x.f, t, g, x.op))
+                        x = next(g)
+                        continue
+                    if t is not hashes:
+                        t[id(x.f)] = t.pop(id(x.f))
+                    r = e[1]
+            elif type(x) is GeneratorType or type(x) is Each:
+                g = x if type(x) is GeneratorType else x.steps()
+                stack.append((None, None, g, None))
+                x = next(g)
+                continue
+            else:
+                g, t, s, o = stack.pop()
+                next(s, None)
+                if t is hashes:
+                    t[id(g)] = (g, x)
+                elif t != None:
+                    remember(t, o, g, x)
+                r = x
+            if len(stack) == 0:
+                return r
+            x = stack[-1][2].send(r)
+    finally:
+        if outer:
+            hashes = None
+
+def intern(f):
+    """Vrne internirani izraz istega razreda, strukturno enak izrazu f.
+    
+    Podizrazi se internirajo rekurzivno. Če strukturno enak izraz istega
+    razreda še ni interniran, se kot predstavnik uporabi kar f.
+    
+    Argument:
+    f -- logični izraz
+    """
+    if f._hash != None:
+        return f
+    if isinstance(f, Not):
+        f.t = intern(f.t)
+    elif isinstance(f, And) or isinstance(f, Or):
+        f.l = [intern(x) for x in f.l]
+    k = (type(f), f.key(id))
+    g = internTable.get(k)
+    if g != None:
+        return g
+    f._hash = hash(f.key(hash))
+    internTable[k] = f
+    return f
+
+def internedNew(cls, *args):
+    """Konstruira izraz razreda cls in vrne njegov internirani predstavnik.
+    
+    Ko je interniranje vklopljeno, je to metoda __new__ razreda
+    LogicalFormula. Python vrnjeni izraz nato še enkrat inicializira, zato
+    konstruktorji interniranih izrazov ne spreminjajo.
+    
+    Argumenta:
+    cls  -- razred izraza
+    args -- argumenti konstruktorja
+    """
+    f = object.__new__(cls)
+    f.__init__(*args)
+    return intern(f)
+
+def restore(cls, *args):
+    """Vrne neinicializiran izraz razreda cls za obnovo ob deserializaciji.
+    
+    Po izklopu interniranja je to metoda __new__ razreda LogicalFormula, saj
+    Python prvotne metode object.__new__ ne more več nastaviti.
+    
+    Argumenta:
+    cls  -- razred izraza
+    args -- argumenti konstruktorja (se ne upoštevajo)
+    """
+    return object.__new__(cls)
+
+def isInterned(f):
+    """Ugotovi, ali je f interniran logični izraz.
+    
+    Argument:
+    f -- objekt za preverjanje
+    """
+    return isinstance(f, LogicalFormula) and f._hash != None
+
+def compare(f, g):
+    """Primerja logična izraza glede na strukturno ureditev.
+    
+    Spremenljivke so manjše od negacij, te od konjunkcij, te pa od
+    disjunkcij. Spremenljivke se razvrščajo po imenu, negacije po negiranem
+    izrazu, konjunkcije in disjunkcije pa leksikografsko po seznamu
+    podizrazov. Izraza se pregledujeta z eksplicitnim skladom.
+    
+    Vrne negativno število, 0 ali pozitivno število, če je f manjši, enak
+    ali večji od g.
+    
+    Argumenta:
+    f -- logični izraz
+    g -- logični izraz
+    """
+    stack = [(f, g)]
+    while len(stack) > 0:
+        a, b = stack.pop()
+        if a is b:
+            continue
+        elif isinstance(a, int):
+            if a != b:
+                return a - b
+        elif a.order != b.order:
+            return a.order - b.order
+        elif isinstance(a, Literal):
+            if a.p != b.p:
+                return -1 if a.p < b.p else 1
+        elif isinstance(a, Not):
+            stack.append((a.t, b.t))
+        else:
+            stack.append((len(a.l), len(b.l)))
+            stack.extend(reversed(list(zip(a.l, b.l))))
+    return 0
+
+def independent(f, d):
+    """Pove, ali izraz f vsebuje spremenljivke, vendar v slovarju d ni
+    vrednosti nobene od njih.
+    
+    Množica spremenljivk izraza se izračuna šele ob ponovni aplikaciji istega
+    izraza in le, če jo že imajo vsi njegovi neposredni podizrazi; ob prvi
+    aplikaciji se izraz le označi in funkcija vrne False. Enkratna
+    aplikacija, npr. na svež izraz s skoraj polno prireditvijo, tako ne
+    plača izračuna množic, ponovljene aplikacije pa preskočijo neodvisne
+    podizraze. Shranjene množice rastejo od listov navzgor za en nivo na
+    aplikacijo, zato njihova velikost tudi pri globokih izrazih ne preseže
+    že opravljenega dela. Izrazi brez spremenljivk niso neodvisni, saj se
+    ob aplikaciji poenostavijo v logično resnico ali neresnico. Pregleda se
+    manjša od množice spremenljivk izraza in slovarja.
+    
+    Argumenta:
+    f -- negacija, konjunkcija ali disjunkcija
+    d -- slovar vrednosti spremenljivk
+    """
+    s = f._vars
+    if s == None:
+        if not f._applied:
+            f._applied = True
+            return False
+        for x in (f.l if isinstance(f, (And, Or)) else [f.t]):
+            if x._vars == None and not isinstance(x, Literal):
+                return False
+        s = f.variables()
+    if len(s) == 0:
+        return False
+    elif len(s) <= len(d):
+        for p in s:
+            if p in d:
+                return False
+        return True
+    return s.isdisjoint(d)
+
+def isLeaf(f):
+    """Ugotovi, ali je f spremenljivka ali negacija spremenljivke.
+    
+    Argument:
+    f -- logični izraz
+    """
+    return isinstance(f, Literal) or (isinstance(f, Not) and isinstance(f.t, Literal))
+
 def isLiteral(s):
     """Ugotovi, ali je s niz, ki predstavlja logično spremenljivko.
     
@@ -45,14 +540,129 @@ def nnf(f):
     """
     return f.simplify()
     
-def cnf(f):
+def cnf(f, mode=None):
     """Vrne izraz f v konjunktivni normalni obliki, torej kot konjunkcijo
     enega ali več disjunkcij spremenljivk in njihovih negacij.
     
-    Argument:
-    f -- logični izraz
+    Privzeto se uporabi distributivnost, ki lahko eksponentno poveča izraz.
+    Načina "tseitin" in "pg" uvedeta pomožne spremenljivke in vrneta
+    izraz linearne velikosti, ki je izpolnljiv natanko tedaj, ko je
+    izpolnljiv f (glej funkcijo tseitin).
+    
+    Argumenta:
+    f    -- logični izraz
+    mode -- način pretvorbe, privzeto None (distributivnost)
+    """
+    if mode == None:
+        return f.flatten().cnf()
+    elif mode == "tseitin":
+        return tseitin(f)[0]
+    elif mode == "pg":
+        return tseitin(f, True)[0]
+    else:
+        raise Exception('Unknown CNF conversion mode!')
+
+def tseitin(f, polarity=False, prefix="ts"):
+    """Vrne definicijsko konjunktivno normalno obliko izraza f in slovar
+    pomožnih spremenljivk.
+    
+    Izraz se najprej splošči v negacijsko normalno obliko. Vsaka konjunkcija
+    in disjunkcija, ki ni neposredno del korenske konjunkcije, dobi pomožno
+    spremenljivko, strukturno enaki podizrazi pa isto spremenljivko.
+    Pri Tseitinovi pretvorbi je pomožna spremenljivka ekvivalentna svojemu
+    podizrazu, pri pretvorbi Plaisteda in Greenbauma (polarity=True) pa ga
+    le implicira, kar zadošča, saj se v negacijski normalni obliki vsi
+    podizrazi pojavijo pozitivno.
+    
+    Vrne par (g, aux), kjer je g konjunkcija disjunkcij, aux pa slovar, ki
+    imenom pomožnih spremenljivk priredi pripadajoče podizraze. Imena
+    pomožnih spremenljivk se začnejo s predpono, ki se po potrebi podaljša,
+    da se ne pokrije z imeni spremenljivk v f.
+    
+    Argumenti:
+    f        -- logični izraz
+    polarity -- ali naj se uporabi pretvorba Plaisteda in Greenbauma,
+                privzeto False
+    prefix   -- predpona imen pomožnih spremenljivk, privzeto "ts"
     """
-    return f.flatten().cnf()
+    g = f.flatten()
+    names = set()
+    stack = [g]
+    while len(stack) > 0:
+        h = stack.pop()
+        if isinstance(h, Literal):
+            names.add(h.p)
+        elif isinstance(h, Not):
+            stack.append(h.t)
+        else:
+            stack.extend(h.l)
+    while any([re.match('^%s[0-9]+$' % prefix, p) for p in names]):
+        prefix += 'x'
+    
+    aux = {}
+    defs = {}
+    reps = {}
+    clauses = []
+    roots = g.l if isinstance(g, And) else [g]
+    stack = [(x, False) for x in sum([h.l if isinstance(h, Or) else [h] for h in roots], []) if not isinstance(x, Literal) and not isinstance(x, Not)]
+    while len(stack) > 0:
+        h, done = stack.pop()
+        if id(h) in reps:
+            continue
+        l = [x for x in h.l if not isinstance(x, Literal) and not isinstance(x, Not) and id(x) not in reps]
+        if not done and len(l) > 0:
+            stack.append((h, True))
+            stack.extend([(x, False) for x in l])
+            continue
+        c = [tseitinLiteral(x, reps) for x in h.l]
+        k = (isinstance(h, And), tuple(sorted(set(c))))
+        if k not in defs:
+            p = "%s%d" % (prefix, len(aux))
+            aux[p] = h
+            defs[k] = p
+            if k[0]:
+                clauses += [[(p, False), x] for x in k[1]]
+                if not polarity:
+                    clauses.append([(p, True)] + [(x, not v) for (x, v) in k[1]])
+            else:
+                clauses.append([(p, False)] + list(k[1]))
+                if not polarity:
+                    clauses += [[(p, True), (x, not v)] for (x, v) in k[1]]
+        reps[id(h)] = (defs[k], True)
+    
+    for h in roots:
+        if isinstance(h, Or):
+            clauses.append(sortSet(set([tseitinLiteral(x, reps) for x in h.l])))
+        else:
+            clauses.append([tseitinLiteral(h, reps)])
+    out = [Or([Literal(x) if v else Not(x) for (x, v) in c]) if len(c) != 1 else (Literal(c[0][0]) if c[0][1] else Not(c[0][0])) for c in clauses]
+    return (And(out), aux)
+
+def tseitinLiteral(f, reps):
+    """Vrne par (ime, vrednost), ki predstavlja izraz f pri definicijski
+    pretvorbi.
+    
+    Argumenta:
+    f    -- spremenljivka, negirana spremenljivka ali že obdelan izraz
+    reps -- slovar predstavnikov že obdelanih izrazov, indeksiran z id
+    """
+    if isinstance(f, Literal):
+        return (f.p, True)
+    elif isinstance(f, Not):
+        return (f.t.p, False)
+    else:
+        return reps[id(f)]
+
+def project(d, aux):
+    """Vrne prireditev d, omejeno na spremenljivke, ki niso pomožne.
+    
+    Argumenta:
+    d   -- slovar vrednosti spremenljivk ali False
+    aux -- slovar ali množica imen pomožnih spremenljivk
+    """
+    if type(d) != dict:
+        return d
+    return {k: v for (k, v) in d.items() if k not in aux}
 
 def dnf(f):
     """Vrne izraz f v disjunktivni normalni obliki, torej kot disjunkcijo
@@ -83,36 +693,99 @@ def getValues(d, root=None, p=None):
     else:
         return {k: v for (k, v) in val.items() if v != None}
             
-class LogicalFormula:
+class LogicalFormula(object):
     
     """Abstraktni razred logičnih formul.
     
+    Pretvorbe, vozlišča v DAG in množice spremenljivk so podane le s koraki,
+    tj. z metodami s pripono Steps, ki jih povozijo podrazredi; javne metode
+    jih izvedejo s funkcijo run. Zgostitev, znakovna predstavitev in
+    primerjave se izračunajo rekurzivno, ko globina izraza preseže omejitev
+    rekurzije, pa z eksplicitnim skladom (s funkcijo traverse oziroma
+    compare). Konstruktorji podrazredov interniranega izraza ne spreminjajo
+    (glej funkcijo internedNew).
+    
     Metode:
-    __init__ -- konstruktor
-    __hash__ -- zgostitev
-    __repr__ -- znakovna predstavitev
-    __eq__   -- relacija "je enak"
-    __ne__   -- relacija "ni enak"
-    __lt__   -- relacija "je manjši"
-    __le__   -- relacija "je manjši ali enak"
-    __gt__   -- relacija "je večji"
-    __ge__   -- relacija "je večji ali enak"
-    flatten  -- splošči izraz
-    simplify -- poenostavi izraz
-    cnf      -- pretvori v konjunktivno normalno obliko
-    dnf      -- pretvori v disjunktivno normalno obliko
-    ncf      -- pretvori v obliko z negacijami in konjunkcijami
-    apply    -- vrne izraz glede na podane vrednosti spremenljivk
-    node     -- vrne vozlišče v DAG, ki ustreza izrazu
+    __init__       -- konstruktor
+    __hash__       -- zgostitev
+    __getstate__   -- stanje za serializacijo
+    __reduce_ex__  -- navodila za serializacijo
+    __repr__       -- znakovna predstavitev
+    __eq__         -- relacija "je enak"
+    __ne__         -- relacija "ni enak"
+    __lt__         -- relacija "je manjši"
+    __le__         -- relacija "je manjši ali enak"
+    __gt__         -- relacija "je večji"
+    __ge__         -- relacija "je večji ali enak"
+    key            -- strukturni opis izraza
+    flatten        -- splošči izraz
+    simplify       -- poenostavi izraz
+    cnf            -- pretvori v konjunktivno normalno obliko
+    dnf            -- pretvori v disjunktivno normalno obliko
+    ncf            -- pretvori v obliko z negacijami in konjunkcijami
+    apply          -- vrne izraz glede na podane vrednosti spremenljivk
+    node           -- vrne vozlišče v DAG, ki ustreza izrazu
+    variables      -- vrne množico imen spremenljivk v izrazu
+    hashSteps      -- koraki izračuna zgostitve
+    reprSteps      -- koraki izračuna znakovne predstavitve
+    flattenSteps   -- koraki sploščenja
+    simplifySteps  -- koraki poenostavitve
+    cnfSteps       -- koraki pretvorbe v konjunktivno normalno obliko
+    dnfSteps       -- koraki pretvorbe v disjunktivno normalno obliko
+    ncfSteps       -- koraki pretvorbe v obliko z negacijami in konjunkcijami
+    applySteps     -- koraki aplikacije vrednosti spremenljivk
+    nodeSteps      -- koraki izdelave vozlišča v DAG
+    variablesSteps -- koraki izračuna množice spremenljivk
+    
+    Spremenljivke:
+    _hash    -- zgostitev interniranega izraza ali None
+    _vars    -- shranjena množica imen spremenljivk v izrazu ali None
+    _applied -- ali je bil izraz že apliciran (glej funkcijo independent)
+    order    -- mesto razreda v strukturni ureditvi (glej funkcijo compare)
     """
     
+    _hash = None
+    _vars = None
+    _applied = False
+    order = None
+    
     def __init__(self):
         """Konstruktor. Na abstraktnem razredu ga ne smemo klicati."""
         raise Exception('Instantiating an abstract class.')
         
     def __hash__(self):
-        """Zgostitev. Vrne zgostitev znakovne predstavitve."""
-        return self.__repr__().__hash__()
+        """Zgostitev.
+        
+        Interniran izraz vrne zgostitev, izračunano ob konstrukciji, sicer pa
+        se izračuna zgostitev strukturnega opisa izraza.
+        """
+        if self._hash != None:
+            return self._hash
+        elif hashes != None:
+            return traverse(self, "hash")
+        try:
+            return hash(self.key(hash))
+        except RecursionError:
+            return traverse(self, "hash")
+        
+    def __getstate__(self):
+        """Stanje za serializacijo. Oznaka interniranosti, shranjena
+        množica spremenljivk in oznaka aplikacije se ne prenašajo.
+        """
+        s = self.__dict__.copy()
+        s.pop('_hash', None)
+        s.pop('_vars', None)
+        s.pop('_applied', None)
+        return s
+        
+    def __reduce_ex__(self, protocol):
+        """Navodila za serializacijo. Izraz se obnovi brez klica konstruktorja
+        (glej funkcijo restore), zato obnovljeni izraz ni interniran.
+        
+        Argument:
+        protocol -- različica protokola serializacije
+        """
+        return (restore, (type(self),), self.__getstate__())
         
     def __repr__(self, level=0):
         """Znakovna predstavitev.
@@ -136,14 +809,14 @@ class LogicalFormula:
         Podrazredi morajo povoziti to metodo.
         """
         return True
-    
+        
     def __lt__(self, other):
         """Relacija "je manjši".
         
         Podrazredi morajo povoziti to metodo.
         """
         return True
-    
+        
     def __le__(self, other):
         """Relacija "je manjši ali enak".
         
@@ -165,53 +838,134 @@ class LogicalFormula:
         """
         return not (self < other)
         
+    def key(self, f):
+        """Strukturni opis izraza.
+        
+        Strukturno enaka izraza imata enak opis, če funkcija f strukturno
+        enakim podizrazom priredi enake vrednosti.
+        
+        Podrazredi morajo povoziti to metodo.
+        
+        Argument:
+        f -- funkcija, ki se uporabi na neposrednih podizrazih
+        """
+        return (LogicalFormula, )
+        
     def flatten(self):
-        """Splošči izraz.
+        """Splošči izraz (glej metodo flattenSteps)."""
+        return run(self, "flatten")
+        
+    def simplify(self):
+        """Poenostavi izraz (glej metodo simplifySteps)."""
+        return run(self, "simplify")
+        
+    def cnf(self):
+        """Pretvori v konjunktivno normalno obliko (glej metodo cnfSteps)."""
+        return run(self, "cnf")
+        
+    def dnf(self):
+        """Pretvori v disjunktivno normalno obliko (glej metodo dnfSteps)."""
+        return run(self, "dnf")
+        
+    def ncf(self):
+        """Pretvori v obliko z negacijami in konjunkcijami (glej metodo
+        ncfSteps)."""
+        return run(self, "ncf")
+        
+    def apply(self, d):
+        """Vrne izraz glede na podane vrednosti spremenljivk (glej metodo
+        applySteps).
+        
+        Argument:
+        d -- slovar vrednosti spremenljivk
+        """
+        return run(self, "apply", d)
+        
+    def node(self, d):
+        """Vrne vozlišče v DAG, ki ustreza izrazu (glej metodo nodeSteps).
+        
+        Argument:
+        d -- slovar vozlišč za izraze
+        """
+        return run(self, "node", d)
+        
+    def variables(self):
+        """Vrne množico imen spremenljivk v izrazu (glej metodo
+        variablesSteps). Množica se shrani v izraz."""
+        if self._vars == None:
+            self._vars = run(self, "variables")
+        return self._vars
+        
+    def hashSteps(self):
+        """Koraki izračuna zgostitve (glej metodo __hash__).
+        
+        Vrne zgostitev strukturnega opisa izraza, v katerem so neposredni
+        podizrazi nadomeščeni z njihovimi zgostitvami.
+        """
+        l = []
+        self.key(l.append)
+        h = {}
+        for x in l:
+            h[id(x)] = hash(x) if isinstance(x, Literal) else (yield Call(x, "hash"))
+        yield hash(self.key(lambda x: h[id(x)]))
+        
+    def reprSteps(self, level=0):
+        """Koraki izračuna znakovne predstavitve.
+        
+        Generična metoda, vrne prazen niz.
+        
+        Argument:
+        level -- nivo za postavljanje oklepajev, privzeto 0
+        """
+        yield ""
+        
+    def flattenSteps(self):
+        """Koraki sploščenja.
         
         Generična metoda, vrne sebe.
         """
-        return self
-    
-    def simplify(self):
-        """Poenostavi izraz.
+        yield self
+        
+    def simplifySteps(self):
+        """Koraki poenostavitve.
         
         Generična metoda, vrne sebe.
         """
-        return self
+        yield self
         
-    def cnf(self):
-        """Pretvori v konjunktivno normalno obliko.
+    def cnfSteps(self):
+        """Koraki pretvorbe v konjunktivno normalno obliko.
         
         Generična metoda, vrne sebe.
         """
-        return self
-    
-    def dnf(self):
-        """Pretvori v disjunktivno normalno obliko.
+        yield self
+        
+    def dnfSteps(self):
+        """Koraki pretvorbe v disjunktivno normalno obliko.
         
         Generična metoda, vrne sebe.
         """
-        return self
+        yield self
         
-    def ncf(self):
-        """Pretvori v obliko z negacijami in konjunkcijami.
+    def ncfSteps(self):
+        """Koraki pretvorbe v obliko z negacijami in konjunkcijami.
         
         Generična metoda, vrne sebe.
         """
-        return self
+        yield self
         
-    def apply(self, d):
-        """Vrne izraz glede na podane vrednosti spremenljivk.
+    def applySteps(self, d):
+        """Koraki aplikacije vrednosti spremenljivk.
         
         Generična metoda, vrne sebe.
         
         Argument:
         d -- slovar vrednosti spremenljivk
         """
-        return self
-    
-    def node(self, d):
-        """Vrne vozlišče v DAG, ki ustreza izrazu.
+        yield self
+        
+    def nodeSteps(self, d):
+        """Koraki izdelave vozlišča v DAG.
         
         Generična metoda, javi napako.
         
@@ -219,6 +973,14 @@ class LogicalFormula:
         d -- slovar vozlišč za izraze
         """
         raise Exception('Not applicable in DAG.')
+        
+    def variablesSteps(self):
+        """Koraki izračuna množice spremenljivk.
+        
+        Generična metoda, vrne prazno množico.
+        """
+        self._vars = frozenset()
+        yield self._vars
 
 class Literal(LogicalFormula):
     
@@ -230,6 +992,8 @@ class Literal(LogicalFormula):
     p -- ime spremenljivke
     """
     
+    order = 0
+    
     def __init__(self, p):
         """Konstruktor. Nastavi se ime spremenljivke, ki mora biti niz malih
         črk.
@@ -237,19 +1001,25 @@ class Literal(LogicalFormula):
         Argument:
         p -- ime spremenljivke
         """
+        if self._hash != None:
+            return
         if not isLiteral(p):
             raise Exception('Literals must be strings of lowercase letters!')
         self.p = p
         
-    def __repr__(self, level=0):
-        """Znakovna predstavitev. Ta je enaka imenu spremenljivke."""
-        return paren(self.p, level, 6)
+    def __hash__(self):
+        """Zgostitev. Izračuna se neposredno iz strukturnega opisa."""
+        if self._hash != None:
+            return self._hash
+        return hash(self.key(hash))
         
     def __ne__(self, other):
         """Relacija "ni enak".
         
         Spremenljivke se razlikujejo po svojem imenu.
         """
+        if self._hash != None and type(other) == type(self) and other._hash != None:
+            return self is not other
         return not isinstance(other, Literal) or self.p != other.p
         
     def __lt__(self, other):
@@ -262,26 +1032,49 @@ class Literal(LogicalFormula):
             return self.p < other.p
         else:
             return isinstance(other, LogicalFormula)
-                        
-    def apply(self, d):
-        """Vrne izraz glede na podane vrednosti spremenljivk.
-
+            
+    def key(self, f):
+        """Strukturni opis izraza. Vsebuje ime spremenljivke."""
+        return (Literal, self.p)
+        
+    def __repr__(self, level=0):
+        """Znakovna predstavitev. Ta je enaka imenu spremenljivke."""
+        return paren(self.p, level, 6)
+        
+    def reprSteps(self, level=0):
+        """Koraki izračuna znakovne predstavitve (glej metodo __repr__).
+        
+        Argument:
+        level -- nivo za postavljanje oklepajev, privzeto 0
+        """
+        yield paren(self.p, level, 6)
+        
+    def applySteps(self, d):
+        """Koraki aplikacije vrednosti spremenljivk.
+        
         Nadomesti spremenljivko z vrednostjo iz slovarja, če ta obstaja.
         
         Argument:
         d -- slovar vrednosti spremenljivk
         """
+        r = self
         if self.p in d:
             if isLiteral(d[self.p]):
-                return Literal(d[self.p])
+                r = Literal(d[self.p])
             elif isinstance(d[self.p], bool):
-                return Tru() if d[self.p] else Fls()
+                r = Tru() if d[self.p] else Fls()
             elif isinstance(d[self.p], LogicalFormula):
-                return d[self.p].flatten()
-        return self
+                r = yield Call(d[self.p], "flatten")
+        yield r
         
-    def node(self, d):
-        """Vrne vozlišče v DAG, ki ustreza izrazu.
+    def variablesSteps(self):
+        """Koraki izračuna množice spremenljivk. Vrne množico z imenom
+        spremenljivke."""
+        self._vars = frozenset([self.p])
+        yield self._vars
+        
+    def nodeSteps(self, d):
+        """Koraki izdelave vozlišča v DAG.
         
         Če izraza še ni v slovarju d, naredi novo vozlišče in ga doda v slovar.
         
@@ -291,7 +1084,7 @@ class Literal(LogicalFormula):
         if self not in d:
             n = polynomial.DAGLiteral(d, self.p)
             d[self] = n
-        return d[self]
+        yield d[self]
 
 class Not(LogicalFormula):
     
@@ -303,6 +1096,8 @@ class Not(LogicalFormula):
     t -- negirani izraz
     """
     
+    order = 1
+    
     def __init__(self, t):
         """Konstruktor. Nastavi se negirani izraz.
         
@@ -311,6 +1106,8 @@ class Not(LogicalFormula):
         Argument:
         t -- negirani izraz
         """
+        if self._hash != None:
+            return
         if isLiteral(t):
             t = Literal(t)
         elif not isinstance(t, LogicalFormula):
@@ -319,14 +1116,22 @@ class Not(LogicalFormula):
         
     def __repr__(self, level=0):
         """Znakovna predstavitev. Negacija se označi z znakom ~."""
-        return paren('~'+self.t.__repr__(6), level, 6)
-    
+        try:
+            return paren('~'+self.t.__repr__(6), level, 6)
+        except RecursionError:
+            return traverse(self, "repr", level)
+        
     def __ne__(self, other):
         """Relacija "ni enak".
         
         Negacije se ločijo po negiranem izrazu.
         """
-        return not isinstance(other, Not) or self.t != other.t
+        if self._hash != None and type(other) == type(self) and other._hash != None:
+            return self is not other
+        try:
+            return not isinstance(other, Not) or self.t != other.t
+        except RecursionError:
+            return compare(self, other) != 0
         
     def __lt__(self, other):
         """Relacija "je manjši".
@@ -335,63 +1140,101 @@ class Not(LogicalFormula):
         logičnih izrazov, razen spremenljivk.
         """
         if isinstance(other, Not):
-            return self.t < other.t
+            try:
+                return self.t < other.t
+            except RecursionError:
+                return compare(self, other) < 0
         else:
             return isinstance(other, LogicalFormula) and not isinstance(other, Literal)
             
-    def flatten(self):
-        """Splošči izraz.
+    def key(self, f):
+        """Strukturni opis izraza. Vsebuje opis negiranega izraza.
+        
+        Argument:
+        f -- funkcija, ki se uporabi na negiranem izrazu
+        """
+        return (Not, f(self.t))
+        
+    def reprSteps(self, level=0):
+        """Koraki izračuna znakovne predstavitve (glej metodo __repr__).
+        
+        Argument:
+        level -- nivo za postavljanje oklepajev, privzeto 0
+        """
+        s = yield Call(self.t, "repr", 6)
+        yield paren('~'+s, level, 6)
+        
+    def flattenSteps(self):
+        """Koraki sploščenja.
         
         Izniči dvojne negacije in splošči podizraze."""
         if isinstance(self.t, Not):
-            return self.t.t.flatten()
+            r = yield Call(self.t.t, "flatten")
         elif isinstance(self.t, And):
-            return Or([Not(x) for x in self.t.l]).flatten()
+            r = yield Call(Or([Not(x) for x in self.t.l]), "flatten")
         elif isinstance(self.t, Or):
-            return And([Not(x) for x in self.t.l]).flatten()
+            r = yield Call(And([Not(x) for x in self.t.l]), "flatten")
         else:
-            return self
-
-    def simplify(self):
-        """Poenostavi izraz.
+            r = self
+        yield r
+        
+    def simplifySteps(self):
+        """Koraki poenostavitve.
         
         Izniči dvojno negacijo ter porine negacijo v konjunkcijo ali
         disjunkcijo po de Morganovih zakonih.
         """
         if isinstance(self.t, Not):
-            return self.t.t.simplify()
+            r = yield Call(self.t.t, "simplify")
         elif isinstance(self.t, And):
-            return Or([Not(x) for x in self.t.l]).simplify()
+            r = yield Call(Or([Not(x) for x in self.t.l]), "simplify")
         elif isinstance(self.t, Or):
-            return And([Not(x) for x in self.t.l]).simplify()
+            r = yield Call(And([Not(x) for x in self.t.l]), "simplify")
         else:
-            return self
-            
-    def ncf(self):
-        """Pretvori v obliko z negacijami in konjunkcijami.
+            r = self
+        yield r
+        
+    def ncfSteps(self):
+        """Koraki pretvorbe v obliko z negacijami in konjunkcijami.
         
         Izniči dvojno negacijo ter porine negacijo v  disjunkcijo po
         de Morganovih zakonih.
         """
         if isinstance(self.t, Not):
-            return self.t.t.ncf()
+            r = yield Call(self.t.t, "ncf")
         elif isinstance(self.t, Or):
-            return And([Not(x).ncf() for x in self.t.l])
+            r = And((yield Each([Not(x) for x in self.t.l], "ncf")))
         else:
-            return Not(self.t.ncf())
-            
-    def apply(self, d):
-        """Vrne izraz glede na podane vrednosti spremenljivk.
-
-        Aplikacijo naredi na negiranem izrazu, nato pa izvede poenostavitev.
+            r = Not((yield Call(self.t, "ncf")))
+        yield r
+        
+    def applySteps(self, d):
+        """Koraki aplikacije vrednosti spremenljivk.
+        
+        Če je izraz neodvisen od vrednosti v slovarju (glej funkcijo
+        independent), vrne njegovo sploščitev. Sicer aplikacijo naredi na
+        negiranem izrazu, nato pa izvede poenostavitev.
         
         Argument:
         d -- slovar vrednosti spremenljivk
         """
-        return Not(self.t.apply(d)).flatten()
+        if independent(self, d):
+            r = yield Call(self, "flatten")
+        else:
+            t = yield Call(self.t, "apply", d)
+            r = yield Call(Not(t), "flatten")
+        yield r
         
-    def node(self, d):
-        """Vrne vozlišče v DAG, ki ustreza izrazu.
+    def variablesSteps(self):
+        """Koraki izračuna množice spremenljivk. Vrne množico spremenljivk
+        negiranega izraza."""
+        if self._vars == None:
+            t = self.t
+            self._vars = t._vars if t._vars != None else (yield Call(t, "variables"))
+        yield self._vars
+        
+    def nodeSteps(self, d):
+        """Koraki izdelave vozlišča v DAG.
         
         Če izraza še ni v slovarju d, naredi novo vozlišče in ga doda v slovar.
         
@@ -399,10 +1242,11 @@ class Not(LogicalFormula):
         d -- slovar vozlišč za izraze
         """
         if self not in d:
+            yield Call(self.t, "node", d)
             n = polynomial.DAGNot(d, self.t)
             d[self] = n
-        return d[self]
-    
+        yield d[self]
+
 class And(LogicalFormula):
     
     """Logična konjunkcija.
@@ -413,6 +1257,8 @@ class And(LogicalFormula):
     l -- seznam konjunktov
     """
     
+    order = 2
+    
     def __init__(self, *l):
         """Konstruktor. Nastavijo se konjunkti.
         
@@ -423,6 +1269,8 @@ class And(LogicalFormula):
         Argumenti:
         *l -- konjunkti
         """
+        if self._hash != None:
+            return
         self.l = None
         if len(l) == 1:
             if isinstance(l[0], Or):
@@ -436,23 +1284,31 @@ class And(LogicalFormula):
             if any([not isinstance(x, LogicalFormula) for x in l]):
                  raise Exception('Only logical formulas can be conjoined!')
             self.l = l[:]
-        
+            
     def __repr__(self, level=0):
         """Znakovna predstavitev. Konjunkti so ločeni z znakoma /\. Prazna
         konjunkcija je logična resnica in se označi z znakom T."""
-        if len(self.l) == 0:
-            return paren('T', level, 6)
-        elif len(self.l) == 1:
-            return self.l[0].__repr__(level)
-        else:
-            return paren(' /\\ '.join([x.__repr__(6) for x in self.l]), level, 5)
-    
+        try:
+            if len(self.l) == 0:
+                return paren('T', level, 6)
+            elif len(self.l) == 1:
+                return self.l[0].__repr__(level)
+            else:
+                return paren(' /\\ '.join([x.__repr__(6) for x in self.l]), level, 5)
+        except RecursionError:
+            return traverse(self, "repr", level)
+            
     def __ne__(self, other):
         """Relacija "ni enak".
         
         Konjukcije se ločijo po seznamu konjunktov.
         """
-        return not isinstance(other, And) or self.l != other.l
+        if self._hash != None and type(other) == type(self) and other._hash != None:
+            return self is not other
+        try:
+            return not isinstance(other, And) or self.l != other.l
+        except RecursionError:
+            return compare(self, other) != 0
         
     def __lt__(self, other):
         """Relacija "je manjši".
@@ -461,25 +1317,69 @@ class And(LogicalFormula):
         disjunkcij.
         """
         if isinstance(other, And):
-            return self.l < other.l
+            try:
+                return self.l < other.l
+            except RecursionError:
+                return compare(self, other) < 0
         else:
             return isinstance(other, LogicalFormula) and not isinstance(other, Literal) and not isinstance(other, Not)
             
-    def flatten(self):
-        """Splošči izraz."""
+    def key(self, f):
+        """Strukturni opis izraza. Vsebuje opise konjunktov.
+        
+        Argument:
+        f -- funkcija, ki se uporabi na konjunktih
+        """
+        return (And, tuple([f(x) for x in self.l]))
+        
+    def reprSteps(self, level=0):
+        """Koraki izračuna znakovne predstavitve (glej metodo __repr__).
+        
+        Argument:
+        level -- nivo za postavljanje oklepajev, privzeto 0
+        """
+        if len(self.l) == 0:
+            r = paren('T', level, 6)
+        elif len(self.l) == 1:
+            r = yield Call(self.l[0], "repr", level)
+        else:
+            r = paren(' /\\ '.join((yield Each(self.l, "repr", 6))), level, 5)
+        yield r
+        
+    def flattenSteps(self):
+        """Koraki sploščenja.
+        
+        Gnezdene konjunkcije se razgradijo neposredno, tako da se vsak člen
+        prepiše le enkrat in je sploščenje globoko gnezdenih konjunkcij
+        linearno.
+        """
         if len(self.l) == 1:
-            return self.l[0].flatten()
+            r = yield Call(self.l[0], "flatten")
         else:
-            l = sum([y.l if isinstance(y, And) else [y] for y in [x.flatten() for x in self.l]], [])
+            l = []
+            stack = list(reversed(self.l))
+            while len(stack) > 0:
+                x = stack.pop()
+                if isinstance(x, And):
+                    stack.extend(reversed(x.l))
+                elif isLeaf(x):
+                    l.append(x)
+                else:
+                    x = yield Call(x, "flatten")
+                    if isinstance(x, And):
+                        l.extend(x.l)
+                    else:
+                        l.append(x)
             if any([isinstance(x, Or) and len(x.l) == 0 for x in l]):
-                return Fls()
+                r = Fls()
             elif len(l) == 1:
-                return l[0]
+                r = l[0]
             else:
-                return And(l)
+                r = And(l)
+        yield r
         
-    def simplify(self):
-        """Poenostavi izraz.
+    def simplifySteps(self):
+        """Koraki poenostavitve.
         
         Najprej splošči gnezdene konjunkcije med poenostavljenimi konjunkti.
         Če je konjunkt natanko eden, ga vrne, sicer pa poenostavi disjunkcije
@@ -488,33 +1388,42 @@ class And(LogicalFormula):
         kateri od konjunktov pojavi še v negirani obliki, potem vrne logično
         neresnico. V nasprotnem primeru se konjunkti uredijo po določenem
         vrstnem redu.
+        
+        Konjunkcija, ki jo sestavljajo le spremenljivke, njihove negacije in
+        gnezdene konjunkcije, se poenostavi v enem prehodu, saj je rezultat
+        odvisen le od množice teh spremenljivk in negacij.
         """
-        l = sum([y.l if isinstance(y, And) else [y] for y in [x.simplify() for x in self.l]], [])
+        l = leaves(self, And)
+        if l == None:
+            l = sum([y.l if isinstance(y, And) else [y] for y in (yield Each(self.l, "simplify"))], [])
         if len(l) == 1:
-            return l[0]
+            r = l[0]
         else:
             l = set(l)
             l.difference_update([x for x in l if isinstance(x, Or) and any([y in x.l for y in l])])
             assorb = [(x, [y.t for y in l if isinstance(y, Not) and y.t in x.l] + [Not(y) for y in l if Not(y) in x.l]) for x in l if isinstance(x, Or)]
             remove = [x[0] for x in assorb if len(x[1]) > 0]
-            add = [Or([y for y in x[0].l if y not in x[1]]).simplify() for x in assorb if len(x[1]) > 0]
+            add = yield Each([Or([y for y in x[0].l if y not in x[1]]) for x in assorb if len(x[1]) > 0], "simplify")
             l.difference_update(remove)
             l.update(add)
             if len(l) == 1:
-                return l.pop()
-            if any([isinstance(x, Or) and len(x.l) == 0 for x in l]) or any([x.t in l for x in l if isinstance(x, Not)]):
-                return Fls()
-            return And(sortSet(l))
+                r = l.pop()
+            elif any([isinstance(x, Or) and len(x.l) == 0 for x in l]) or any([x.t in l for x in l if isinstance(x, Not)]):
+                r = Fls()
+            else:
+                r = And(sortSet(l))
+        yield r
         
-    def cnf(self):
-        """Pretvori v konjunktivno normalno obliko.
+    def cnfSteps(self):
+        """Koraki pretvorbe v konjunktivno normalno obliko.
         
         Vse konjunkte pretvori v konjunktivno normalno obliko.
         """
-        return And([x.cnf() for x in self.l]).flatten()
+        r = yield Call(And((yield Each(self.l, "cnf"))), "flatten")
+        yield r
         
-    def dnf(self):
-        """Pretvori v disjunktivno normalno obliko.
+    def dnfSteps(self):
+        """Koraki pretvorbe v disjunktivno normalno obliko.
         
         Če je število konjunktov 0 ali 1, vrne sebe oziroma edinega konjunkta v
         disjunktivni normalni obliki. Sicer pretvori vse konjunkte v
@@ -522,36 +1431,63 @@ class And(LogicalFormula):
         naredi disjunkcijo več konjunktov.
         """
         if len(self.l) == 0:
-            return self
+            r = self
         elif len(self.l) == 1:
-            return self.l[0].dnf()
-        l = [x.dnf() for x in self.flatten().l]
-        a = [x for x in l if not isinstance(x, Or)]
-        d = [x for x in l if isinstance(x, Or)]
-        if len(d) == 0:
-            return And(a)
+            r = yield Call(self.l[0], "dnf")
         else:
-            return Or([And(a + [x] + d[1:]).dnf() for x in d[0].l]).flatten()
-            
-    def ncf(self):
-        """Pretvori v obliko z negacijami in konjunkcijami.
+            l = yield Each((yield Call(self, "flatten")).l, "dnf")
+            a = [x for x in l if not isinstance(x, Or)]
+            d = [x for x in l if isinstance(x, Or)]
+            if len(d) == 0:
+                r = And(a)
+            else:
+                r = yield Call(Or((yield Each([And(a + [x] + d[1:]) for x in d[0].l], "dnf"))), "flatten")
+        yield r
+        
+    def ncfSteps(self):
+        """Koraki pretvorbe v obliko z negacijami in konjunkcijami.
         
         Vse konjunkte pretvori v obliko z negacijami in konjunkcijami.
         """
-        return And([x.ncf() for x in self.l])
-            
-    def apply(self, d):
-        """Vrne izraz glede na podane vrednosti spremenljivk.
-
-        Aplikacijo naredi na vsakem konjunktu, nato pa izvede poenostavitev.
+        yield And((yield Each(self.l, "ncf")))
+        
+    def applySteps(self, d):
+        """Koraki aplikacije vrednosti spremenljivk.
+        
+        Če je izraz neodvisen od vrednosti v slovarju (glej funkcijo
+        independent), vrne njegovo sploščitev. Sicer aplikacijo naredi na
+        konjunktih po vrsti in vrne Fls, takoj ko je kateri od njih
+        neresničen. Rezultati aplikacije so že sploščeni, zato se pri
+        sestavljanju konjunkcije le razgradijo gnezdene konjunkcije.
         
         Argument:
         d -- slovar vrednosti spremenljivk
         """
-        return And([x.apply(d) for x in self.l]).flatten()
+        if independent(self, d):
+            r = yield Call(self, "flatten")
+        else:
+            l = []
+            for x in self.l:
+                x = yield Call(x, "apply", d)
+                if isinstance(x, Or) and len(x.l) == 0:
+                    r = Fls()
+                    break
+                elif isinstance(x, And):
+                    l.extend(x.l)
+                else:
+                    l.append(x)
+            else:
+                r = l[0] if len(l) == 1 else And(l)
+        yield r
         
-    def node(self, d):
-        """Vrne vozlišče v DAG, ki ustreza izrazu.
+    def variablesSteps(self):
+        """Koraki izračuna množice spremenljivk. Vrne unijo množic
+        spremenljivk konjunktov."""
+        r = yield union(self)
+        yield r
+        
+    def nodeSteps(self, d):
+        """Koraki izdelave vozlišča v DAG.
         
         Če izraza še ni v slovarju d, naredi novo vozlišče in ga doda v slovar.
         
@@ -559,11 +1495,12 @@ class And(LogicalFormula):
         d -- slovar vozlišč za izraze
         """
         if self not in d:
+            yield Each(self.l, "node", d)
             n = polynomial.DAGAnd(d, self.l)
             d[self] = n
-        return d[self]
-        
-        
+        yield d[self]
+
+
 class Or(LogicalFormula):
     
     """Logična disjunkcija.
@@ -574,6 +1511,8 @@ class Or(LogicalFormula):
     l -- seznam disjunktov
     """
     
+    order = 3
+    
     def __init__(self, *l):
         """Konstruktor. Nastavijo se disjunkti.
         
@@ -584,6 +1523,8 @@ class Or(LogicalFormula):
         Argumenti:
         *l -- disjunkti
         """
+        if self._hash != None:
+            return
         self.l = None
         if len(l) == 1:
             if isinstance(l[0], Or):
@@ -597,23 +1538,31 @@ class Or(LogicalFormula):
             if any([not isinstance(x, LogicalFormula) for x in l]):
                  raise Exception('Only logical formulas can be disjoined!')
             self.l = l[:]
-        
+            
     def __repr__(self, level=0):
         """Znakovna predstavitev. Disjunkti so ločeni z znakoma \/. Prazna
         disjunkcija je logična neresnica in se označi z znakom F."""
-        if len(self.l) == 0:
-            return paren('F', level, 6)
-        elif len(self.l) == 1:
-            return self.l[0].__repr__(level)
-        else:
-            return paren(' \\/ '.join([x.__repr__(5) for x in self.l]), level, 4)
-        
+        try:
+            if len(self.l) == 0:
+                return paren('F', level, 6)
+            elif len(self.l) == 1:
+                return self.l[0].__repr__(level)
+            else:
+                return paren(' \\/ '.join([x.__repr__(5) for x in self.l]), level, 4)
+        except RecursionError:
+            return traverse(self, "repr", level)
+            
     def __ne__(self, other):
         """Relacija "ni enak".
         
         Disjukcije se ločijo po seznamu disjunktov.
         """
-        return not isinstance(other, Or) or self.l != other.l
+        if self._hash != None and type(other) == type(self) and other._hash != None:
+            return self is not other
+        try:
+            return not isinstance(other, Or) or self.l != other.l
+        except RecursionError:
+            return compare(self, other) != 0
         
     def __lt__(self, other):
         """Relacija "je manjši".
@@ -621,23 +1570,67 @@ class Or(LogicalFormula):
         Disjukcije se razvrščajo po seznamu konjunktov in so večje od ostalih
         logičnih izrazov.
         """
-        return isinstance(other, Or) and self.l < other.l
+        try:
+            return isinstance(other, Or) and self.l < other.l
+        except RecursionError:
+            return compare(self, other) < 0
         
-    def flatten(self):
-        """Splošči izraz."""
+    def key(self, f):
+        """Strukturni opis izraza. Vsebuje opise disjunktov.
+        
+        Argument:
+        f -- funkcija, ki se uporabi na disjunktih
+        """
+        return (Or, tuple([f(x) for x in self.l]))
+        
+    def reprSteps(self, level=0):
+        """Koraki izračuna znakovne predstavitve (glej metodo __repr__).
+        
+        Argument:
+        level -- nivo za postavljanje oklepajev, privzeto 0
+        """
+        if len(self.l) == 0:
+            r = paren('F', level, 6)
+        elif len(self.l) == 1:
+            r = yield Call(self.l[0], "repr", level)
+        else:
+            r = paren(' \\/ '.join((yield Each(self.l, "repr", 5))), level, 4)
+        yield r
+        
+    def flattenSteps(self):
+        """Koraki sploščenja.
+        
+        Gnezdene disjunkcije se razgradijo neposredno, tako da se vsak člen
+        prepiše le enkrat in je sploščenje globoko gnezdenih disjunkcij
+        linearno.
+        """
         if len(self.l) == 1:
-            return self.l[0].flatten()
+            r = yield Call(self.l[0], "flatten")
         else:
-            l = sum([y.l if isinstance(y, Or) else [y] for y in [x.flatten() for x in self.l]], [])
+            l = []
+            stack = list(reversed(self.l))
+            while len(stack) > 0:
+                x = stack.pop()
+                if isinstance(x, Or):
+                    stack.extend(reversed(x.l))
+                elif isLeaf(x):
+                    l.append(x)
+                else:
+                    x = yield Call(x, "flatten")
+                    if isinstance(x, Or):
+                        l.extend(x.l)
+                    else:
+                        l.append(x)
             if any([isinstance(x, And) and len(x.l) == 0 for x in l]):
-                return Tru()
+                r = Tru()
             elif len(l) == 1:
-                return l[0]
+                r = l[0]
             else:
-                return Or(l)
+                r = Or(l)
+        yield r
         
-    def simplify(self):
-        """Poenostavi izraz.
+    def simplifySteps(self):
+        """Koraki poenostavitve.
         
         Najprej splošči gnezdene disjunkcije med poenostavljenimi disjunkti.
         Če je disjunkt natanko eden, ga vrne, sicer pa poenostavi konjunkcije
@@ -646,27 +1639,35 @@ class Or(LogicalFormula):
         kateri od disjunktov pojavi še v negirani obliki, potem vrne logično
         resnico. V nasprotnem primeru se disjunkti uredijo po določenem
         vrstnem redu.
+        
+        Disjunkcija, ki jo sestavljajo le spremenljivke, njihove negacije in
+        gnezdene disjunkcije (npr. veriga implikacij), se poenostavi v enem
+        prehodu, saj je rezultat odvisen le od množice teh spremenljivk in
+        negacij.
         """
-        l = sum([y.l if isinstance(y, Or) else [y] for y in [x.simplify() for x in self.l]], [])
+        l = leaves(self, Or)
+        if l == None:
+            l = sum([y.l if isinstance(y, Or) else [y] for y in (yield Each(self.l, "simplify"))], [])
         if len(l) == 1:
-            return l[0]
+            r = l[0]
         else:
             l = set(l)
             l.difference_update([x for x in l if isinstance(x, And) and any([y in x.l for y in l])])
             assorb = [(x, [y.t for y in l if isinstance(y, Not) and y.t in x.l] + [Not(y) for y in l if Not(y) in x.l]) for x in l if isinstance(x, And)]
             remove = [x[0] for x in assorb if len(x[1]) > 0]
-            add = [And([y for y in x[0].l if y not in x[1]]).simplify() for x in assorb if len(x[1]) > 0]
+            add = yield Each([And([y for y in x[0].l if y not in x[1]]) for x in assorb if len(x[1]) > 0], "simplify")
             l.difference_update(remove)
             l.update(add)
             if len(l) == 1:
-                return l.pop()
-            if any([isinstance(x, And) and len(x.l) == 0 for x in l]) or any([x.t in l for x in l if isinstance(x, Not)]):
-                    return Tru()
+                r = l.pop()
+            elif any([isinstance(x, And) and len(x.l) == 0 for x in l]) or any([x.t in l for x in l if isinstance(x, Not)]):
+                r = Tru()
             else:
-                return Or(sortSet(l))
+                r = Or(sortSet(l))
+        yield r
         
-    def cnf(self):
-        """Pretvori v konjunktivno normalno obliko.
+    def cnfSteps(self):
+        """Koraki pretvorbe v konjunktivno normalno obliko.
         
         Če je število disjunktov 0 ali 1, vrne sebe oziroma edinega disjunkta v
         konjunktivni normalni obliki. Sicer pretvori vse disjunkte v
@@ -674,41 +1675,69 @@ class Or(LogicalFormula):
         naredi konjunkcijo več disjunktov.
         """
         if len(self.l) == 0:
-            return self
+            r = self
         elif len(self.l) == 1:
-            return self.l[0].cnf()
-        l = [x.cnf() for x in self.flatten().l]
-        a = [x for x in l if not isinstance(x, And)]
-        d = [x for x in l if isinstance(x, And)]
-        if len(d) == 0:
-            return Or(a)
+            r = yield Call(self.l[0], "cnf")
         else:
-            return And([Or(a + [x] + d[1:]).cnf() for x in d[0].l]).flatten()
-            
-    def dnf(self):
-        """Pretvori v disjunktivno normalno obliko.
+            l = yield Each((yield Call(self, "flatten")).l, "cnf")
+            a = [x for x in l if not isinstance(x, And)]
+            d = [x for x in l if isinstance(x, And)]
+            if len(d) == 0:
+                r = Or(a)
+            else:
+                r = yield Call(And((yield Each([Or(a + [x] + d[1:]) for x in d[0].l], "cnf"))), "flatten")
+        yield r
+        
+    def dnfSteps(self):
+        """Koraki pretvorbe v disjunktivno normalno obliko.
         
         Vse disjunkte pretvori v disjunktivno normalno obliko.
         """
-        return Or([x.dnf() for x in self.l]).flatten()
+        r = yield Call(Or((yield Each(self.l, "dnf"))), "flatten")
+        yield r
         
-    def ncf(self):
-        """Pretvori v obliko z negacijami in konjunkcijami.
+    def ncfSteps(self):
+        """Koraki pretvorbe v obliko z negacijami in konjunkcijami.
         
         Negacije vseh disjunktov pretvori v obliko z negacijami in
         konjunkcijami ter vrne njihovo negirano konjunkcijo.
         """
-        return Not(And([Not(x).ncf() for x in self.l]))
+        yield Not(And((yield Each([Not(x) for x in self.l], "ncf"))))
         
-    def apply(self, d):
-        """Vrne izraz glede na podane vrednosti spremenljivk.
-
-        Aplikacijo naredi na vsakem disjunktu, nato pa izvede poenostavitev.
+    def applySteps(self, d):
+        """Koraki aplikacije vrednosti spremenljivk.
+        
+        Če je izraz neodvisen od vrednosti v slovarju (glej funkcijo
+        independent), vrne njegovo sploščitev. Sicer aplikacijo naredi na
+        disjunktih po vrsti in vrne Tru, takoj ko je kateri od njih
+        resničen. Rezultati aplikacije so že sploščeni, zato se pri
+        sestavljanju disjunkcije le razgradijo gnezdene disjunkcije.
         
         Argument:
         d -- slovar vrednosti spremenljivk
         """
-        return Or([x.apply(d) for x in self.l]).flatten()
+        if independent(self, d):
+            r = yield Call(self, "flatten")
+        else:
+            l = []
+            for x in self.l:
+                x = yield Call(x, "apply", d)
+                if isinstance(x, And) and len(x.l) == 0:
+                    r = Tru()
+                    break
+                elif isinstance(x, Or):
+                    l.extend(x.l)
+                else:
+                    l.append(x)
+            else:
+                r = l[0] if len(l) == 1 else Or(l)
+        yield r
+        
+    def variablesSteps(self):
+        """Koraki izračuna množice spremenljivk. Vrne unijo množic
+        spremenljivk disjunktov."""
+        r = yield union(self)
+        yield r
 
 class Implies(Or):
     
@@ -725,6 +1754,8 @@ class Implies(Or):
         prec -- precedens
         cons -- konsekvens
         """
+        if self._hash != None:
+            return
         if isLiteral(prec):
             prec = Literal(prec)
         if isLiteral(cons):
@@ -737,10 +1768,26 @@ class Implies(Or):
         """Znakovna predstavitev. Precedens in konsekvens sta ločena z znakoma
         =>."""
         if len(self.l) == 2 and isinstance(self.l[0], Not):
-            return paren(self.l[0].t.__repr__(2) + ' => ' + self.l[1].__repr__(1), level, 1)
+            try:
+                return paren(self.l[0].t.__repr__(2) + ' => ' + self.l[1].__repr__(1), level, 1)
+            except RecursionError:
+                return traverse(self, "repr", level)
         else:
             return Or.__repr__(self, level)
+            
+    def reprSteps(self, level=0):
+        """Koraki izračuna znakovne predstavitve (glej metodo __repr__).
         
+        Argument:
+        level -- nivo za postavljanje oklepajev, privzeto 0
+        """
+        if len(self.l) == 2 and isinstance(self.l[0], Not):
+            s = yield Call(self.l[0].t, "repr", 2)
+            r = paren(s + ' => ' + (yield Call(self.l[1], "repr", 1)), level, 1)
+        else:
+            r = yield Or.reprSteps(self, level)
+        yield r
+
 class Tru(And):
     
     """Logična resnica, predstavljena kot prazna konjunkcija.
@@ -750,6 +1797,8 @@ class Tru(And):
     
     def __init__(self):
         """Konstruktor. Nastavi se prazen seznam konjunktov."""
+        if self._hash != None:
+            return
         self.l = []
 
 class Fls(Or):
@@ -761,6 +1810,8 @@ class Fls(Or):
     
     def __init__(self):
         """Konstruktor. Nastavi se prazen seznam disjunktov."""
+        if self._hash != None:
+            return
         self.l = []
 
 def iff(p, q):
@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+
+import itertools
+import prop
+
+def randomClauses(r, n=8, m=20, sizes=(1, 1, 2, 2, 2, 3, 3)):
+    """Vrne naključen seznam stavkov s celoštevilskimi literali.
+    
+    Argumenti:
+    r     -- generator naključnih števil
+    n     -- največje število spremenljivk, privzeto 8
+    m     -- največje število stavkov, privzeto 20
+    sizes -- seznam, iz katerega se izbirajo dolžine stavkov
+    """
+    n = r.randint(1, n)
+    return [[r.choice([1, -1]) * r.randint(1, n) for i in range(r.choice(sizes))] for j in range(r.randint(1, m))]
+
+def randomFormula(r, depth=4, names=("a", "b", "c", "d", "e")):
+    """Vrne naključen logični izraz z negacijami, konjunkcijami,
+    disjunkcijami in ekvivalencami.
+    
+    Argumenti:
+    r     -- generator naključnih števil
+    depth -- največja globina izraza, privzeto 4
+    names -- imena spremenljivk
+    """
+    if depth == 0 or r.random() < 0.15:
+        p = r.choice(names)
+        return prop.Literal(p) if r.random() < 0.5 else prop.Not(p)
+    k = r.random()
+    if k < 0.35:
+        return prop.And([randomFormula(r, depth - 1, names) for i in range(r.randint(1, 4))])
+    elif k < 0.7:
+        return prop.Or([randomFormula(r, depth - 1, names) for i in range(r.randint(1, 4))])
+    elif k < 0.85:
+        return prop.Not(randomFormula(r, depth - 1, names))
+    return prop.iff(randomFormula(r, depth - 1, names), randomFormula(r, depth - 1, names))
+
+def name(k):
+    """Vrne ime spremenljivke s številko k.
+    
+    Argument:
+    k -- številka spremenljivke
+    """
+    return "x%d" % k
+
+def formula(clauses):
+    """Vrne logični izraz v konjunktivni normalni obliki za seznam stavkov.
+    
+    Argument:
+    clauses -- seznam stavkov s celoštevilskimi literali
+    """
+    return prop.And([prop.Or([prop.Literal(name(x)) if x > 0 else prop.Not(name(-x)) for x in c]) for c in clauses])
+
+def satisfies(clauses, model):
+    """Pove, ali prireditev model zadošča vsem stavkom. Spremenljivke brez
+    vrednosti veljajo za neresnične.
+    
+    Argumenta:
+    clauses -- seznam stavkov s celoštevilskimi literali
+    model   -- prireditev vrednosti v obliki slovarja
+    """
+    return all([any([model.get(name(abs(x)), False) == (x > 0) for x in c]) for c in clauses])
+
+def satisfiable(clauses):
+    """Z izčrpnim preiskovanjem pove, ali je seznam stavkov izpolnljiv.
+    
+    Argument:
+    clauses -- seznam stavkov s celoštevilskimi literali
+    """
+    n = max([abs(x) for c in clauses for x in c] + [0])
+    for v in itertools.product([False, True], repeat=n):
+        if all([any([v[abs(x)-1] == (x > 0) for x in c]) for c in clauses]):
+            return True
+    return False
@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+
+import itertools
+import random
+import unittest
+import batch
+import prop
+from common import randomFormula
+
+def value(f, d):
+    """Vrne logično vrednost izraza f pri prireditvi d vsem spremenljivkam.
+    
+    Argumenta:
+    f -- logični izraz
+    d -- slovar vrednosti spremenljivk
+    """
+    g = f.apply(d).simplify()
+    if not isinstance(g, (prop.And, prop.Or)) or len(g.l) != 0:
+        raise Exception('Not a constant!')
+    return isinstance(g, prop.And)
+
+class BatchTest(unittest.TestCase):
+
+    """Preverjanje prevedenih izrazov za hkratno vrednotenje prireditev."""
+    
+    def testPackRoundTrip(self):
+        r = random.Random(0)
+        names = ["a", "b", "c"]
+        for n in range(0, 70, 7):
+            assignments = [dict((p, r.random() < 0.5) for p in names) for i in range(n)]
+            packed = batch.pack(assignments, names)
+            for p in names:
+                self.assertEqual(batch.unpack(packed[p], n), [d[p] for d in assignments])
+                
+    def testEvaluate(self):
+        r = random.Random(1)
+        names = ("a", "b", "c", "d", "e")
+        for i in range(100):
+            f = randomFormula(r, r.randint(1, 4), names)
+            prog = batch.compileFormula(f)
+            assignments = [dict((p, r.random() < 0.5) for p in names) for j in range(20)]
+            self.assertEqual(prog.evaluate(assignments), [value(f, d) for d in assignments], f)
+            
+    def testExhaustive(self):
+        r = random.Random(2)
+        for i in range(50):
+            f = randomFormula(r, r.randint(1, 4))
+            prog = batch.compileFormula(f)
+            values, n = batch.exhaustive(prog.names)
+            out = batch.unpack(prog(values, n), n)
+            expected = [value(f, dict(zip(prog.names, reversed(v)))) for v in itertools.product([False, True], repeat=len(prog.names))]
+            self.assertEqual(out, expected, f)
+            
+    @unittest.skipIf(batch.numpy == None, "NumPy is not installed")
+    def testNumpy(self):
+        r = random.Random(3)
+        for i in range(50):
+            f = randomFormula(r, r.randint(1, 4))
+            prog = batch.compileFormula(f)
+            values, n = batch.exhaustive(prog.names)
+            arrays = dict((p, batch.numpy.array(batch.unpack(values[p], n), dtype=bool)) for p in prog.names)
+            self.assertEqual(batch.unpack(prog(arrays, n), n), batch.unpack(prog(values, n), n), f)
+            
+    def testMissingValue(self):
+        prog = batch.compileFormula(prop.And(["a", "b"]))
+        self.assertRaises(Exception, prog, {"a": 1}, 1)
+
+if __name__ == '__main__':
+    unittest.main()
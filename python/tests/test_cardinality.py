@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+
+import itertools
+import unittest
+import cardinality
+import dpll
+import prop
+
+class CardinalityTest(unittest.TestCase):
+
+    """Preverjanje kodiranj omejitev števila resničnih literalov."""
+    
+    def check(self, encode, bound, n):
+        """Preveri, da so stavki kodiranja pri vsaki prireditvi vrednosti n
+        spremenljivkam izpolnljivi natanko tedaj, ko število resničnih
+        spremenljivk ustreza omejitvi.
+        
+        Argumenti:
+        encode -- funkcija, ki seznamu imen spremenljivk priredi seznam
+                  stavkov
+        bound  -- funkcija, ki pove, ali število resničnih spremenljivk
+                  ustreza omejitvi
+        n      -- število spremenljivk
+        """
+        names = ["v%d" % i for i in range(n)]
+        clauses = encode(names)
+        for v in itertools.product([False, True], repeat=n):
+            units = [prop.Literal(p) if x else prop.Not(p) for p, x in zip(names, v)]
+            m = dpll.cdcl(prop.And(clauses + units))
+            self.assertEqual(m != False, bound(sum(v)), (encode, n, v))
+            
+    def testAtMostOne(self):
+        for e in list(cardinality.amo) + list(cardinality.amk):
+            for n in range(1, 6):
+                self.check(lambda l: cardinality.atMostOne(l, e), lambda s: s <= 1, n)
+                self.check(lambda l: cardinality.exactlyOne(l, e), lambda s: s == 1, n)
+                
+    def testAtMostK(self):
+        for e in cardinality.amk:
+            for n in range(1, 6):
+                for k in range(0, n + 1):
+                    self.check(lambda l: cardinality.atMostK(l, k, e), lambda s: s <= k, n)
+                    self.check(lambda l: cardinality.atLeastK(l, k, e), lambda s: s >= k, n)
+                    self.check(lambda l: cardinality.exactlyK(l, k, e), lambda s: s == k, n)
+                    
+    def testUnknownEncoding(self):
+        self.assertRaises(Exception, cardinality.atMostK, ["a", "b"], 1, "unknown")
+        self.assertRaises(Exception, cardinality.atMostK, ["a", "b", "c"], 2, "pairwise")
+
+if __name__ == '__main__':
+    unittest.main()
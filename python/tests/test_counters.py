@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+
+import random
+import unittest
+import counters
+import dpll
+from common import randomClauses, formula
+
+def counter(events, x):
+    """Vrne kljuko, ki šteje dogodke x v slovarju events.
+    
+    Argumenta:
+    events -- slovar števcev dogodkov
+    x      -- ime dogodka
+    """
+    def hook(*args):
+        events[x] += 1
+    return hook
+
+class CountersTest(unittest.TestCase):
+
+    """Preverjanje statistike reševanja."""
+    
+    def testCounters(self):
+        st = counters.Stats()
+        st.add("decisions")
+        st.add("decisions", 2)
+        self.assertEqual(st["decisions"], 3)
+        self.assertEqual(st["conflicts"], 0)
+        with st.phase("search"):
+            pass
+        with counters.phase(None, "search"):
+            pass
+        d = st.asDict()
+        self.assertEqual(d["decisions"], 3)
+        self.assertTrue(d["searchTime"] >= 0)
+        self.assertTrue(repr(st).startswith("Stats(decisions=3"))
+        
+    def testCreate(self):
+        st = counters.Stats()
+        self.assertTrue(counters.create(st) is st)
+        self.assertTrue(isinstance(counters.create(True), counters.Stats))
+        self.assertEqual(counters.create(None), None)
+        self.assertEqual(counters.create(False), None)
+        
+    def testEvents(self):
+        r = random.Random(0)
+        for solve in (dpll.dpll, dpll.cdcl):
+            for i in range(50):
+                st = counters.Stats()
+                events = {"decision": 0, "conflict": 0}
+                for x in events:
+                    st.on(x, counter(events, x))
+                clauses = randomClauses(r, 12, 40, (2, 3, 3))
+                m, out = solve(formula(clauses), stats=st)
+                self.assertTrue(out is st)
+                self.assertEqual(events["decision"], st["decisions"], clauses)
+                self.assertEqual(events["conflict"], st["conflicts"], clauses)
+                self.assertTrue(st.timers["parse"] >= 0)
+
+if __name__ == '__main__':
+    unittest.main()
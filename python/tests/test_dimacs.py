@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+
+import io
+import random
+import unittest
+import dimacs
+import dpll
+import prop
+from common import randomClauses, formula
+
+def clauseSet(db):
+    """Vrne množico stavkov zbirke, zapisanih z imeni spremenljivk.
+    
+    Argument:
+    db -- zbirka stavkov
+    """
+    return set([frozenset([(db.names[abs(x)], x > 0) for x in db.clause(i)]) for i in range(len(db))])
+
+class DimacsTest(unittest.TestCase):
+
+    """Preverjanje branja in pisanja formata DIMACS CNF."""
+    
+    def testRoundTrip(self):
+        r = random.Random(0)
+        for i in range(100):
+            db = dpll.ClauseDB(formula(randomClauses(r)))
+            out = io.StringIO()
+            dimacs.write(db, out)
+            back = dimacs.read(io.StringIO(out.getvalue()))
+            self.assertEqual(back.names, db.names)
+            self.assertEqual(list(back.lits), list(db.lits))
+            self.assertEqual(list(back.start), list(db.start))
+            
+    def testTseitin(self):
+        f = prop.Or([prop.And(["a", "b"]), prop.And(["c", prop.Not("a")])])
+        g, aux = prop.tseitin(f)
+        out = io.StringIO()
+        dimacs.write((g, aux), out)
+        self.assertEqual(out.getvalue().count("c aux"), len(aux))
+        self.assertEqual(clauseSet(dimacs.read(io.StringIO(out.getvalue()))), clauseSet(dpll.ClauseDB(g)))
+        
+    def testNumbers(self):
+        db = dimacs.read(io.BytesIO(b"c example\np cnf 3 2\n1 -3\n0 2\n3 0\n"))
+        self.assertEqual(db.names, [None, "x1", "x2", "x3"])
+        self.assertEqual([list(db.clause(i)) for i in range(len(db))], [[1, -3], [2, 3]])
+        
+    def testInvalidHeader(self):
+        self.assertRaises(Exception, dimacs.read, io.StringIO("p dnf 1 1\n1 0\n"))
+
+if __name__ == '__main__':
+    unittest.main()
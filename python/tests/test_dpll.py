@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+
+import itertools
+import random
+import unittest
+import dpll
+import polynomial
+import prop
+from common import randomClauses, name, formula, satisfies, satisfiable
+
+class EngineTest(unittest.TestCase):
+
+    """Preverjanje prireditev, ki jih vrnejo reševalniki."""
+    
+    def check(self, solve, count=200, seed=0, complete=True, **args):
+        """Preveri, da reševalnik na naključnih zbirkah stavkov vrne veljavno
+        prireditev oziroma False natanko pri neizpolnljivih zbirkah.
+        
+        Argumenti:
+        solve    -- funkcija reševalnika
+        count    -- število zbirk stavkov, privzeto 200
+        seed     -- seme generatorja naključnih števil, privzeto 0
+        complete -- ali reševalnik vedno da odgovor (sicer sme vrniti
+                    None), privzeto True
+        args     -- dodatni argumenti reševalnika
+        """
+        r = random.Random(seed)
+        for i in range(count):
+            clauses = randomClauses(r)
+            m = solve(formula(clauses), **args)
+            if m == None and not complete:
+                continue
+            self.assertEqual(m != False, satisfiable(clauses), (args, clauses))
+            if m != False:
+                self.assertTrue(satisfies(clauses, m), (args, clauses, m))
+    
+    def testDpll(self):
+        for h in dpll.heuristics:
+            self.check(dpll.dpll, heuristic=h)
+            self.check(dpll.dpll, heuristic=h, phase=True)
+    
+    def testCdcl(self):
+        for h in dpll.heuristics:
+            self.check(dpll.cdcl, heuristic=h)
+    
+    def testClauseDB(self):
+        self.check(lambda f: dpll.dpll(dpll.ClauseDB(f)))
+        self.check(lambda f: dpll.cdcl(dpll.ClauseDB(f)))
+        r = random.Random(3)
+        for i in range(20):
+            db = dpll.ClauseDB(formula(randomClauses(r)))
+            lits, start = db.lits.tolist(), db.start.tolist()
+            dpll.dpll(db)
+            dpll.cdcl(db)
+            self.assertEqual((db.lits.tolist(), db.start.tolist()), (lits, start))
+    
+    def testPolynomial(self):
+        self.check(polynomial.sat, complete=False)
+        self.check(polynomial.sat3, complete=False)
+    
+    def testModels(self):
+        r = random.Random(1)
+        for i in range(100):
+            clauses = randomClauses(r, 6, 10)
+            n = sorted(set([abs(x) for c in clauses for x in c]))
+            out = list(dpll.models(formula(clauses)))
+            expected = 0
+            for v in itertools.product([False, True], repeat=len(n)):
+                if satisfies(clauses, dict(zip([name(k) for k in n], v))):
+                    expected += 1
+            self.assertEqual(len(out), expected, clauses)
+            self.assertEqual(len(set([tuple(sorted(m.items())) for m in out])), expected, clauses)
+            for m in out:
+                self.assertTrue(satisfies(clauses, m), (clauses, m))
+    
+    def testProjectedModels(self):
+        f = prop.Or(["a", "b", "c"])
+        out = list(dpll.models(f, ["a", "b"]))
+        self.assertEqual(len(out), 4)
+        self.assertTrue(all([sorted(m) == ["a", "b"] for m in out]))
+    
+    def testIncremental(self):
+        r = random.Random(2)
+        for i in range(100):
+            clauses = randomClauses(r)
+            s = dpll.Solver(dpll.ClauseDB(formula(clauses)))
+            for j in range(5):
+                assumptions = [r.choice([1, -1]) * r.randint(1, 8) for k in range(r.randint(0, 3))]
+                lits = [prop.Literal(name(x)) if x > 0 else prop.Not(name(-x)) for x in assumptions]
+                sat = s.solve(assumptions=lits)
+                self.assertEqual(sat, satisfiable(clauses + [[x] for x in assumptions]), (clauses, assumptions))
+                if sat:
+                    self.assertTrue(satisfies(clauses + [[x] for x in assumptions], s.model()), (clauses, assumptions))
+                else:
+                    ints = dict(zip([id(x) for x in lits], assumptions))
+                    core = [ints[id(x)] for x in s.core]
+                    self.assertFalse(satisfiable(clauses + [[x] for x in core]), (clauses, assumptions, core))
+                c = [r.choice([1, -1]) * r.randint(1, 8) for k in range(r.randint(1, 3))]
+                s.addClause([prop.Literal(name(x)) if x > 0 else prop.Not(name(-x)) for x in c])
+                clauses.append(c)
+
+if __name__ == '__main__':
+    unittest.main()
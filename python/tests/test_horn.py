@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+
+import itertools
+import random
+import unittest
+import dpll
+import horn
+from common import randomClauses, name, formula, satisfies, satisfiable
+
+def hornClauses(r, n=8, m=20):
+    """Vrne naključen seznam Hornovih stavkov s celoštevilskimi literali.
+    
+    Argumenti:
+    r -- generator naključnih števil
+    n -- največje število spremenljivk, privzeto 8
+    m -- največje število stavkov, privzeto 20
+    """
+    out = []
+    for c in randomClauses(r, n, m):
+        c = [-abs(x) for x in c]
+        if r.random() < 0.6:
+            c[0] = -c[0]
+        out.append(c)
+    return out
+
+class HornTest(unittest.TestCase):
+
+    """Preverjanje reševalnika za Hornove stavke."""
+    
+    def testModels(self):
+        r = random.Random(0)
+        for i in range(300):
+            clauses = hornClauses(r)
+            db = dpll.ClauseDB(formula(clauses))
+            self.assertTrue(horn.isHorn(db), clauses)
+            m = horn.horn(db)
+            self.assertEqual(m != False, satisfiable(clauses), clauses)
+            if m != False:
+                self.assertTrue(satisfies(clauses, m), (clauses, m))
+                
+    def testLeastModel(self):
+        r = random.Random(1)
+        for i in range(100):
+            clauses = hornClauses(r, 6, 10)
+            m = horn.horn(formula(clauses))
+            if m == False:
+                continue
+            n = sorted(set([abs(x) for c in clauses for x in c]))
+            for v in itertools.product([False, True], repeat=len(n)):
+                d = dict(zip([name(k) for k in n], v))
+                if satisfies(clauses, d):
+                    self.assertTrue(all([d[p] for p in m if m[p]]), (clauses, m, d))
+                    
+    def testNotHorn(self):
+        db = dpll.ClauseDB(formula([[1, 2], [-1]]))
+        self.assertFalse(horn.isHorn(db))
+        self.assertRaises(Exception, horn.horn, db)
+
+if __name__ == '__main__':
+    unittest.main()
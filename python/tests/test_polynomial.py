@@ -0,0 +1,35 @@
+# -*- coding: utf-8 -*-
+
+import random
+import unittest
+import polynomial
+from common import randomFormula
+
+class PolynomialTest(unittest.TestCase):
+
+    """Preverjanje linearnega algoritma na grafu podizrazov."""
+    
+    def testWorklistMatchesRecursion(self):
+        r = random.Random(0)
+        for i in range(150):
+            f = randomFormula(r, r.randint(1, 5))
+            self.assertEqual(polynomial.sat(f), polynomial.sat(f, polynomial.DAG(None)), f)
+            self.assertEqual(polynomial.sat3(f), polynomial.sat3(f, polynomial.DAG(None)), f)
+            
+    def testParallelMatchesSequential(self):
+        r = random.Random(1)
+        for i in range(40):
+            f = randomFormula(r, r.randint(2, 6), names=tuple("abcdefgh"))
+            d, e = polynomial.DAG(), polynomial.DAG()
+            s = polynomial.sat3(f, d, True)
+            p = polynomial.sat3(f, e, True, processes=2)
+            self.assertEqual(s == False, p == False, f)
+            self.assertEqual(type(s) == dict, type(p) == dict, f)
+            if s != False and type(s) != dict:
+                self.assertEqual(d.v, e.v, f)
+                
+    def testUnknownOrder(self):
+        self.assertRaises(Exception, polynomial.DAG, "fifo")
+        
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+
+import os
+import random
+import signal
+import unittest
+import portfolio
+import prop
+from common import randomClauses, formula, satisfies, satisfiable
+
+def fail(f):
+    raise Exception('Engine failure!')
+
+def crash(f):
+    os.kill(os.getpid(), signal.SIGKILL)
+
+class PortfolioTest(unittest.TestCase):
+
+    """Preverjanje portfelja reševalnikov, njihovih napak in nepričakovano
+    končanih procesov."""
+    
+    def setUp(self):
+        portfolio.engines["fail"] = (fail, {})
+        portfolio.engines["crash"] = (crash, {})
+    
+    def tearDown(self):
+        del portfolio.engines["fail"]
+        del portfolio.engines["crash"]
+    
+    def testFailure(self):
+        r, name = portfolio.portfolio(prop.Literal("a"), ["fail"])
+        self.assertTrue(isinstance(r, portfolio.Failure))
+        self.assertEqual(name, "fail")
+        self.assertTrue("Engine failure!" in r.trace)
+    
+    def testCrash(self):
+        r, name = portfolio.portfolio(prop.Literal("a"), ["crash"])
+        self.assertTrue(isinstance(r, portfolio.Failure))
+        self.assertEqual(name, "crash")
+        self.assertEqual(r.trace, None)
+    
+    def testAnswerDespiteFailures(self):
+        f = prop.And([prop.Or(["a", "b"]), prop.Not("a")])
+        r, name = portfolio.portfolio(f, ["fail", "crash", "cdcl"])
+        self.assertEqual((r, name), ({"a": False, "b": True}, "cdcl"))
+    
+    def testEngines(self):
+        r = random.Random(0)
+        for i in range(10):
+            clauses = randomClauses(r)
+            sat = satisfiable(clauses)
+            for name in sorted(portfolio.engines):
+                if name in ("fail", "crash"):
+                    continue
+                m, x = portfolio.portfolio(formula(clauses), [name])
+                if m == None:
+                    continue
+                self.assertEqual(x, name)
+                self.assertEqual(m != False, sat, (name, clauses))
+                if m != False:
+                    self.assertTrue(satisfies(clauses, m), (name, clauses, m))
+                    
+    def testDefault(self):
+        r = random.Random(1)
+        for i in range(10):
+            clauses = randomClauses(r)
+            m, name = portfolio.portfolio(formula(clauses), timeout=60)
+            self.assertTrue(name in portfolio.default)
+            self.assertEqual(m != False, satisfiable(clauses), clauses)
+            if m != False:
+                self.assertTrue(satisfies(clauses, m), (clauses, m))
+                
+if __name__ == '__main__':
+    unittest.main()
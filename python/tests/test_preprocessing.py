@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+
+import random
+import unittest
+import dpll
+import preprocessing
+import prop
+from common import randomClauses, formula, satisfies, satisfiable
+
+class PreprocessingTest(unittest.TestCase):
+
+    """Preverjanje prehodov predprocesiranja."""
+    
+    def check(self, passes, count=200, seed=0):
+        """Preveri, da funkciji dpll in cdcl s podanimi prehodi na naključnih
+        zbirkah stavkov vrneta veljavne prireditve oziroma False natanko pri
+        neizpolnljivih zbirkah.
+        
+        Argumenti:
+        passes -- seznam imen prehodov ali True za privzete prehode
+        count  -- število zbirk stavkov, privzeto 200
+        seed   -- seme generatorja naključnih števil, privzeto 0
+        """
+        r = random.Random(seed)
+        for i in range(count):
+            clauses = randomClauses(r)
+            sat = satisfiable(clauses)
+            for solve in (dpll.dpll, dpll.cdcl):
+                m = solve(formula(clauses), preprocess=passes)
+                self.assertEqual(m != False, sat, (passes, clauses))
+                if m != False:
+                    self.assertTrue(satisfies(clauses, m), (passes, clauses, m))
+                    
+    def testEachPass(self):
+        for p in preprocessing.passes:
+            self.check([p])
+            
+    def testDefaultPasses(self):
+        self.check(True)
+        
+    def testQueuedUnit(self):
+        f = prop.And([prop.Literal('x4')])
+        for p in preprocessing.passes:
+            self.assertEqual(dpll.dpll(f, preprocess=[p]), {'x4': True})
+            self.assertEqual(dpll.cdcl(f, preprocess=[p]), {'x4': True})
+            
+    def testStatistics(self):
+        p = preprocessing.preprocess(dpll.ClauseDB(formula([[1, 2], [1, 2, 3], [-1]])))
+        self.assertEqual([x[0] for x in p.stats], preprocessing.passes)
+        self.assertEqual(p.size(), 0)
+        self.assertEqual(sum([x[1] for x in p.stats]), 2)
+
+if __name__ == '__main__':
+    unittest.main()
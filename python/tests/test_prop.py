@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+
+import random
+import unittest
+import polynomial
+import prop
+from common import randomFormula
+
+class TraverseTest(unittest.TestCase):
+
+    """Preverjanje rekurzivnih metod in iterativnega obhoda izrazov."""
+    
+    def testTraverseMatchesRecursion(self):
+        r = random.Random(0)
+        for i in range(150):
+            f = randomFormula(r, r.randint(1, 3)).flatten()
+            for op in ["flatten", "simplify", "ncf", "cnf", "dnf"]:
+                self.assertEqual(getattr(f, op)(), prop.traverse(f, op), f)
+            self.assertEqual(repr(f), prop.traverse(f, "repr"))
+    
+    def testRepeatedApply(self):
+        r = random.Random(1)
+        for i in range(150):
+            f = randomFormula(r, r.randint(1, 5))
+            for j in range(4):
+                d = dict((p, r.random() < 0.5) for p in "abcde" if r.random() < 0.3)
+                g = f.apply(d)
+                self.assertEqual(g, g.flatten(), f)
+                self.assertEqual(g, prop.traverse(f, "apply", d), f)
+    
+    def testDeepChain(self):
+        n = 20000
+        f, g = [prop.Literal("x%d" % n)] * 2
+        for i in reversed(range(n)):
+            f = prop.Implies("x%d" % i, f)
+            g = prop.Implies("x%d" % i, g)
+        self.assertEqual(len(f.flatten().l), n+1)
+        self.assertEqual(len(f.simplify().l), n+1)
+        self.assertEqual(f, g)
+        self.assertEqual(hash(f), hash(g))
+        self.assertEqual(repr(f), repr(g))
+        self.assertFalse(f < g)
+    
+    def testDeepNode(self):
+        n = 2000
+        f = prop.Literal("x%d" % n)
+        for i in reversed(range(n)):
+            f = prop.Implies("x%d" % i, prop.And([f, "y%d" % i]))
+        g = f.ncf()
+        d = polynomial.DAG()
+        self.assertTrue(g.node(d) is d[g])
+        self.assertEqual(len([x for x in d if isinstance(x, prop.Literal)]), 2*n+1)
+
+class InterningTest(unittest.TestCase):
+
+    """Preverjanje interniranja izrazov."""
+    
+    def setUp(self):
+        self.old = prop.interning()
+    
+    def tearDown(self):
+        prop.interning(self.old)
+    
+    def testIdentity(self):
+        f = prop.And([prop.Or(["a", prop.Not("b")]), "c"])
+        g = prop.And([prop.Or([prop.Literal("a"), prop.Not("b")]), prop.Literal("c")])
+        self.assertTrue(f is g)
+        self.assertTrue(f.l[0].l[1] is prop.Not("b"))
+        self.assertFalse(f is prop.And(["c", prop.Or(["a", prop.Not("b")])]))
+    
+    def testClasses(self):
+        o = prop.Or([prop.Not("a"), "b"])
+        i = prop.Implies("a", "b")
+        self.assertTrue(type(i) is prop.Implies)
+        self.assertTrue(type(prop.Or([prop.Not("a"), "b"])) is prop.Or)
+        self.assertEqual(i, o)
+        self.assertEqual(hash(i), hash(o))
+        self.assertTrue(type(prop.And([])) is prop.And)
+        self.assertTrue(type(prop.Tru()) is prop.Tru)
+        self.assertTrue(type(prop.Or([])) is prop.Or)
+        self.assertTrue(type(prop.Fls()) is prop.Fls)
+        self.assertEqual(prop.Tru(), prop.And([]))
+    
+    def testOff(self):
+        prop.interning(False)
+        self.assertFalse(prop.Literal("a") is prop.Literal("a"))
+        self.assertFalse(prop.isInterned(prop.Not("a")))
+        self.assertEqual(prop.Not("a"), prop.Not("a"))
+
+if __name__ == '__main__':
+    unittest.main()
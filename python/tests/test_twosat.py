@@ -0,0 +1,48 @@
+# -*- coding: utf-8 -*-
+
+import itertools
+import random
+import unittest
+import dpll
+import twosat
+from common import randomClauses, name, formula, satisfies, satisfiable
+
+class TwoSatTest(unittest.TestCase):
+
+    """Preverjanje reševalnika za stavke z največ dvema literaloma."""
+    
+    def testModels(self):
+        r = random.Random(0)
+        for i in range(300):
+            clauses = randomClauses(r, sizes=(1, 2, 2, 2))
+            db = dpll.ClauseDB(formula(clauses))
+            self.assertTrue(twosat.isTwoSat(db), clauses)
+            m = twosat.twosat(db)
+            self.assertEqual(m != False, satisfiable(clauses), clauses)
+            if m != False:
+                self.assertTrue(satisfies(clauses, m), (clauses, m))
+                
+    def testEquivalences(self):
+        r = random.Random(1)
+        for i in range(100):
+            clauses = randomClauses(r, 6, 12, sizes=(1, 2, 2, 2))
+            db = dpll.ClauseDB(formula(clauses))
+            rep = twosat.equivalences(db)
+            self.assertEqual(rep != False, satisfiable(clauses), clauses)
+            if rep == False:
+                continue
+            n = db.numVars()
+            for v in itertools.product([False, True], repeat=n):
+                d = dict(zip(db.names[1:], v))
+                if satisfies(clauses, d):
+                    for k in range(1, n + 1):
+                        p = db.names[abs(rep[k])]
+                        self.assertEqual(d[db.names[k]], d[p] == (rep[k] > 0), (clauses, k))
+                        
+    def testNotTwoSat(self):
+        db = dpll.ClauseDB(formula([[1, 2, 3]]))
+        self.assertFalse(twosat.isTwoSat(db))
+        self.assertRaises(Exception, twosat.twosat, db)
+
+if __name__ == '__main__':
+    unittest.main()
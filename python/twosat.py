@@ -0,0 +1,170 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+from array import array
+import dpll
+import prop
+
+def isTwoSat(db):
+    """Pove, ali ima vsak stavek v zbirki največ dva literala.
+    
+    Argument:
+    db -- zbirka stavkov
+    """
+    start = db.start
+    return all([start[i+1] - start[i] <= 2 for i in range(len(db))])
+
+def node(x):
+    """Vrne vozlišče grafa implikacij za celoštevilski literal x.
+    
+    Vozlišči literala in njegove negacije se razlikujeta le v zadnjem bitu.
+    
+    Argument:
+    x -- celoštevilski literal
+    """
+    return 2*x if x > 0 else 1 - 2*x
+
+def literal(u):
+    """Vrne celoštevilski literal za vozlišče u grafa implikacij.
+    
+    Argument:
+    u -- vozlišče grafa implikacij
+    """
+    return u >> 1 if u & 1 == 0 else -(u >> 1)
+
+def graph(db):
+    """Vrne graf implikacij za stavke z enim ali dvema literaloma.
+    
+    Stavek a \\/ b da povezavi ~a -> b in ~b -> a, stavek a pa povezavo
+    ~a -> a. Daljši stavki se ne upoštevajo. Graf je seznam seznamov
+    naslednikov, indeksiran z vozlišči.
+    
+    Argument:
+    db -- zbirka stavkov
+    """
+    lits = db.lits
+    start = db.start
+    adj = [[] for i in range(2*db.numVars() + 2)]
+    for i in range(len(db)):
+        k = start[i+1] - start[i]
+        if k == 1:
+            a = lits[start[i]]
+            adj[node(-a)].append(node(a))
+        elif k == 2:
+            a = lits[start[i]]
+            b = lits[start[i]+1]
+            adj[node(-a)].append(node(b))
+            adj[node(-b)].append(node(a))
+    return adj
+
+def components(adj):
+    """Poišče krepko povezane komponente grafa s Tarjanovim algoritmom.
+    
+    Preiskovanje v globino teče v zanki z eksplicitnim skladom, zato ni
+    omejeno z globino rekurzije. Komponente so oštevilčene v vrstnem redu
+    zaključevanja, torej v obratnem topološkem vrstnem redu.
+    
+    Vrne tabelo številk komponent vozlišč.
+    
+    Argument:
+    adj -- seznam seznamov naslednikov
+    """
+    n = len(adj)
+    index = array('i', [-1]) * n
+    low = array('i', [0]) * n
+    comp = array('i', [-1]) * n
+    stack = []
+    counter = 0
+    count = 0
+    for root in range(n):
+        if index[root] >= 0:
+            continue
+        index[root] = low[root] = counter
+        counter += 1
+        stack.append(root)
+        work = [(root, 0)]
+        while len(work) > 0:
+            u, i = work[-1]
+            if i < len(adj[u]):
+                work[-1] = (u, i + 1)
+                v = adj[u][i]
+                if index[v] < 0:
+                    index[v] = low[v] = counter
+                    counter += 1
+                    stack.append(v)
+                    work.append((v, 0))
+                elif comp[v] < 0 and index[v] < low[u]:
+                    low[u] = index[v]
+                continue
+            work.pop()
+            if low[u] == index[u]:
+                while True:
+                    v = stack.pop()
+                    comp[v] = count
+                    if v == u:
+                        break
+                count += 1
+            if len(work) > 0:
+                p = work[-1][0]
+                if low[u] < low[p]:
+                    low[p] = low[u]
+    return comp
+
+def twosat(f, trace=False):
+    """Reši problem izpolnljivosti za stavke z največ dvema literaloma v
+    linearnem času.
+    
+    Izraz ni izpolnljiv natanko tedaj, ko sta kak literal in njegova
+    negacija v isti krepko povezani komponenti grafa implikacij. Sicer je
+    literal resničen, če je njegova komponenta v topološkem vrstnem redu za
+    komponento njegove negacije.
+    
+    Vrne prireditev vrednosti vsem spremenljivkam v obliki slovarja ali
+    False, če izraz ni izpolnljiv.
+    
+    Argumenta:
+    f     -- logični izraz v konjunktivni normalni obliki s stavki z največ
+             dvema literaloma ali zbirka takih stavkov
+    trace -- ali naj se izpisuje sled dokazovanja, privzeto False
+    """
+    db = f if isinstance(f, dpll.ClauseDB) else dpll.ClauseDB(prop.cnf(f))
+    start = db.start
+    for i in range(len(db)):
+        if start[i+1] - start[i] > 2:
+            raise Exception('Not a 2-SAT clause!')
+        elif start[i+1] == start[i]:
+            if trace:
+                print("Empty disjunction found")
+            return False
+    comp = components(graph(db))
+    val = array('b', [0]) * (db.numVars() + 1)
+    for k in range(1, db.numVars() + 1):
+        if comp[2*k] == comp[2*k+1]:
+            if trace:
+                print("Variable %s is equivalent to its negation" % db.names[k])
+            return False
+        val[k] = 1 if comp[2*k] < comp[2*k+1] else -1
+    return db.model(val)
+
+def equivalences(db):
+    """Poišče ekvivalentne literale s pomočjo krepko povezanih komponent
+    grafa implikacij stavkov z enim ali dvema literaloma.
+    
+    Vrne tabelo, ki vsaki spremenljivki priredi predstavnika njene
+    komponente (literal z najmanjšo številko spremenljivke), ali False, če
+    je kaka spremenljivka ekvivalentna svoji negaciji.
+    
+    Argument:
+    db -- zbirka stavkov
+    """
+    n = db.numVars()
+    comp = components(graph(db))
+    best = array('i', [0]) * (max(comp) + 1 if len(comp) > 0 else 0)
+    for u in range(2*n + 1, 1, -1):
+        best[comp[u]] = literal(u)
+    rep = array('i', [0]) * (n + 1)
+    for k in range(1, n + 1):
+        if comp[2*k] == comp[2*k+1]:
+            return False
+        rep[k] = best[comp[2*k]]
+    return rep